@@ -0,0 +1,5 @@
+def register_commands(app):
+    """Register Flask CLI command groups (run with `flask --app wsgi <group> <command>`)."""
+    from commands.sktmCommands import sktm_cli
+
+    app.cli.add_command(sktm_cli)
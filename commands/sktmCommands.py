@@ -0,0 +1,51 @@
+import click
+from flask.cli import AppGroup
+
+sktm_cli = AppGroup("sktm", help="SKTM document maintenance.")
+
+
+@sktm_cli.command("prune")
+@click.option("--all", "all_niks", is_flag=True, help="Scan every NIK instead of only queued prune hints.")
+@click.option("--keep", type=int, default=None, help="PDFs to keep per NIK (default: SUPABASE_SKTm_KEEP).")
+@click.option("--nik-batch", type=int, default=200, show_default=True, help="NIKs processed per transaction.")
+@click.option("--remove-batch", type=int, default=100, show_default=True, help="Objects per storage.remove call.")
+def prune_command(all_niks, keep, nik_batch, remove_batch):
+    """Delete old SKTM PDFs beyond the retention limit."""
+    from utils.sktm_documents import run_sktm_retention
+
+    stats = run_sktm_retention(keep=keep, all_niks=all_niks, nik_batch=nik_batch, remove_batch=remove_batch)
+    click.echo(f"niks={stats['niks']} removed={stats['files_removed']} failed={stats['files_failed']}")
+
+
+@sktm_cli.command("rebuild-status")
+@click.option("--batch", type=int, default=500, show_default=True, help="NIKs recomputed per transaction.")
+def rebuild_status_command(batch):
+    """Recompute the application_status table from the section tables."""
+    from utils.application_status import rebuild_application_status
+
+    rebuilt = rebuild_application_status(batch_size=batch)
+    click.echo(f"rebuilt={rebuilt}")
+
+
+@sktm_cli.command("batch")
+@click.option("--nik", "niks", type=int, multiple=True, help="Only these NIKs (repeatable; default: every approved NIK).")
+@click.option("--limit", type=int, default=None, help="Stop after this many new PDFs.")
+@click.option("--workers", type=int, default=None, help="Parallel render/upload jobs (default: SKTM_BATCH_WORKERS).")
+@click.option("--batch", "batch_size", type=int, default=50, show_default=True, help="NIKs loaded and recorded per transaction.")
+@click.option("--manifest", "manifest_path", type=click.Path(dir_okay=False), default="sktm_batch_manifest.jsonl",
+              show_default=True, help="JSON Lines manifest, one entry per NIK (appended).")
+def batch_command(niks, limit, workers, batch_size, manifest_path):
+    """Generate SKTM PDFs for every approved NIK; safe to re-run after a crash."""
+    import json
+    from utils.sktm_batch import run_sktm_batch
+
+    with open(manifest_path, "a", encoding="utf-8") as manifest:
+        def write_entry(entry):
+            manifest.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            manifest.flush()
+
+        result = run_sktm_batch(niks=list(niks) or None, limit=limit, workers=workers, batch_size=batch_size, on_entry=write_entry)
+
+    s = result["summary"]
+    click.echo(f"visited={s['visited']} rendered={s['rendered']} existing={s['existing']} failed={s['failed']} "
+               f"remaining={result['remaining']} elapsed={s['elapsed_s']}s manifest={manifest_path}")
@@ -8,21 +8,28 @@ from schema.adminAsetNonfinansialSchema import (
     AdminUpdateSchema,
 )
 from marshmallow import ValidationError
+from utils.application_status import refresh_application_status
+from utils.sktm_pregen import schedule_sktm_pregen
+from utils.pagination import parse_page_params, paginate_query, PaginationError
 
 
 admin_schema = AdminAsetNonFinansialSchema()
 admin_status_schema = AdminStatusSchema()
 
 
-def list_asets(page: int = 1, per_page: int = 100):
+def list_asets():
     if request.method != 'GET':
         return jsonify({"message": "Method Not Allowed"}), 405
 
-    q = AsetNonFinancial.query
-    pagination = q.paginate(page=page, per_page=per_page, error_out=False)
-    items = [admin_schema.dump(aset) for aset in pagination.items]
+    try:
+        params = parse_page_params(request.args)
+    except PaginationError as pe:
+        return jsonify({"message": str(pe)}), 400
+
+    asets, meta = paginate_query(AsetNonFinancial.query, AsetNonFinancial.id_aset_non_financial, params)
+    items = [admin_schema.dump(aset) for aset in asets]
 
-    return jsonify({"total": pagination.total, "page": pagination.page, "per_page": pagination.per_page, "items": items}), 200
+    return jsonify({**meta, "items": items}), 200
 
 
 def get_aset_by_id(id_aset: int):
@@ -72,6 +79,7 @@ def create_aset_admin():
         aset.detail_kendaraan.append(dk)
 
     db.session.add(aset)
+    refresh_application_status(nik)
     db.session.commit()
 
     return jsonify({"message": "Created", "id_aset_non_financial": aset.id_aset_non_financial}), 201
@@ -100,20 +108,43 @@ def update_aset_admin(nik: int):
         aset.status = data["status"]
         changed = True
 
+    applied_ids, rejected_ids = [], []
     if data.get("detail_kendaraan"):
-        for dk_item in data["detail_kendaraan"]:
-            dk = DetailKendaraan.query.filter_by(id_detail_kendaraan=dk_item["id_detail_kendaraan"]).first()
-            if not dk:
-                continue
-            if dk.id_aset_non_financial != aset.id_aset_non_financial:
-                continue
-            dk.status = dk_item["status"]
-            changed = True
+        # last decision per vehicle wins
+        requested = {item["id_detail_kendaraan"]: item["status"] for item in data["detail_kendaraan"]}
+        # one SELECT for the ids that belong to this aset, then one UPDATE per target status
+        owned = {row[0] for row in db.session.query(DetailKendaraan.id_detail_kendaraan).filter(
+            DetailKendaraan.id_aset_non_financial == aset.id_aset_non_financial,
+            DetailKendaraan.id_detail_kendaraan.in_(requested),
+        ).all()}
+        by_status = {}
+        for id_detail, status in requested.items():
+            if id_detail in owned:
+                by_status.setdefault(status, []).append(id_detail)
+                applied_ids.append(id_detail)
+            else:
+                rejected_ids.append(id_detail)
+        for status, ids in by_status.items():
+            DetailKendaraan.query.filter(
+                DetailKendaraan.id_aset_non_financial == aset.id_aset_non_financial,
+                DetailKendaraan.id_detail_kendaraan.in_(ids),
+            ).update({DetailKendaraan.status: status}, synchronize_session=False)
+        changed = changed or bool(applied_ids)
 
     if changed:
+        refresh_application_status(nik)
         db.session.commit()
+        if data.get("status") == 'B':
+            schedule_sktm_pregen([nik])
 
-    return jsonify({"message": "Status updated", "nik": nik, "id_aset_non_financial": aset.id_aset_non_financial, "status": aset.status}), 200
+    return jsonify({
+        "message": "Status updated",
+        "nik": nik,
+        "id_aset_non_financial": aset.id_aset_non_financial,
+        "status": aset.status,
+        "applied_ids": applied_ids,
+        "rejected_ids": rejected_ids,
+    }), 200
 
 
 def delete_aset_admin(nik: int):
@@ -124,6 +155,7 @@ def delete_aset_admin(nik: int):
     if not aset:
         return jsonify({"message": "Not found"}), 404
     db.session.delete(aset)
+    refresh_application_status(nik)
     db.session.commit()
     return jsonify({"message": "Deleted", "nik": nik}), 200
 
@@ -136,5 +168,6 @@ def delete_aset_by_nik(nik: int):
     if not aset:
         return jsonify({"message": "Not found"}), 404
     db.session.delete(aset)
+    refresh_application_status(nik)
     db.session.commit()
     return jsonify({"message": "Deleted", "nik": nik}), 200
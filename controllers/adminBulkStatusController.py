@@ -0,0 +1,131 @@
+import os
+from collections import defaultdict
+from flask import request, jsonify
+from marshmallow import ValidationError
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from extension import db
+from models.ktpModel import KTP
+from models.kartukeluargaModel import KartuKeluarga
+from models.humancapitalModel import HumanCapital
+from models.kondisirumahModel import KondisiRumah
+from models.kondisiekonomiModel import KondisiEkonomi
+from models.asetnonfinansialModel import AsetNonFinancial
+from schema.adminBulkStatusSchema import admin_bulk_status_schema, admin_bulk_status_item_schema
+from schema.adminKtpSchema import admin_update_status_schema
+from schema.adminKkSchema import admin_update_kk_status_schema, admin_update_hc_status_schema
+from schema.adminKondisiEkonomiSchema import AdminStatusSchema as AdminKondisiStatusSchema
+from schema.adminAsetNonfinansialSchema import AdminStatusSchema as AdminAsetStatusSchema
+from utils.application_status import refresh_application_statuses
+from utils.sktm_pregen import schedule_sktm_pregen
+
+BULK_STATUS_MAX_ITEMS = int(os.environ.get("ADMIN_BULK_STATUS_MAX_ITEMS", "1000"))
+
+# section -> (model, the status schema its single-item endpoint validates with)
+BULK_STATUS_SECTIONS = {
+    "ktp": (KTP, admin_update_status_schema),
+    "kartu_keluarga": (KartuKeluarga, admin_update_kk_status_schema),
+    "human_capital": (HumanCapital, admin_update_hc_status_schema),
+    "kondisi_rumah": (KondisiRumah, AdminKondisiStatusSchema()),
+    "kondisi_ekonomi": (KondisiEkonomi, AdminKondisiStatusSchema()),
+    "aset_non_financial": (AsetNonFinancial, AdminAsetStatusSchema()),
+}
+
+# sections with several rows per nik: like their single-item endpoint, only the first row
+# (lowest primary key) gets the decision
+FIRST_ROW_ONLY = {
+    "kartu_keluarga": KartuKeluarga.id_kk,
+}
+
+
+def _validate_decision(raw):
+    """One decision -> (nik, section, status); raises ValidationError like the single-item endpoints."""
+    if not isinstance(raw, dict):
+        raise ValidationError({"_schema": ["decision harus berupa object"]})
+    item = admin_bulk_status_item_schema.load(raw)
+    _, status_schema = BULK_STATUS_SECTIONS[item["section"]]
+    status = status_schema.load({"status": item["status"]})["status"]
+    return item["nik"], item["section"], status
+
+
+def bulk_update_status_controller():
+    """Apply many (nik, section, status) decisions: one UPDATE per (section, status), one commit."""
+    try:
+        if request.method != 'POST':
+            return jsonify({"message": "Method Not Allowed"}), 405
+
+        try:
+            decisions = admin_bulk_status_schema.load(request.get_json() or {})["decisions"]
+        except ValidationError as ve:
+            return jsonify({"message": "Validation error", "errors": ve.messages}), 400
+        if len(decisions) > BULK_STATUS_MAX_ITEMS:
+            return jsonify({"message": f"Maksimal {BULK_STATUS_MAX_ITEMS} keputusan per request"}), 400
+
+        results = []
+        accepted = {}  # (section, nik) -> index of the decision that will be applied
+        for index, raw in enumerate(decisions):
+            try:
+                nik, section, status = _validate_decision(raw)
+            except ValidationError as ve:
+                results.append({"index": index, "result": "invalid", "errors": ve.messages})
+                continue
+            key = (section, nik)
+            if key in accepted:
+                results.append({"index": index, "nik": nik, "section": section, "status": status,
+                                "result": "invalid", "errors": {"nik": [f"keputusan ganda untuk {section} nik {nik}"]}})
+                continue
+            accepted[key] = index
+            results.append({"index": index, "nik": nik, "section": section, "status": status, "result": None})
+
+        # which (section, nik) rows exist, and the key the UPDATE matches them on: one SELECT per section
+        niks_by_section = defaultdict(set)
+        for section, nik in accepted:
+            niks_by_section[section].add(nik)
+        targets = {}
+        for section, niks in niks_by_section.items():
+            model = BULK_STATUS_SECTIONS[section][0]
+            first_row = FIRST_ROW_ONLY.get(section)
+            if first_row is None:
+                found = [(nik, nik) for (nik,) in db.session.query(model.nik).filter(model.nik.in_(niks)).distinct().all()]
+            else:
+                found = db.session.query(model.nik, func.min(first_row)).filter(model.nik.in_(niks)).group_by(model.nik).all()
+            targets.update(((section, nik), key) for nik, key in found)
+
+        groups = defaultdict(list)
+        affected = set()
+        for (section, nik), index in accepted.items():
+            if (section, nik) in targets:
+                groups[(section, results[index]["status"])].append(targets[(section, nik)])
+                affected.add(nik)
+                results[index]["result"] = "updated"
+            else:
+                results[index]["result"] = "not_found"
+
+        for (section, status), keys in groups.items():
+            model = BULK_STATUS_SECTIONS[section][0]
+            column = FIRST_ROW_ONLY.get(section, model.nik)
+            model.query.filter(column.in_(keys)).update({model.status: status}, synchronize_session=False)
+
+        if affected:
+            refresh_application_statuses(affected)
+            db.session.commit()
+            schedule_sktm_pregen(
+                nik for (section, nik), index in accepted.items()
+                if results[index]["result"] == "updated" and results[index]["status"] == 'B'
+            )
+
+        summary = defaultdict(int)
+        for item in results:
+            summary[item["result"]] += 1
+        return jsonify({
+            "message": "Keputusan status diproses",
+            "summary": {key: summary[key] for key in ("updated", "not_found", "invalid")},
+            "results": results,
+        }), 200
+
+    except IntegrityError as ie:
+        db.session.rollback()
+        return jsonify({"message": f"Integrity error: {str(ie.orig)}"}), 500
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": f"Terjadi kesalahan server: {str(e)}"}), 500
@@ -0,0 +1,100 @@
+from flask import jsonify, request
+from sqlalchemy.orm import joinedload
+from utils.supabase_client import resolve_image_fields as _resolve_image_fields
+from utils.application_status import get_application_status
+from models.masyarakatModel import Masyarakat
+from models.asetnonfinansialModel import AsetNonFinancial
+from schema.adminKtpSchema import admin_ktp_schema
+from schema.adminKkSchema import admin_kk_schema, admin_hc_schema
+from schema.userKondisiEkonomiSchema import rumah_schema, ekonomi_schema
+from schema.adminAsetNonfinansialSchema import AdminAsetNonFinansialSchema
+from schema.adminDossierSchema import dossier_masyarakat_schema, dossier_application_status_schema
+
+# section -> (Masyarakat relationship, schema, many); "masyarakat" is the root row itself
+DOSSIER_SECTIONS = {
+    "masyarakat": (None, dossier_masyarakat_schema, False),
+    "ktp": (Masyarakat.ktp, admin_ktp_schema, False),
+    "kartu_keluarga": (Masyarakat.kartu_keluarga, admin_kk_schema, True),
+    "human_capital": (Masyarakat.human_capital, admin_hc_schema, False),
+    "kondisi_rumah": (Masyarakat.kondisi_rumah, rumah_schema, False),
+    "kondisi_ekonomi": (Masyarakat.kondisi_ekonomi, ekonomi_schema, False),
+    "aset_non_financial": (Masyarakat.aset_non_financial, AdminAsetNonFinansialSchema(), False),
+    "application_status": (Masyarakat.application_status, dossier_application_status_schema, False),
+}
+
+
+def _parse_fields(raw):
+    """?fields=ktp,kartu_keluarga.status,... -> {section: None (all fields) | set(fields)}."""
+    if not raw:
+        return {section: None for section in DOSSIER_SECTIONS}
+    selected = {}
+    for token in raw.split(','):
+        token = token.strip()
+        if not token:
+            continue
+        section, _, field = token.partition('.')
+        if section not in DOSSIER_SECTIONS:
+            raise ValueError(f"section tidak dikenal: {section}")
+        if not field:
+            selected[section] = None
+        elif selected.get(section, set()) is not None:
+            selected.setdefault(section, set()).add(field)
+    return selected
+
+
+def _load_options(selected):
+    options = []
+    for section in selected:
+        relationship = DOSSIER_SECTIONS[section][0]
+        if relationship is None:
+            continue
+        option = joinedload(relationship)
+        if section == "aset_non_financial" and (selected[section] is None or "detail_kendaraan" in selected[section]):
+            # vehicles come from one extra SELECT ... IN instead of widening the join
+            option = option.selectinload(AsetNonFinancial.detail_kendaraan)
+        options.append(option)
+    return options
+
+
+def get_dossier_controller(nik: int):
+    """Every section of one applicant for the review screen: 1-2 SELECTs and one batch sign."""
+    try:
+        if request.method != 'GET':
+            return jsonify({"message": "Method Not Allowed"}), 405
+
+        try:
+            selected = _parse_fields(request.args.get('fields'))
+            schemas = {}
+            for section, only in selected.items():
+                _, schema, many = DOSSIER_SECTIONS[section]
+                unknown = sorted((only or set()) - set(schema.fields))
+                if unknown:
+                    raise ValueError(f"field tidak dikenal pada {section}: {', '.join(unknown)}")
+                schemas[section] = schema if only is None and not many else type(schema)(only=tuple(only) if only else None, many=many)
+        except ValueError as ve:
+            return jsonify({"message": f"fields tidak valid: {str(ve)}"}), 400
+
+        masyarakat = Masyarakat.query.options(*_load_options(selected)).filter(Masyarakat.nik == nik).first()
+        if not masyarakat:
+            return jsonify({"message": f"Masyarakat dengan nik {nik} tidak ditemukan"}), 404
+
+        data = {}
+        for section in selected:
+            if section == "masyarakat":
+                value = masyarakat
+            elif section == "application_status":
+                value = masyarakat.application_status or get_application_status(nik)
+            else:
+                value = getattr(masyarakat, section)
+            data[section] = schemas[section].dump(value) if value is not None else None
+
+        # every foto_* of every section in one batch sign request
+        records = []
+        for section, value in data.items():
+            records.extend(value if isinstance(value, list) else [value])
+        _resolve_image_fields(*records)
+
+        return jsonify({"message": "Dossier berhasil diambil", "nik": nik, "data": data}), 200
+
+    except Exception as e:
+        return jsonify({"message": f"Terjadi kesalahan server: {str(e)}"}), 500
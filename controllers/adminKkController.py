@@ -1,5 +1,5 @@
 from flask import jsonify, request
-from utils.supabase_client import resolve_image_url as _resolve_image_url
+from utils.supabase_client import resolve_image_fields as _resolve_image_fields
 from sqlalchemy.exc import IntegrityError
 from extension import db
 from models.kartukeluargaModel import KartuKeluarga
@@ -12,6 +12,11 @@ from schema.adminKkSchema import (
     admin_kk_summary_schema,
 )
 from marshmallow import ValidationError
+from utils.application_status import refresh_application_status
+from utils.sktm_pregen import schedule_sktm_pregen
+from utils.pagination import parse_page_params, paginate_query, PaginationError
+
+STATUS_VALUES = ("P", "T", "B")
 
 def update_kartu_keluarga_status_controller(nik: int):
     try:
@@ -25,12 +30,16 @@ def update_kartu_keluarga_status_controller(nik: int):
             return jsonify({"message": "Validation error", "errors": ve.messages}), 400
         new_status = validated.get('status')
 
-        kk = KartuKeluarga.query.filter_by(nik=nik).first()
+        # a nik with several KK rows: the decision applies to the first one (same as the bulk endpoint)
+        kk = KartuKeluarga.query.filter_by(nik=nik).order_by(KartuKeluarga.id_kk).first()
         if not kk:
             return jsonify({"message": f"Kartu Keluarga untuk nik {nik} tidak ditemukan"}), 404
 
         kk.status = new_status
+        refresh_application_status(nik)
         db.session.commit()
+        if new_status == 'B':
+            schedule_sktm_pregen([nik])
 
         response = admin_kk_schema.dump(kk)
         # include human capital info if present
@@ -51,20 +60,40 @@ def get_all_kartu_keluarga_admin_controller():
         if request.method != 'GET':
             return jsonify({"message": "Method Not Allowed"}), 405
 
-        kks = KartuKeluarga.query.order_by(KartuKeluarga.id_kk.desc()).all()
-        if not kks:
+        try:
+            params = parse_page_params(request.args, default_sort='desc')
+        except PaginationError as pe:
+            return jsonify({"message": str(pe)}), 400
+        status = request.args.get('status')
+        hc_status = request.args.get('hc_status')
+        for value in (status, hc_status):
+            if value is not None and value not in STATUS_VALUES:
+                return jsonify({"message": f"status harus salah satu dari {', '.join(STATUS_VALUES)}"}), 400
+
+        # KK rows and their HumanCapital in one LEFT OUTER JOIN (COUNT only with include_total)
+        query = db.session.query(KartuKeluarga, HumanCapital).outerjoin(HumanCapital, HumanCapital.nik == KartuKeluarga.nik)
+        if status:
+            query = query.filter(KartuKeluarga.status == status)
+        if hc_status:
+            query = query.filter(HumanCapital.status == hc_status)
+
+        rows, meta = paginate_query(query, KartuKeluarga.id_kk, params, key_of=lambda row: row[0].id_kk)
+        if not rows and params.cursor is None and (params.page or 1) == 1:
             return jsonify({"message": "Tidak ada data Kartu Keluarga yang ditemukan"}), 404
 
         data = []
-        for kk in kks:
+        for kk, hc in rows:
             # Use summary schema for list to avoid returning foto_kk
             item = admin_kk_summary_schema.dump(kk)
-            hc = HumanCapital.query.filter_by(nik=item.get('nik')).first()
             item['human_capital'] = admin_hc_schema.dump(hc) if hc else None
-            # resolve foto_kk if present
             data.append(item)
 
-        return jsonify({"message": "Data Kartu Keluarga berhasil diambil", "count": len(data), "data": data}), 200
+        return jsonify({
+            "message": "Data Kartu Keluarga berhasil diambil",
+            "count": len(data),
+            **meta,
+            "data": data,
+        }), 200
 
     except Exception as e:
         return jsonify({"message": f"Terjadi kesalahan server: {str(e)}"}), 500
@@ -82,9 +111,8 @@ def get_kartu_keluarga_detail_admin_controller(nik: int):
         hc = HumanCapital.query.filter_by(nik=nik).first()
         response_data['human_capital'] = admin_hc_schema.dump(hc) if hc else None
 
-        # resolve foto_kk
-        if isinstance(response_data, dict) and response_data.get('foto_kk'):
-            response_data['foto_kk'] = _resolve_image_url(response_data.get('foto_kk'))
+        # resolve foto_kk through the batch signer
+        _resolve_image_fields(response_data)
 
         return jsonify({"message": "Data Kartu Keluarga berhasil diambil", "data": response_data}), 200
 
@@ -137,6 +165,7 @@ def delete_kartu_keluarga_controller(nik: int):
         hc = HumanCapital.query.filter_by(nik=kk_nik).first()
 
         db.session.delete(kk)
+        refresh_application_status(kk_nik)
         db.session.commit()
 
         if hc:
@@ -1,5 +1,5 @@
 from extension import db
-from utils.supabase_client import resolve_image_url as _resolve_image_url
+from utils.supabase_client import resolve_image_fields as _resolve_image_fields
 from models.kondisirumahModel import KondisiRumah
 from models.kondisiekonomiModel import KondisiEkonomi
 from models.masyarakatModel import Masyarakat
@@ -7,30 +7,51 @@ from schema.adminKondisiEkonomiSchema import admin_status_update_schema
 from schema.userKondisiEkonomiSchema import rumah_schema, ekonomi_schema, rumah_summary_schema, ekonomi_summary_schema
 from marshmallow import ValidationError
 from flask import request, jsonify
+from utils.application_status import refresh_application_status
+from utils.sktm_pregen import schedule_sktm_pregen
+from utils.pagination import parse_page_params, paginate_query, PaginationError
+from sqlalchemy import or_
 
+STATUS_VALUES = ("P", "T", "B")
 
-def list_kondisi_admin(page: int = 1, per_page: int = 100):
+
+def list_kondisi_admin():
+    """List kondisi per NIK: Masyarakat LEFT OUTER JOIN rumah and ekonomi, keyset-paginated on nik."""
     try:
-        pag = KondisiRumah.query.paginate(page=page, per_page=per_page, error_out=False)
-    except Exception:
-        # fallback: return all
-        items = KondisiRumah.query.all()
-        pag_items = items
-    else:
-        pag_items = pag.items
+        params = parse_page_params(request.args)
+    except PaginationError as pe:
+        return jsonify({"message": str(pe)}), 400
+    rumah_status = request.args.get('rumah_status')
+    ekonomi_status = request.args.get('ekonomi_status')
+    for value in (rumah_status, ekonomi_status):
+        if value is not None and value not in STATUS_VALUES:
+            return jsonify({"message": f"status harus salah satu dari {', '.join(STATUS_VALUES)}"}), 400
+
+    query = (
+        db.session.query(Masyarakat.nik, KondisiRumah, KondisiEkonomi)
+        .outerjoin(KondisiRumah, KondisiRumah.nik == Masyarakat.nik)
+        .outerjoin(KondisiEkonomi, KondisiEkonomi.nik == Masyarakat.nik)
+        # citizens with at least one of the two records (covers ekonomi-only rows)
+        .filter(or_(KondisiRumah.id_kondisi_rumah.isnot(None), KondisiEkonomi.id_kondisi_ekonomi.isnot(None)))
+    )
+    if rumah_status:
+        query = query.filter(KondisiRumah.status == rumah_status)
+    if ekonomi_status:
+        query = query.filter(KondisiEkonomi.status == ekonomi_status)
+
+    rows, meta = paginate_query(query, Masyarakat.nik, params, key_of=lambda row: row[0])
 
     result_list = []
-    for rumah in pag_items:
-        ekonomi = KondisiEkonomi.query.filter_by(nik=rumah.nik).first()
+    for nik, rumah, ekonomi in rows:
         # use summary schemas to avoid including photo fields in listing
         entry = {
-            "nik": rumah.nik,
+            "nik": nik,
             "kondisi_rumah": rumah_summary_schema.dump(rumah) if rumah else None,
             "kondisi_ekonomi": ekonomi_summary_schema.dump(ekonomi) if ekonomi else None,
         }
         result_list.append(entry)
 
-    return jsonify({"data": result_list}), 200
+    return jsonify({**meta, "data": result_list}), 200
 
 
 def get_kondisi_admin(nik: int):
@@ -44,18 +65,8 @@ def get_kondisi_admin(nik: int):
         "kondisi_rumah": rumah_schema.dump(rumah) if rumah else None,
         "kondisi_ekonomi": ekonomi_schema.dump(ekonomi) if ekonomi else None,
     }
-    # Resolve foto_* fields
-    kr = result.get("kondisi_rumah")
-    if isinstance(kr, dict):
-        for k, v in list(kr.items()):
-            if k.startswith("foto_"):
-                kr[k] = _resolve_image_url(v)
-
-    ke = result.get("kondisi_ekonomi")
-    if isinstance(ke, dict):
-        for k, v in list(ke.items()):
-            if k.startswith("foto_"):
-                ke[k] = _resolve_image_url(v)
+    # Resolve foto_* fields of both records with one batch sign request
+    _resolve_image_fields(result.get("kondisi_rumah"), result.get("kondisi_ekonomi"))
 
     return jsonify({"data": result}), 200
 
@@ -88,7 +99,10 @@ def update_kondisi_admin(nik: int):
         changed = True
 
     if changed:
+        refresh_application_status(nik)
         db.session.commit()
+        if 'B' in (data.get("kondisi_rumah_status"), data.get("kondisi_ekonomi_status")):
+            schedule_sktm_pregen([nik])
 
     updated = {
         "nik": nik,
@@ -110,5 +124,6 @@ def delete_kondisi_admin(nik: int):
     if ekonomi:
         db.session.delete(ekonomi)
 
+    refresh_application_status(nik)
     db.session.commit()
     return jsonify({"message": "Deleted"}), 200
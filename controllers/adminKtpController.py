@@ -1,12 +1,15 @@
 from flask import jsonify, request
 import os
-from utils.supabase_client import make_absolute_signed_url as _make_absolute_signed_url, resolve_image_url as _resolve_image_url
+from utils.supabase_client import make_absolute_signed_url as _make_absolute_signed_url, resolve_image_fields as _resolve_image_fields
 from sqlalchemy.exc import IntegrityError
 from extension import db
 from models.ktpModel import KTP
 from schema.adminKtpSchema import admin_ktp_schema, admin_update_status_schema, admin_ktp_summary_schema
 from marshmallow import ValidationError
 from dotenv import load_dotenv
+from utils.application_status import refresh_application_status
+from utils.sktm_pregen import schedule_sktm_pregen
+from utils.pagination import parse_page_params, paginate_query, PaginationError
 
 load_dotenv()
 
@@ -15,13 +18,18 @@ def get_all_ktp_admin_controller():
         if request.method != 'GET':
             return jsonify({"message": "Method Not Allowed"}), 405
 
-        ktps = KTP.query.order_by(KTP.id_ktp.desc()).all()
-        if not ktps:
+        try:
+            params = parse_page_params(request.args, default_sort='desc')
+        except PaginationError as pe:
+            return jsonify({"message": str(pe)}), 400
+
+        ktps, meta = paginate_query(KTP.query, KTP.id_ktp, params)
+        if not ktps and params.cursor is None and (params.page or 1) == 1:
             return jsonify({"message": "Tidak ada data KTP yang ditemukan"}), 404
 
         # Use summary schema for listing to avoid including/resolving photo fields
         data = [admin_ktp_summary_schema.dump(k) for k in ktps]
-        return jsonify({"message": "Data KTP berhasil diambil", "count": len(data), "data": data}), 200
+        return jsonify({"message": "Data KTP berhasil diambil", "count": len(data), **meta, "data": data}), 200
 
     except Exception as e:
         return jsonify({"message": f"Terjadi kesalahan server: {str(e)}"}), 500
@@ -36,9 +44,8 @@ def get_ktp_detail_admin_controller(nik: int):
             return jsonify({"message": f"KTP untuk nik {nik} tidak ditemukan"}), 404
 
         result = admin_ktp_schema.dump(ktp)
-        # Convert any relative signed paths to absolute signed URLs (refresh token if needed)
-        result["foto_ktp"] = _resolve_image_url(result.get("foto_ktp"))
-        result["foto_surat_pengantar_rt_rw"] = _resolve_image_url(result.get("foto_surat_pengantar_rt_rw"))
+        # Convert any relative signed paths to absolute signed URLs (one batch sign request)
+        _resolve_image_fields(result)
         return jsonify({"message": "Data KTP berhasil diambil", "data": result}), 200
 
     except Exception as e:
@@ -61,7 +68,10 @@ def update_ktp_status_controller(nik: int):
             return jsonify({"message": f"KTP untuk nik {nik} tidak ditemukan"}), 404
 
         ktp.status = new_status
+        refresh_application_status(nik)
         db.session.commit()
+        if new_status == 'B':
+            schedule_sktm_pregen([nik])
 
         return jsonify({"message": "Status KTP berhasil diperbarui", "data": admin_ktp_schema.dump(ktp)}), 200
 
@@ -81,6 +91,7 @@ def delete_ktp_controller(nik: int):
             return jsonify({"message": f"KTP untuk nik {nik} tidak ditemukan"}), 404
 
         db.session.delete(ktp)
+        refresh_application_status(nik)
         db.session.commit()
 
         return jsonify({"message": "KTP berhasil dihapus"}), 200
@@ -0,0 +1,24 @@
+from flask import jsonify, request
+from utils.supabase_client import get_revocation_cache_stats, get_revocation_rpc_stats, get_signed_url_cache_stats
+from utils.http_client import get_http_metrics
+from utils.sktm_renderer import get_render_metrics
+from utils.sktm_pregen import get_pregen_metrics
+
+
+def get_metrics_controller():
+    try:
+        if request.method != 'GET':
+            return jsonify({"message": "Method Not Allowed"}), 405
+
+        data = {
+            "revocation_cache": get_revocation_cache_stats(),
+            "revocation_rpc": get_revocation_rpc_stats(),
+            "signed_url_cache": get_signed_url_cache_stats(),
+            "http": get_http_metrics(),
+            "sktm_render": get_render_metrics(),
+            "sktm_pregen": get_pregen_metrics(),
+        }
+        return jsonify({"message": "Metrics berhasil diambil", "data": data}), 200
+
+    except Exception as e:
+        return jsonify({"message": f"Terjadi kesalahan server: {str(e)}"}), 500
@@ -0,0 +1,27 @@
+from flask import request, jsonify
+from marshmallow import ValidationError
+from extension import db
+from schema.adminSktmBatchSchema import admin_sktm_batch_schema
+from utils.sktm_batch import run_sktm_batch
+
+
+def run_sktm_batch_controller():
+    """Generate up to `limit` missing SKTM PDFs for approved NIKs; call again while `remaining` is true."""
+    try:
+        if request.method != 'POST':
+            return jsonify({"message": "Method Not Allowed"}), 405
+
+        try:
+            params = admin_sktm_batch_schema.load(request.get_json(silent=True) or {})
+        except ValidationError as ve:
+            return jsonify({"message": "Validation error", "errors": ve.messages}), 400
+
+        result = run_sktm_batch(niks=params["niks"], limit=params["limit"])
+        return jsonify({
+            "message": "Batch SKTM selesai" if not result["remaining"] else "Batch SKTM sebagian selesai, panggil lagi untuk melanjutkan",
+            **result,
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": f"Terjadi kesalahan server: {str(e)}"}), 500
@@ -14,6 +14,7 @@ from utils.supabase_client import (
 )
 import uuid
 from schema.authSchema import RegisterSchema, LoginSchema
+from utils.application_status import refresh_application_status
 
 
 def register_controller(payload: dict) -> Tuple[dict, int]:
@@ -36,6 +37,7 @@ def register_controller(payload: dict) -> Tuple[dict, int]:
         password=password_hash,
     )
     db.session.add(masyarakat)
+    refresh_application_status(masyarakat.nik)
     db.session.commit()
 
     return {"message": "Registrasi berhasil", "nik": data["nik"], "nama":data["nama"]}, 201
@@ -7,7 +7,9 @@ from models.humancapitalModel import HumanCapital
 from schema.userKkSchema import kk_schema, kk_create_schema, hc_schema
 from marshmallow import ValidationError
 from utils.supabase_client import upload_file_from_storage, delete_file_by_url
+from utils.upload_tickets import verified_upload_ref
 import os
+from utils.application_status import refresh_application_status
 
 # [CREATE] POST KK
 def create_kartu_keluarga_controller():
@@ -36,6 +38,13 @@ def create_kartu_keluarga_controller():
 		files = request.files or {}
 		if files.get('foto_kk'):
 			data['foto_kk'] = upload_file_from_storage(bucket, nik_from_token, files.get('foto_kk'), 'kk', 'foto_kk')
+		else:
+			# a form value is only accepted as the receipt of a finalized direct upload (POST /api/user/uploads/finalize)
+			ref = verified_upload_ref(data.get('foto_kk'), nik_from_token, 'kk', 'foto_kk', bucket)
+			if ref:
+				data['foto_kk'] = ref
+			else:
+				data.pop('foto_kk', None)
 
 		try:
 			kk = kk_create_schema.load(data)
@@ -60,6 +69,7 @@ def create_kartu_keluarga_controller():
 			if hasattr(kk, '_human_capital'):
 				db.session.add(kk._human_capital)
 
+		refresh_application_status(kk.nik)
 		db.session.commit()
 
 		hc_response = hc_obj if hc_obj else getattr(kk, '_human_capital', None)
@@ -152,6 +162,7 @@ def update_kartu_keluarga_controller(nik: int):
 			if 'status_human' in data:
 				hc.status = data.get('status_human')
 
+		refresh_application_status(kk.nik)
 		db.session.commit()
 		response_data = kk_schema.dump(kk)
 		response_data['human_capital'] = hc_schema.dump(hc) if hc else None
@@ -3,14 +3,19 @@ from models.kondisirumahModel import KondisiRumah
 from models.kondisiekonomiModel import KondisiEkonomi
 from models.masyarakatModel import Masyarakat
 from schema.userKondisiEkonomiSchema import user_schema, rumah_schema, ekonomi_schema
-from utils.supabase_client import upload_file_from_storage, delete_file_by_url
+from utils.supabase_client import upload_file_from_storage, delete_file_by_url, upload_files_concurrently, delete_files_by_url
 import os
 from marshmallow import ValidationError
 from flask import request, jsonify
 from flask_jwt_extended import get_jwt_identity
+from utils.upload_tickets import verified_upload_ref
 import json
 
 import re
+from utils.application_status import refresh_application_status
+
+RUMAH_PHOTO_FIELDS = ("foto_depan_rumah", "foto_atap", "foto_lantai", "foto_kamar_mandi")
+EKONOMI_PHOTO_FIELDS = ("foto_slip_gaji", "foto_token_listrik")
 
 
 def _extract_int(value):
@@ -63,12 +68,6 @@ def create_user_kondisi(payload: dict, files: dict):
     kondisi_rumah = {}
     kondisi_ekonomi = {}
 
-    # house photos
-    kondisi_rumah["foto_depan_rumah"] = upload_file_from_storage(bucket, nik, files.get("foto_depan_rumah"), "kondisi_rumah", "foto_depan_rumah")
-    kondisi_rumah["foto_atap"] = upload_file_from_storage(bucket, nik, files.get("foto_atap"), "kondisi_rumah", "foto_atap")
-    kondisi_rumah["foto_lantai"] = upload_file_from_storage(bucket, nik, files.get("foto_lantai"), "kondisi_rumah", "foto_lantai")
-    kondisi_rumah["foto_kamar_mandi"] = upload_file_from_storage(bucket, nik, files.get("foto_kamar_mandi"), "kondisi_rumah", "foto_kamar_mandi")
-
     nominal_raw = payload.get("nominal_slip_gaji")
     if nominal_raw is None:
         ke = payload.get("kondisi_ekonomi")
@@ -87,8 +86,6 @@ def create_user_kondisi(payload: dict, files: dict):
                 nominal_raw = ke_parsed.get("nominal_slip_gaji") or ke_parsed.get("nominal") or ke_parsed.get("amount")
 
     nominal_val = _extract_int(nominal_raw)
-    kondisi_ekonomi["nominal_slip_gaji"] = nominal_val
-    kondisi_ekonomi["foto_slip_gaji"] = upload_file_from_storage(bucket, nik, files.get("foto_slip_gaji"), "kondisi_ekonomi", "foto_slip_gaji")
     daya_raw = payload.get("daya_listrik_va")
     if daya_raw:
         try:
@@ -97,8 +94,24 @@ def create_user_kondisi(payload: dict, files: dict):
             return {"message": "daya_listrik_va harus berupa angka (integer)"}, 400
     else:
         daya_val = None
+
+    # upload all photos concurrently; latency is the slowest upload instead of the sum
+    upload_jobs = [(fld, files.get(fld), "kondisi_rumah") for fld in RUMAH_PHOTO_FIELDS]
+    upload_jobs += [(fld, files.get(fld), "kondisi_ekonomi") for fld in EKONOMI_PHOTO_FIELDS]
+    uploaded, upload_failures = upload_files_concurrently(bucket, nik, upload_jobs)
+
+    def _photo(fld, section):
+        # photos uploaded directly to storage (upload ticket + finalize) arrive as finalize receipts
+        if uploaded.get(fld):
+            return uploaded[fld]
+        return verified_upload_ref(payload.get(fld), nik, section, fld, bucket)
+
+    for fld in RUMAH_PHOTO_FIELDS:
+        kondisi_rumah[fld] = _photo(fld, "kondisi_rumah")
+    kondisi_ekonomi["nominal_slip_gaji"] = nominal_val
+    kondisi_ekonomi["foto_slip_gaji"] = _photo("foto_slip_gaji", "kondisi_ekonomi")
     kondisi_ekonomi["daya_listrik_va"] = daya_val
-    kondisi_ekonomi["foto_token_listrik"] = upload_file_from_storage(bucket, nik, files.get("foto_token_listrik"), "kondisi_ekonomi", "foto_token_listrik")
+    kondisi_ekonomi["foto_token_listrik"] = _photo("foto_token_listrik", "kondisi_ekonomi")
 
     final_payload = {
         "nik": nik,
@@ -109,16 +122,9 @@ def create_user_kondisi(payload: dict, files: dict):
     print("[DEBUG] received file keys:", list(files.keys())) 
     print("[DEBUG] final_payload for validation:", final_payload)
 
-    upload_failures = []
-    for fld in ("foto_depan_rumah", "foto_atap", "foto_lantai", "foto_kamar_mandi"):
-        if files.get(fld) and not kondisi_rumah.get(fld):
-            upload_failures.append(fld)
-    
-    for fld in ("foto_slip_gaji", "foto_token_listrik"):
-        if files.get(fld) and not kondisi_ekonomi.get(fld):
-            upload_failures.append(fld)
-
     if upload_failures:
+        # compensation: remove the files that did upload so nothing is orphaned
+        delete_files_by_url(bucket, uploaded.values())
         msg = {"message": "Upload failed for files", "failed_fields": upload_failures}
         print("[DEBUG] upload failures:", upload_failures)
         return msg, 502
@@ -126,6 +132,7 @@ def create_user_kondisi(payload: dict, files: dict):
     try:
         data = user_schema.load(final_payload)
     except ValidationError as ve:
+        delete_files_by_url(bucket, uploaded.values())
         error_payload = {
             "message": "Validation error",
             "errors": ve.messages,
@@ -137,15 +144,22 @@ def create_user_kondisi(payload: dict, files: dict):
         print("[DEBUG] validation failed:", ve.messages)
         return error_payload, 400
     except Exception as e:
+        delete_files_by_url(bucket, uploaded.values())
         print("[DEBUG] unexpected validation exception:", str(e))
         return {"message": "Validation error", "errors": str(e), "debug": {"final_payload": final_payload}}, 400
 
     rumah = KondisiRumah(nik=nik, **data["kondisi_rumah"])
     ekonomi = KondisiEkonomi(nik=nik, **data["kondisi_ekonomi"])
 
-    db.session.add(rumah)
-    db.session.add(ekonomi)
-    db.session.commit()
+    try:
+        db.session.add(rumah)
+        db.session.add(ekonomi)
+        refresh_application_status(nik)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        delete_files_by_url(bucket, uploaded.values())
+        return {"message": f"Terjadi kesalahan server: {str(e)}"}, 500
 
     result = {
         "nik": nik,
@@ -277,6 +291,7 @@ def update_user_kondisi(nik: int, payload: dict, files: dict):
         if ekonomi:
             ekonomi.foto_token_listrik = url
 
+    refresh_application_status(nik)
     db.session.commit()
 
     updated = get_user_kondisi(nik)
@@ -6,7 +6,9 @@ from models.ktpModel import KTP
 from schema.userKtpSchema import ktp_schema, ktp_create_schema
 from marshmallow import ValidationError
 from utils.supabase_client import upload_file_from_storage, delete_file_by_url
+from utils.upload_tickets import verified_upload_ref
 import os
+from utils.application_status import refresh_application_status
 
 # [CREATE] POST KTP
 def create_ktp_controller():
@@ -25,10 +27,16 @@ def create_ktp_controller():
 		bucket = os.environ.get("SUPABASE_STORAGE_BUCKET", "public")
 		
 		files = request.files or {}
-		if files.get('foto_ktp'):
-			data['foto_ktp'] = upload_file_from_storage(bucket, nik_from_token, files.get('foto_ktp'), 'ktp', 'foto_ktp')
-		if files.get('foto_surat_pengantar_rt_rw'):
-			data['foto_surat_pengantar_rt_rw'] = upload_file_from_storage(bucket, nik_from_token, files.get('foto_surat_pengantar_rt_rw'), 'ktp', 'foto_surat_pengantar_rt_rw')
+		for field in ('foto_ktp', 'foto_surat_pengantar_rt_rw'):
+			if files.get(field):
+				data[field] = upload_file_from_storage(bucket, nik_from_token, files.get(field), 'ktp', field)
+			else:
+				# a form value is only accepted as the receipt of a finalized direct upload (POST /api/user/uploads/finalize)
+				ref = verified_upload_ref(data.get(field), nik_from_token, 'ktp', field, bucket)
+				if ref:
+					data[field] = ref
+				else:
+					data.pop(field, None)
 
 		try:
 			ktp = ktp_create_schema.load(data)
@@ -37,6 +45,7 @@ def create_ktp_controller():
 			return jsonify({"message": "Validation error", "errors": ve.messages}), 400
 
 		db.session.add(ktp)
+		refresh_application_status(nik_from_token)
 		db.session.commit()
 
 		return jsonify({
@@ -116,6 +125,7 @@ def update_ktp_controller(nik: int):
 			if url:
 				ktp.foto_surat_pengantar_rt_rw = url
 
+		refresh_application_status(ktp.nik)
 		db.session.commit()
 		return jsonify({"message": "KTP berhasil diperbarui", "data": ktp_schema.dump(ktp)}), 200
 
@@ -7,6 +7,7 @@ from models.kartukeluargaModel import KartuKeluarga
 from schema.userProfileSchema import profil_schema, profil_update_schema
 from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
+from utils.application_status import refresh_application_status
 
 
 def get_profile_controller(nik: int):
@@ -91,6 +92,7 @@ def update_profile_controller(nik: int):
                 db.session.add(kk)
             kk.no_kk = validated.get('no_kk')
 
+        refresh_application_status(nik)
         db.session.commit()
 
         # Refresh objects
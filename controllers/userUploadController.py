@@ -0,0 +1,148 @@
+import os
+from flask import jsonify, request
+from flask_jwt_extended import get_jwt_identity
+from marshmallow import ValidationError
+from sqlalchemy.exc import IntegrityError
+from extension import db
+from models.ktpModel import KTP
+from models.kartukeluargaModel import KartuKeluarga
+from models.kondisirumahModel import KondisiRumah
+from models.kondisiekonomiModel import KondisiEkonomi
+from schema.userUploadSchema import upload_ticket_request_schema, upload_finalize_schema
+from utils.supabase_client import (
+    create_signed_upload_url,
+    get_object_info,
+    storage_object_ref,
+    delete_file,
+    delete_file_by_url,
+)
+from utils.upload_tickets import (
+    UPLOAD_TICKET_TTL,
+    UPLOAD_MAX_BYTES,
+    UPLOAD_ALLOWED_TYPES,
+    UploadTicketError,
+    build_upload_path,
+    issue_ticket,
+    issue_receipt,
+    read_ticket,
+)
+
+UPLOAD_MODELS = {
+    "ktp": KTP,
+    "kk": KartuKeluarga,
+    "kondisi_rumah": KondisiRumah,
+    "kondisi_ekonomi": KondisiEkonomi,
+}
+
+
+def _nik_from_token():
+    try:
+        return int(get_jwt_identity())
+    except Exception:
+        return None
+
+
+def create_upload_ticket_controller():
+    """Issue a short-lived signed upload URL scoped to {nik}/{folder}/ for a direct client upload."""
+    try:
+        if request.method != 'POST':
+            return jsonify({"message": "Method Not Allowed"}), 405
+
+        nik = _nik_from_token()
+        if nik is None:
+            return jsonify({"message": "Missing or invalid identity token"}), 401
+
+        try:
+            data = upload_ticket_request_schema.load(request.get_json() or {})
+        except ValidationError as ve:
+            return jsonify({"message": "Validation error", "errors": ve.messages}), 400
+
+        bucket = os.environ.get("SUPABASE_STORAGE_BUCKET", "public")
+        path = build_upload_path(nik, data["section"], data["field"], data.get("filename"))
+        signed = create_signed_upload_url(bucket, path)
+        if not signed:
+            return jsonify({"message": "Gagal membuat signed upload URL"}), 502
+
+        ticket = issue_ticket(nik, data["section"], data["field"], bucket, path, data["content_type"])
+        return jsonify({
+            "message": "Upload ticket dibuat",
+            "data": {
+                "upload_url": signed["url"],
+                "token": signed.get("token"),
+                "method": "PUT",
+                "path": path,
+                "ticket": ticket,
+                "expires_in": UPLOAD_TICKET_TTL,
+                "max_bytes": UPLOAD_MAX_BYTES,
+                "content_type": data["content_type"],
+            },
+        }), 201
+
+    except Exception as e:
+        return jsonify({"message": f"Terjadi kesalahan server: {str(e)}"}), 500
+
+
+def finalize_upload_controller():
+    """Verify a directly uploaded object and register its path on the section row."""
+    try:
+        if request.method != 'POST':
+            return jsonify({"message": "Method Not Allowed"}), 405
+
+        nik = _nik_from_token()
+        if nik is None:
+            return jsonify({"message": "Missing or invalid identity token"}), 401
+
+        try:
+            data = upload_finalize_schema.load(request.get_json() or {})
+            ticket = read_ticket(data["ticket"])
+        except ValidationError as ve:
+            return jsonify({"message": "Validation error", "errors": ve.messages}), 400
+        except UploadTicketError as te:
+            return jsonify({"message": "Ticket tidak valid", "error": str(te)}), 400
+
+        if ticket.get("nik") != nik:
+            return jsonify({"message": "Forbidden: ticket milik pengguna lain"}), 403
+
+        bucket, path = ticket["bucket"], ticket["path"]
+        info = get_object_info(bucket, path)
+        if not info:
+            return jsonify({"message": "File belum diunggah ke storage", "path": path}), 404
+
+        size, content_type = info.get("size"), info.get("content_type")
+        if size is None or size > UPLOAD_MAX_BYTES or content_type not in UPLOAD_ALLOWED_TYPES or content_type != ticket.get("content_type"):
+            delete_file(bucket, path)
+            return jsonify({
+                "message": "File ditolak: ukuran atau tipe tidak sesuai",
+                "size": size,
+                "content_type": content_type,
+                "max_bytes": UPLOAD_MAX_BYTES,
+            }), 400
+
+        section, field = ticket["section"], ticket["field"]
+        value = storage_object_ref(bucket, path)
+        row = UPLOAD_MODELS[section].query.filter_by(nik=nik).first()
+        if not row:
+            # record not created yet: client sends `receipt` as the field's value in the create request for this section
+            receipt = issue_receipt(nik, section, field, bucket, path)
+            return jsonify({"message": "Upload terverifikasi", "data": {
+                "registered": False, "section": section, "field": field, "value": value, "receipt": receipt,
+            }}), 200
+
+        previous = getattr(row, field, None)
+        setattr(row, field, value)
+        db.session.commit()
+
+        if previous and previous != value:
+            try:
+                delete_file_by_url(bucket, previous)
+            except Exception:
+                pass
+
+        return jsonify({"message": "Upload terverifikasi", "data": {"registered": True, "section": section, "field": field, "value": value}}), 200
+
+    except IntegrityError as ie:
+        db.session.rollback()
+        return jsonify({"message": f"Integrity error: {str(ie.orig)}"}), 500
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": f"Terjadi kesalahan server: {str(e)}"}), 500
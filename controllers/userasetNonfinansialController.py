@@ -8,6 +8,7 @@ from schema.userasetNonfinansialSchema import (
     DetailKendaraanSchema,
 )
 from marshmallow import ValidationError
+from utils.application_status import refresh_application_status
 
 
 user_schema = UserAsetNonFinansialSchema()
@@ -54,6 +55,7 @@ def create_user_aset():
         aset.detail_kendaraan.append(dk)
 
     db.session.add(aset)
+    refresh_application_status(nik)
     db.session.commit()
 
     return jsonify({"message": "Created", "data": user_schema.dump(aset)}), 201
@@ -97,6 +99,7 @@ def update_user_aset(nik: int):
             aset.detail_kendaraan.append(dk)
 
         db.session.add(aset)
+        refresh_application_status(nik)
         db.session.commit()
 
         return jsonify({"message": "Created", "data": user_schema.dump(aset)}), 201
@@ -127,6 +130,7 @@ def update_user_aset(nik: int):
             )
             aset.detail_kendaraan.append(dk)
 
+    refresh_application_status(nik)
     db.session.commit()
 
     return jsonify({"message": "Updated", "data": user_schema.dump(aset)}), 200
@@ -0,0 +1,36 @@
+"""sktm_generation_lock table
+
+One row per NIK while its SKTM PDF is being generated, so concurrent
+downloads across workers render and upload it only once.
+
+Revision ID: 1e244629591c
+Revises: 9f273c1bbe40
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1e244629591c'
+down_revision = '9f273c1bbe40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'sktm_generation_lock',
+        sa.Column('nik', sa.BigInteger(), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('owner', sa.String(length=128), nullable=False),
+        sa.Column('acquired_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['nik'], ['masyarakat.nik']),
+        sa.PrimaryKeyConstraint('nik'),
+    )
+
+
+def downgrade():
+    op.drop_table('sktm_generation_lock')
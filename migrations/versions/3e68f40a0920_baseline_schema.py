@@ -0,0 +1,153 @@
+"""baseline schema
+
+Tables as they existed before migrations were introduced. On a database that
+already has them run `flask db stamp 3e68f40a0920` once, then `flask db upgrade`.
+
+Revision ID: 3e68f40a0920
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = '3e68f40a0920'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+STATUS = ("B", "T", "P")
+
+
+def upgrade():
+    op.create_table(
+        'masyarakat',
+        sa.Column('nik', sa.Integer(), nullable=False),
+        sa.Column('nama', sa.String(length=255), nullable=True),
+        sa.Column('jenis_kelamin', sa.Enum('L', 'P', name='jenis_kelamin_enum'), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=True),
+        sa.Column('nomor_hp', sa.String(length=15), nullable=True),
+        sa.Column('password', sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('nik'),
+    )
+    op.create_table(
+        'ktp',
+        sa.Column('id_ktp', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('nik', sa.Integer(), nullable=False),
+        sa.Column('tempat_lahir', sa.String(length=255), nullable=True),
+        sa.Column('tanggal_lahir', sa.Date(), nullable=True),
+        sa.Column('alamat', sa.Text(), nullable=True),
+        sa.Column('foto_ktp', sa.String(length=255), nullable=True),
+        sa.Column('foto_surat_pengantar_rt_rw', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.Enum(*STATUS, name='status_enum'), nullable=False),
+        sa.ForeignKeyConstraint(['nik'], ['masyarakat.nik']),
+        sa.PrimaryKeyConstraint('id_ktp'),
+        sa.UniqueConstraint('nik'),
+    )
+    op.create_table(
+        'human_capital',
+        sa.Column('id_human_capital', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('nik', sa.Integer(), nullable=False),
+        sa.Column('tingkat_pendidikan_kepala_keluarga', sa.String(length=50), nullable=True),
+        sa.Column('anak_tidak_sekolah', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.Enum(*STATUS, name='status_enum'), nullable=False),
+        sa.ForeignKeyConstraint(['nik'], ['masyarakat.nik']),
+        sa.PrimaryKeyConstraint('id_human_capital'),
+        sa.UniqueConstraint('nik'),
+    )
+    op.create_table(
+        'kondisi_rumah',
+        sa.Column('id_kondisi_rumah', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('nik', sa.Integer(), nullable=False),
+        sa.Column('foto_depan_rumah', sa.String(length=255), nullable=True),
+        sa.Column('foto_atap', sa.String(length=255), nullable=True),
+        sa.Column('foto_lantai', sa.String(length=255), nullable=True),
+        sa.Column('foto_kamar_mandi', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.Enum(*STATUS, name='status_enum'), nullable=False),
+        sa.ForeignKeyConstraint(['nik'], ['masyarakat.nik']),
+        sa.PrimaryKeyConstraint('id_kondisi_rumah'),
+        sa.UniqueConstraint('nik'),
+    )
+    op.create_table(
+        'kondisi_ekonomi',
+        sa.Column('id_kondisi_ekonomi', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('nik', sa.Integer(), nullable=False),
+        sa.Column('nominal_slip_gaji', sa.Integer(), nullable=True),
+        sa.Column('foto_slip_gaji', sa.String(length=255), nullable=True),
+        sa.Column('daya_listrik_va', sa.Integer(), nullable=True),
+        sa.Column('foto_token_listrik', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.Enum(*STATUS, name='status_enum'), nullable=False),
+        sa.ForeignKeyConstraint(['nik'], ['masyarakat.nik']),
+        sa.PrimaryKeyConstraint('id_kondisi_ekonomi'),
+        sa.UniqueConstraint('nik'),
+    )
+    op.create_table(
+        'aset_non_financial',
+        sa.Column('id_aset_non_financial', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('nik', sa.Integer(), nullable=False),
+        sa.Column('total_kendaraan', sa.Integer(), nullable=True),
+        sa.Column('status', sa.Enum(*STATUS, name='status_enum'), nullable=False),
+        sa.ForeignKeyConstraint(['nik'], ['masyarakat.nik']),
+        sa.PrimaryKeyConstraint('id_aset_non_financial'),
+        sa.UniqueConstraint('nik'),
+    )
+    op.create_table(
+        'detail_kendaraan',
+        sa.Column('id_detail_kendaraan', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('id_aset_non_financial', sa.Integer(), nullable=False),
+        sa.Column('jenis_kendaraan', sa.String(length=100), nullable=True),
+        sa.Column('tipe_kendaraan', sa.String(length=100), nullable=True),
+        sa.Column('tahun_pembuatan', sa.Integer().with_variant(mysql.YEAR(), 'mysql'), nullable=True),
+        sa.Column('status', sa.Enum(*STATUS, name='status_enum'), nullable=False),
+        sa.ForeignKeyConstraint(['id_aset_non_financial'], ['aset_non_financial.id_aset_non_financial']),
+        sa.PrimaryKeyConstraint('id_detail_kendaraan'),
+    )
+    op.create_table(
+        'draft_server',
+        sa.Column('id_draft_server', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('nik', sa.Integer(), nullable=False),
+        sa.Column('checksum', sa.String(length=255), nullable=True),
+        sa.Column('serverVersion', sa.Integer(), nullable=True),
+        sa.Column('last_edit', sa.DateTime(), nullable=True),
+        sa.Column('status', sa.Enum(*STATUS, name='status_enum'), nullable=False),
+        sa.Column('data_json', mysql.JSON(), nullable=True),
+        sa.ForeignKeyConstraint(['nik'], ['masyarakat.nik']),
+        sa.PrimaryKeyConstraint('id_draft_server'),
+    )
+    op.create_table(
+        'petugas',
+        sa.Column('nip', sa.Integer(), nullable=False),
+        sa.Column('nik', sa.Integer(), nullable=False),
+        sa.Column('password', sa.String(length=255), nullable=True),
+        sa.Column('role', sa.String(length=10), nullable=True),
+        sa.ForeignKeyConstraint(['nik'], ['masyarakat.nik']),
+        sa.PrimaryKeyConstraint('nip'),
+    )
+    op.create_table(
+        'kartu_keluarga',
+        sa.Column('id_kk', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('no_kk', sa.Integer(), nullable=True),
+        sa.Column('nama_kepala_keluarga', sa.String(length=255), nullable=True),
+        sa.Column('alamat', sa.Text(), nullable=True),
+        sa.Column('foto_kk', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.Enum('P', 'T', 'B', name='kartu_keluarga_status_enum'), nullable=True),
+        sa.Column('nik', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['nik'], ['masyarakat.nik']),
+        sa.PrimaryKeyConstraint('id_kk'),
+    )
+
+
+def downgrade():
+    op.drop_table('kartu_keluarga')
+    op.drop_table('petugas')
+    op.drop_table('draft_server')
+    op.drop_table('detail_kendaraan')
+    op.drop_table('aset_non_financial')
+    op.drop_table('kondisi_ekonomi')
+    op.drop_table('kondisi_rumah')
+    op.drop_table('human_capital')
+    op.drop_table('ktp')
+    op.drop_table('masyarakat')
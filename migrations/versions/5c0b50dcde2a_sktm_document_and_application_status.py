@@ -0,0 +1,65 @@
+"""sktm_document, sktm_prune_hint and application_status tables
+
+Revision ID: 5c0b50dcde2a
+Revises: 3e68f40a0920
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c0b50dcde2a'
+down_revision = '3e68f40a0920'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'sktm_document',
+        sa.Column('id_sktm_document', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('nik', sa.Integer(), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('bucket', sa.String(length=255), nullable=False),
+        sa.Column('path', sa.String(length=512), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['nik'], ['masyarakat.nik']),
+        sa.PrimaryKeyConstraint('id_sktm_document'),
+        sa.UniqueConstraint('content_hash'),
+    )
+    op.create_index('ix_sktm_document_nik', 'sktm_document', ['nik'], unique=False)
+
+    op.create_table(
+        'sktm_prune_hint',
+        sa.Column('nik', sa.Integer(), nullable=False),
+        sa.Column('requested_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['nik'], ['masyarakat.nik']),
+        sa.PrimaryKeyConstraint('nik'),
+    )
+
+    op.create_table(
+        'application_status',
+        sa.Column('nik', sa.Integer(), nullable=False),
+        sa.Column('ktp_status', sa.String(length=1), nullable=True),
+        sa.Column('kartu_keluarga_status', sa.String(length=1), nullable=True),
+        sa.Column('kondisi_rumah_status', sa.String(length=1), nullable=True),
+        sa.Column('kondisi_ekonomi_status', sa.String(length=1), nullable=True),
+        sa.Column('aset_non_financial_status', sa.String(length=1), nullable=True),
+        sa.Column('fill_progress', sa.Float(), nullable=False),
+        sa.Column('fill_satisfied', sa.Integer(), nullable=False),
+        sa.Column('fill_total', sa.Integer(), nullable=False),
+        sa.Column('fill_missing', sa.Text(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['nik'], ['masyarakat.nik']),
+        sa.PrimaryKeyConstraint('nik'),
+    )
+    # existing citizens get their row lazily on first read, or at once via `flask sktm rebuild-status`
+
+
+def downgrade():
+    op.drop_table('application_status')
+    op.drop_table('sktm_prune_hint')
+    op.drop_index('ix_sktm_document_nik', table_name='sktm_document')
+    op.drop_table('sktm_document')
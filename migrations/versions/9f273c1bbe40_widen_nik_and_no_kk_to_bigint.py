@@ -0,0 +1,354 @@
+"""widen nik and no_kk to BIGINT
+
+Indonesian NIK and KK numbers are 16 digits and do not fit a 32-bit INT.
+
+MySQL cannot change a column type with ALGORITHM=INPLACE or INSTANT, and
+ALGORITHM=COPY blocks writes for the whole rebuild. On MySQL the affected
+tables are therefore rebuilt the way pt-online-schema-change does it, all of
+them swapped in one statement so the foreign keys between them never go away:
+
+1. `_<table>_new` is created LIKE the table with the new column types, and
+   AFTER INSERT/UPDATE/DELETE triggers on the table mirror every write into it.
+2. Existing rows are copied in primary-key chunks of NIK_MIGRATION_BATCH rows
+   (default 5000) with INSERT IGNORE ... SELECT, one autocommit statement per
+   chunk, so rows are only locked for one chunk. A row the triggers already
+   wrote is newer and is kept.
+3. Each table's foreign keys are re-created on its copy, pointing at the other
+   copies, and foreign keys of untouched tables (detail_kendaraan) are pointed
+   at the copies too. This is ALGORITHM=INPLACE, LOCK=NONE with
+   foreign_key_checks off; the rows were already checked on the live tables.
+4. One RENAME TABLE swaps every table with its copy, atomically. Foreign keys
+   follow renamed tables, so they end up on the widened tables.
+5. The triggers and the `_<table>_old` tables are dropped.
+
+Statements that need a metadata lock on a live table (the triggers, the
+foreign key moves, the RENAME) wait at most NIK_MIGRATION_LOCK_WAIT seconds
+(default 5) behind running transactions, so they never queue traffic for
+long. They are retried up to NIK_MIGRATION_LOCK_RETRIES times (default 10).
+
+Every step skips work already done, so an interrupted run can simply be
+started again. The downgrade uses the same procedure back to INT.
+
+Before running it on production:
+- The migration user needs the TRIGGER privilege. With binary logging and
+  without SUPER, it also needs log_bin_trust_function_creators=1.
+- There must be free disk for one more copy of the twelve tables.
+- Rehearse on a copy of production:
+  MYSQL_TEST_URL=mysql+pymysql://... python -m pytest tests/test_widen_nik_migration.py
+  This runs the upgrade and downgrade against that database while writes
+  continue. The database is emptied first.
+Other databases use a plain ALTER COLUMN.
+
+Revision ID: 9f273c1bbe40
+Revises: bc1e3f043e3c
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+import os
+import time
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9f273c1bbe40'
+down_revision = 'bc1e3f043e3c'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = int(os.environ.get("NIK_MIGRATION_BATCH", "5000"))
+LOCK_WAIT = int(os.environ.get("NIK_MIGRATION_LOCK_WAIT", "5"))
+LOCK_RETRIES = int(os.environ.get("NIK_MIGRATION_LOCK_RETRIES", "10"))
+
+# tables whose nik references masyarakat.nik
+CHILD_TABLES = [
+    'ktp',
+    'human_capital',
+    'kondisi_rumah',
+    'kondisi_ekonomi',
+    'aset_non_financial',
+    'draft_server',
+    'petugas',
+    'kartu_keluarga',
+    'sktm_document',
+    'sktm_prune_hint',
+    'application_status',
+]
+
+# (table, column, nullable); children before the parent
+COLUMNS = [(table, 'nik', False) for table in CHILD_TABLES] + [
+    ('masyarakat', 'nik', False),
+    ('kartu_keluarga', 'no_kk', True),
+]
+
+TRIGGER_EVENTS = ('ins', 'upd', 'del')
+MYSQL_LOCK_WAIT_TIMEOUT = 1205
+
+
+def _q(name):
+    return f"`{name}`"
+
+
+def _new(table):
+    return f"_{table}_new"
+
+
+def _old(table):
+    return f"_{table}_old"
+
+
+def _trigger(table, event):
+    return f"_{table}_{event}"
+
+
+def _toggled(name):
+    # a table's copy cannot reuse the live table's constraint names (they are schema-wide)
+    return name[1:] if name.startswith('_') else f"_{name}"
+
+
+def _retyped_tables():
+    """{table: [(column, nullable), ...]} in COLUMNS order."""
+    tables = {}
+    for table, column, nullable in COLUMNS:
+        tables.setdefault(table, []).append((column, nullable))
+    return tables
+
+
+def _has_type(insp, table, columns, type_sql):
+    types = {c['name']: c['type'] for c in insp.get_columns(table)}
+    return all(isinstance(types[column], sa.BigInteger) == (type_sql == 'BIGINT') for column, _ in columns)
+
+
+def _trigger_sql(table, columns, pk):
+    """AFTER triggers that mirror every write on `table` into its copy.
+
+    Inserts and updates are upserts, never delete + insert: once the copies have their
+    foreign keys, deleting a copied parent row that copied children still reference
+    would fail (REPLACE) or be skipped (DELETE IGNORE), and the live write with it.
+    """
+    new = _q(_new(table))
+    names = ", ".join(_q(c) for c in columns)
+    values = ", ".join(f"NEW.{_q(c)}" for c in columns)
+    updates = ", ".join(f"{_q(c)} = VALUES({_q(c)})" for c in columns)
+    upsert = f"INSERT INTO {new} ({names}) VALUES ({values}) ON DUPLICATE KEY UPDATE {updates}"
+    delete = f"DELETE FROM {new} WHERE {_q(pk)} <=> OLD.{_q(pk)}"
+    return [
+        f"CREATE TRIGGER {_q(_trigger(table, 'ins'))} AFTER INSERT ON {_q(table)} FOR EACH ROW {upsert}",
+        # a changed primary key leaves the old row behind; the live foreign keys already refused the
+        # update if anything referenced it
+        f"CREATE TRIGGER {_q(_trigger(table, 'upd'))} AFTER UPDATE ON {_q(table)} FOR EACH ROW BEGIN "
+        f"IF NOT (OLD.{_q(pk)} <=> NEW.{_q(pk)}) THEN {delete}; END IF; {upsert}; END",
+        f"CREATE TRIGGER {_q(_trigger(table, 'del'))} AFTER DELETE ON {_q(table)} FOR EACH ROW {delete}",
+    ]
+
+
+def _foreign_key_sql(fk, referred):
+    options = fk.get('options') or {}
+    sql = (
+        f"ADD CONSTRAINT {_q(_toggled(fk['name']))} FOREIGN KEY ({', '.join(_q(c) for c in fk['constrained_columns'])}) "
+        f"REFERENCES {_q(referred)} ({', '.join(_q(c) for c in fk['referred_columns'])})"
+    )
+    if options.get('ondelete'):
+        sql += f" ON DELETE {options['ondelete']}"
+    if options.get('onupdate'):
+        sql += f" ON UPDATE {options['onupdate']}"
+    return sql
+
+
+def _rename_sql(tables):
+    pairs = ", ".join(f"{_q(t)} TO {_q(_old(t))}, {_q(_new(t))} TO {_q(t)}" for t in tables)
+    return f"RENAME TABLE {pairs}"
+
+
+def _triggers_of(bind, table):
+    return set(bind.execute(sa.text(
+        "SELECT TRIGGER_NAME FROM information_schema.TRIGGERS "
+        "WHERE TRIGGER_SCHEMA = DATABASE() AND EVENT_OBJECT_TABLE = :table"
+    ), {"table": table}).scalars())
+
+
+def _check_foreign_key_actions(insp, tables):
+    # cascaded foreign key actions do not fire triggers, so the copies would silently diverge
+    for table in insp.get_table_names():
+        for fk in insp.get_foreign_keys(table):
+            touched = table in tables or fk['referred_table'] in tables
+            actions = {((fk.get('options') or {}).get(k) or '').upper() for k in ('ondelete', 'onupdate')}
+            if touched and actions & {'CASCADE', 'SET NULL', 'SET DEFAULT'}:
+                raise RuntimeError(f"{table}.{fk['name']} uses a cascading action; rebuild it without one before this migration")
+
+
+def _execute_on_live(bind, sql):
+    """Run DDL that needs a live table's metadata lock, retrying while long transactions hold it."""
+    for attempt in range(1, LOCK_RETRIES + 1):
+        try:
+            bind.execute(sa.text(sql))
+            return
+        except sa.exc.OperationalError as e:
+            if getattr(e.orig, 'args', [None])[0] != MYSQL_LOCK_WAIT_TIMEOUT or attempt == LOCK_RETRIES:
+                raise
+            time.sleep(attempt)
+
+
+def _prepare_copy(bind, table, columns, type_sql):
+    """Create `_<table>_new` with the new column types and the triggers that keep it in sync."""
+    new = _new(table)
+    wanted = {_trigger(table, event) for event in TRIGGER_EVENTS}
+    existing = _triggers_of(bind, table)
+    if new in sa.inspect(bind).get_table_names() and wanted <= existing:
+        return
+    # a copy without all of its triggers may have missed writes: start it again
+    for name in wanted & existing:
+        _execute_on_live(bind, f"DROP TRIGGER {_q(name)}")
+    bind.execute(sa.text(f"DROP TABLE IF EXISTS {_q(new)}"))
+    bind.execute(sa.text(f"CREATE TABLE {_q(new)} LIKE {_q(table)}"))
+
+    insp = sa.inspect(bind)
+    info = {c['name']: c for c in insp.get_columns(table)}
+    modify = ", ".join(
+        f"MODIFY {_q(column)} {type_sql} {'NULL' if nullable else 'NOT NULL'}{' AUTO_INCREMENT' if info[column].get('autoincrement') is True else ''}"
+        for column, nullable in columns
+    )
+    bind.execute(sa.text(f"ALTER TABLE {_q(new)} {modify}"))
+
+    pk = insp.get_pk_constraint(table)['constrained_columns']
+    if len(pk) != 1:
+        raise RuntimeError(f"{table} needs a single-column primary key for the online copy")
+    for sql in _trigger_sql(table, list(info), pk[0]):
+        _execute_on_live(bind, sql)
+
+
+def _copy_rows(bind, table):
+    """Copy existing rows into the copy in primary-key chunks, one autocommit statement each."""
+    insp = sa.inspect(bind)
+    pk = _q(insp.get_pk_constraint(table)['constrained_columns'][0])
+    names = ", ".join(_q(c['name']) for c in insp.get_columns(table))
+    last = None
+    while True:
+        lower = [] if last is None else [f"{pk} > :last"]
+        params = {} if last is None else {"last": last}
+        upper = bind.execute(sa.text(
+            f"SELECT {pk} FROM {_q(table)} {'WHERE ' + lower[0] if lower else ''} "
+            f"ORDER BY {pk} LIMIT 1 OFFSET {BATCH_SIZE - 1}"
+        ), params).scalar()
+        where = lower + ([] if upper is None else [f"{pk} <= :upper"])
+        if upper is not None:
+            params["upper"] = upper
+        bind.execute(sa.text(
+            f"INSERT IGNORE INTO {_q(_new(table))} ({names}) SELECT {names} FROM {_q(table)}"
+            f"{' WHERE ' + ' AND '.join(where) if where else ''}"
+        ), params)
+        if upper is None:
+            return
+        last = upper
+
+
+def _point_foreign_keys_at_copies(bind, tables):
+    """Give every copy its table's foreign keys and move other tables' foreign keys onto the copies.
+
+    After the RENAME these reference the widened tables under their final names.
+    """
+    insp = sa.inspect(bind)
+    bind.execute(sa.text("SET foreign_key_checks = 0"))
+    try:
+        for table in tables:
+            present = {(tuple(fk['constrained_columns']), fk['referred_table']) for fk in insp.get_foreign_keys(_new(table))}
+            for fk in insp.get_foreign_keys(table):
+                referred = _new(fk['referred_table']) if fk['referred_table'] in tables else fk['referred_table']
+                if (tuple(fk['constrained_columns']), referred) in present:
+                    continue
+                bind.execute(sa.text(f"ALTER TABLE {_q(_new(table))} {_foreign_key_sql(fk, referred)}, ALGORITHM=INPLACE, LOCK=NONE"))
+
+        copies = {_new(t) for t in tables} | {_old(t) for t in tables}
+        for table in insp.get_table_names():
+            if table in tables or table in copies:
+                continue
+            for fk in insp.get_foreign_keys(table):
+                if fk['referred_table'] in tables:
+                    _execute_on_live(
+                        bind,
+                        f"ALTER TABLE {_q(table)} DROP FOREIGN KEY {_q(fk['name'])}, "
+                        f"{_foreign_key_sql(fk, _new(fk['referred_table']))}, ALGORITHM=INPLACE, LOCK=NONE",
+                    )
+    finally:
+        bind.execute(sa.text("SET foreign_key_checks = 1"))
+
+
+def _cleanup(bind, tables):
+    """Drop the triggers and old tables; repair any foreign key still pointing at a copy."""
+    for table in tables:
+        for event in TRIGGER_EVENTS:
+            bind.execute(sa.text(f"DROP TRIGGER IF EXISTS {_q(_trigger(table, event))}"))
+
+    insp = sa.inspect(bind)
+    leftovers = {_new(t): t for t in tables} | {_old(t): t for t in tables}
+    bind.execute(sa.text("SET foreign_key_checks = 0"))
+    try:
+        for table in insp.get_table_names():
+            if table in leftovers:
+                continue
+            for fk in insp.get_foreign_keys(table):
+                if fk['referred_table'] in leftovers:
+                    _execute_on_live(
+                        bind,
+                        f"ALTER TABLE {_q(table)} DROP FOREIGN KEY {_q(fk['name'])}, "
+                        f"{_foreign_key_sql(fk, leftovers[fk['referred_table']])}, ALGORITHM=INPLACE, LOCK=NONE",
+                    )
+        olds = [_q(_old(t)) for t in tables if _old(t) in insp.get_table_names()]
+        if olds:
+            bind.execute(sa.text(f"DROP TABLE {', '.join(olds)}"))
+    finally:
+        bind.execute(sa.text("SET foreign_key_checks = 1"))
+
+
+def _retype_mysql(bind, type_sql):
+    """Online change of every COLUMNS column to `type_sql` (see the module docstring)."""
+    tables = _retyped_tables()
+    bind.execute(sa.text(f"SET SESSION lock_wait_timeout = {LOCK_WAIT}"))
+    insp = sa.inspect(bind)
+    names = set(insp.get_table_names())
+    if not any(_new(t) in names for t in tables) and all(_has_type(insp, t, cols, type_sql) for t, cols in tables.items()):
+        _cleanup(bind, tables)
+        return
+
+    _check_foreign_key_actions(insp, tables)
+    for table, columns in tables.items():
+        _prepare_copy(bind, table, columns, type_sql)
+    for table in tables:
+        _copy_rows(bind, table)
+    _point_foreign_keys_at_copies(bind, tables)
+    # one atomic swap of every table with its copy
+    _execute_on_live(bind, _rename_sql(tables))
+    _cleanup(bind, tables)
+
+
+def _alter_generic(columns, type_, existing_type):
+    for table, column, nullable in columns:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, type_=type_, existing_type=existing_type, existing_nullable=nullable)
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'mysql':
+        _alter_generic(COLUMNS, sa.BigInteger(), sa.Integer())
+        return
+
+    with op.get_context().autocommit_block():
+        _retype_mysql(bind, 'BIGINT')
+
+
+def downgrade():
+    bind = op.get_bind()
+    limit = 2**31 - 1
+    for table, column, _ in COLUMNS:
+        too_big = bind.execute(sa.text(f"SELECT COUNT(*) FROM {table} WHERE {column} > {limit}")).scalar()
+        if too_big:
+            raise RuntimeError(f"{table}.{column} has {too_big} values that do not fit in INT; cannot downgrade")
+
+    if bind.dialect.name != 'mysql':
+        _alter_generic(reversed(COLUMNS), sa.Integer(), sa.BigInteger())
+        return
+
+    with op.get_context().autocommit_block():
+        _retype_mysql(bind, 'INT')
@@ -0,0 +1,51 @@
+"""nik indexes on child tables and (status, pk) queue indexes
+
+Revision ID: bc1e3f043e3c
+Revises: 5c0b50dcde2a
+Create Date: 2026-10-18 09:20:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'bc1e3f043e3c'
+down_revision = '5c0b50dcde2a'
+branch_labels = None
+depends_on = None
+
+# (index, table, columns) lookups by owner key that had no index of their own
+FK_INDEXES = [
+    ('ix_kartu_keluarga_nik', 'kartu_keluarga', ['nik']),
+    ('ix_draft_server_nik', 'draft_server', ['nik']),
+    ('ix_petugas_nik', 'petugas', ['nik']),
+    ('ix_detail_kendaraan_id_aset_non_financial', 'detail_kendaraan', ['id_aset_non_financial']),
+]
+
+# admin queues: WHERE status = ? AND pk > ? ORDER BY pk LIMIT n
+STATUS_INDEXES = [
+    ('ix_ktp_status_id_ktp', 'ktp', ['status', 'id_ktp']),
+    ('ix_kartu_keluarga_status_id_kk', 'kartu_keluarga', ['status', 'id_kk']),
+    ('ix_human_capital_status_id_human_capital', 'human_capital', ['status', 'id_human_capital']),
+    ('ix_kondisi_rumah_status_id_kondisi_rumah', 'kondisi_rumah', ['status', 'id_kondisi_rumah']),
+    ('ix_kondisi_ekonomi_status_id_kondisi_ekonomi', 'kondisi_ekonomi', ['status', 'id_kondisi_ekonomi']),
+    ('ix_aset_non_financial_status_id_aset_non_financial', 'aset_non_financial', ['status', 'id_aset_non_financial']),
+    ('ix_detail_kendaraan_status_id_detail_kendaraan', 'detail_kendaraan', ['status', 'id_detail_kendaraan']),
+    ('ix_draft_server_status_id_draft_server', 'draft_server', ['status', 'id_draft_server']),
+]
+
+
+def upgrade():
+    for name, table, columns in FK_INDEXES + STATUS_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _ in reversed(STATUS_INDEXES):
+        op.drop_index(name, table_name=table)
+    # MySQL drops its implicit foreign-key index once an explicit one exists and
+    # refuses to drop the last index backing a foreign key, so keep them there.
+    if op.get_bind().dialect.name == 'mysql':
+        return
+    for name, table, _ in reversed(FK_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -8,6 +8,10 @@ from .detailkendaraanModel import DetailKendaraan
 from .draftserverModel import DraftServer
 from .petugasModel import Petugas
 from .kartukeluargaModel import KartuKeluarga
+from .sktmdocumentModel import SktmDocument
+from .sktmprunehintModel import SktmPruneHint
+from .applicationstatusModel import ApplicationStatus
+from .sktmgenerationlockModel import SktmGenerationLock
 
 __all__ = [
     "Masyarakat",
@@ -20,4 +24,8 @@ __all__ = [
     "DraftServer",
     "Petugas",
     "KartuKeluarga",
+    "SktmDocument",
+    "SktmPruneHint",
+    "ApplicationStatus",
+    "SktmGenerationLock",
 ]
@@ -0,0 +1,20 @@
+from extension import db
+
+
+class ApplicationStatus(db.Model):
+    """Denormalized per-NIK SKTM status, kept in sync by the controllers that change a section."""
+    __tablename__ = "application_status"
+
+    nik = db.Column(db.BigInteger, db.ForeignKey("masyarakat.nik"), primary_key=True)
+    ktp_status = db.Column(db.String(1))
+    kartu_keluarga_status = db.Column(db.String(1))
+    kondisi_rumah_status = db.Column(db.String(1))
+    kondisi_ekonomi_status = db.Column(db.String(1))
+    aset_non_financial_status = db.Column(db.String(1))
+    fill_progress = db.Column(db.Float, nullable=False, default=0.0)
+    fill_satisfied = db.Column(db.Integer, nullable=False, default=0)
+    fill_total = db.Column(db.Integer, nullable=False, default=0)
+    fill_missing = db.Column(db.Text)
+    updated_at = db.Column(db.DateTime, nullable=False)
+
+    masyarakat = db.relationship("Masyarakat", back_populates="application_status")
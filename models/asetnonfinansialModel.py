@@ -3,9 +3,10 @@ from extension import db
 
 class AsetNonFinancial(db.Model):
 	__tablename__ = "aset_non_financial"
+	__table_args__ = (db.Index("ix_aset_non_financial_status_id_aset_non_financial", "status", "id_aset_non_financial"),)
 
 	id_aset_non_financial = db.Column(db.Integer, primary_key=True, autoincrement=True)
-	nik = db.Column(db.Integer, db.ForeignKey("masyarakat.nik"), nullable=False, unique=True)
+	nik = db.Column(db.BigInteger, db.ForeignKey("masyarakat.nik"), nullable=False, unique=True)
 	total_kendaraan = db.Column(db.Integer)
 	masyarakat = db.relationship("Masyarakat", back_populates="aset_non_financial")
 	detail_kendaraan = db.relationship(
@@ -4,9 +4,10 @@ from extension import db
 
 class DraftServer(db.Model):
     __tablename__ = "draft_server"
+    __table_args__ = (db.Index("ix_draft_server_status_id_draft_server", "status", "id_draft_server"),)
 
     id_draft_server = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    nik = db.Column(db.Integer, db.ForeignKey("masyarakat.nik"), nullable=False)
+    nik = db.Column(db.BigInteger, db.ForeignKey("masyarakat.nik"), nullable=False, index=True)
     checksum = db.Column(db.String(255))
     serverVersion = db.Column(db.Integer)
     last_edit = db.Column(db.DateTime)
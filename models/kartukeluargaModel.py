@@ -4,13 +4,14 @@ from extension import db
 
 class KartuKeluarga(db.Model):
     __tablename__ = "kartu_keluarga"
+    __table_args__ = (db.Index("ix_kartu_keluarga_status_id_kk", "status", "id_kk"),)
 
     id_kk = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    no_kk = db.Column(db.Integer)
+    no_kk = db.Column(db.BigInteger)
     nama_kepala_keluarga = db.Column(db.String(255))
     alamat = db.Column(db.Text)
     foto_kk = db.Column(db.String(255))
     status = db.Column(SAEnum("P", "T", "B", name="kartu_keluarga_status_enum"), nullable=True)
-    nik = db.Column(db.Integer, db.ForeignKey("masyarakat.nik"), nullable=False)
+    nik = db.Column(db.BigInteger, db.ForeignKey("masyarakat.nik"), nullable=False, index=True)
 
     masyarakat = db.relationship("Masyarakat", back_populates="kartu_keluarga")
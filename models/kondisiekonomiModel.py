@@ -3,9 +3,10 @@ from extension import db
 
 class KondisiEkonomi(db.Model):
 	__tablename__ = "kondisi_ekonomi"
+	__table_args__ = (db.Index("ix_kondisi_ekonomi_status_id_kondisi_ekonomi", "status", "id_kondisi_ekonomi"),)
 
 	id_kondisi_ekonomi = db.Column(db.Integer, primary_key=True, autoincrement=True)
-	nik = db.Column(db.Integer, db.ForeignKey("masyarakat.nik"), nullable=False, unique=True)
+	nik = db.Column(db.BigInteger, db.ForeignKey("masyarakat.nik"), nullable=False, unique=True)
 	nominal_slip_gaji = db.Column(db.Integer)
 	foto_slip_gaji = db.Column(db.String(255))
 	daya_listrik_va = db.Column(db.Integer)
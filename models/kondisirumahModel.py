@@ -3,9 +3,10 @@ from extension import db
 
 class KondisiRumah(db.Model):
 	__tablename__ = "kondisi_rumah"
+	__table_args__ = (db.Index("ix_kondisi_rumah_status_id_kondisi_rumah", "status", "id_kondisi_rumah"),)
 
 	id_kondisi_rumah = db.Column(db.Integer, primary_key=True, autoincrement=True)
-	nik = db.Column(db.Integer, db.ForeignKey("masyarakat.nik"), nullable=False, unique=True)
+	nik = db.Column(db.BigInteger, db.ForeignKey("masyarakat.nik"), nullable=False, unique=True)
 	foto_depan_rumah = db.Column(db.String(255))
 	foto_atap = db.Column(db.String(255))
 	foto_lantai = db.Column(db.String(255))
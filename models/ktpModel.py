@@ -3,9 +3,10 @@ from extension import db
 
 class KTP(db.Model):
     __tablename__ = "ktp"
+    __table_args__ = (db.Index("ix_ktp_status_id_ktp", "status", "id_ktp"),)
 
     id_ktp = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    nik = db.Column(db.Integer, db.ForeignKey("masyarakat.nik"), nullable=False, unique=True)
+    nik = db.Column(db.BigInteger, db.ForeignKey("masyarakat.nik"), nullable=False, unique=True)
     tempat_lahir = db.Column(db.String(255))
     tanggal_lahir = db.Column(db.Date)
     alamat = db.Column(db.Text)
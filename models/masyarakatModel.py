@@ -4,7 +4,7 @@ from extension import db
 class Masyarakat(db.Model):
 	__tablename__ = "masyarakat"
 
-	nik = db.Column(db.Integer, primary_key=True, nullable=False)
+	nik = db.Column(db.BigInteger, primary_key=True, nullable=False)
 	nama = db.Column(db.String(255))
 	jenis_kelamin = db.Column(db.Enum('L', 'P', name='jenis_kelamin_enum'), nullable=False)
 	email = db.Column(db.String(255))
@@ -31,4 +31,10 @@ class Masyarakat(db.Model):
 	draft_server = db.relationship(
 		"DraftServer", back_populates="masyarakat", cascade="all, delete-orphan"
 	)
+	sktm_document = db.relationship(
+		"SktmDocument", back_populates="masyarakat", cascade="all, delete-orphan"
+	)
+	application_status = db.relationship(
+		"ApplicationStatus", uselist=False, back_populates="masyarakat", cascade="all, delete-orphan"
+	)
 
@@ -0,0 +1,14 @@
+from extension import db
+
+
+class SktmDocument(db.Model):
+    __tablename__ = "sktm_document"
+
+    id_sktm_document = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    nik = db.Column(db.BigInteger, db.ForeignKey("masyarakat.nik"), nullable=False, index=True)
+    content_hash = db.Column(db.String(64), nullable=False, unique=True)
+    bucket = db.Column(db.String(255), nullable=False)
+    path = db.Column(db.String(512), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False)
+
+    masyarakat = db.relationship("Masyarakat", back_populates="sktm_document")
@@ -0,0 +1,12 @@
+from extension import db
+
+
+class SktmGenerationLock(db.Model):
+    """Cross-worker single-flight lock: one row per NIK while its SKTM PDF is being generated."""
+    __tablename__ = "sktm_generation_lock"
+
+    nik = db.Column(db.BigInteger, db.ForeignKey("masyarakat.nik"), primary_key=True)
+    content_hash = db.Column(db.String(64), nullable=False)
+    owner = db.Column(db.String(128), nullable=False)
+    acquired_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
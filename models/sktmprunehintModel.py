@@ -0,0 +1,9 @@
+from extension import db
+
+
+class SktmPruneHint(db.Model):
+    """Queue of NIKs whose old SKTM PDFs should be pruned by the retention worker."""
+    __tablename__ = "sktm_prune_hint"
+
+    nik = db.Column(db.BigInteger, db.ForeignKey("masyarakat.nik"), primary_key=True)
+    requested_at = db.Column(db.DateTime, nullable=False)
@@ -27,6 +27,10 @@ from controllers.adminKondisiEkonomiController import (
 )
 from controllers.adminPetugasController import create_petugas_controller
 from controllers.adminAuthController import petugas_login_controller
+from controllers.adminMetricsController import get_metrics_controller
+from controllers.adminDossierController import get_dossier_controller
+from controllers.adminBulkStatusController import bulk_update_status_controller
+from controllers.adminSktmBatchController import run_sktm_batch_controller
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -92,10 +96,7 @@ def admin_delete_ktp(nik):
 @jwt_required_custom()
 @role_required('petugas')
 def admin_list_aset():
-    from flask import request
-    page = int(request.args.get('page', 1))
-    per_page = int(request.args.get('per_page', 100))
-    return list_asets(page=page, per_page=per_page)
+    return list_asets()
 
 
 @admin_bp.route('/asetNonFinansial/<int:nik>', methods=['GET'])
@@ -124,10 +125,7 @@ def admin_delete_aset(nik: int):
 @jwt_required_custom()
 @role_required('petugas')
 def admin_list_kondisi():
-    from flask import request
-    page = int(request.args.get('page', 1))
-    per_page = int(request.args.get('per_page', 100))
-    return list_kondisi_admin(page=page, per_page=per_page)
+    return list_kondisi_admin()
 
 
 @admin_bp.route('/kondisiEkonomi/<int:nik>', methods=['GET'])
@@ -158,6 +156,38 @@ def admin_create_petugas():
     return create_petugas_controller()
 
 
+# Full applicant dossier for the review screen (every section in one request)
+@admin_bp.route('/dossier/<int:nik>', methods=['GET'])
+@jwt_required_custom()
+@role_required('petugas')
+def admin_get_dossier(nik: int):
+    return get_dossier_controller(nik)
+
+
+# Bulk verification decisions: [{nik, section, status}, ...] in one transaction
+@admin_bp.route('/status/bulk', methods=['POST'])
+@jwt_required_custom()
+@role_required('petugas')
+def admin_bulk_status():
+    return bulk_update_status_controller()
+
+
+# Generate missing SKTM PDFs for approved NIKs in chunks (restartable; see `flask sktm batch`)
+@admin_bp.route('/sktm/batch', methods=['POST'])
+@jwt_required_custom()
+@role_required('petugas')
+def admin_sktm_batch():
+    return run_sktm_batch_controller()
+
+
+# Runtime metrics (cache counters etc.)
+@admin_bp.route('/metrics', methods=['GET'])
+@jwt_required_custom()
+@role_required('petugas')
+def admin_metrics():
+    return get_metrics_controller()
+
+
 # Petugas auth (login)
 @admin_bp.route('/petugas/login', methods=['POST'])
 def admin_petugas_login():
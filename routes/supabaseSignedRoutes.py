@@ -1,9 +1,12 @@
 from flask import Blueprint, request, jsonify
 import os
-import requests
+import httpx
 from urllib.parse import quote
 from dotenv import load_dotenv
 from utils.auth import jwt_required_custom, role_required
+from utils import http_client
+from utils.signed_url_cache import signed_url_cache
+import time
 
 load_dotenv()
 
@@ -33,6 +36,11 @@ def get_signed_url():
     if not SUPABASE_URL or not SERVICE_KEY:
         return jsonify({"error": "Supabase configuration missing on server"}), 500
 
+    # Reuse a previously signed URL while it still has enough validity left
+    cached = signed_url_cache.get(BUCKET, path, expires)
+    if cached:
+        return jsonify({"signedURL": cached}), 200
+
     # URL-encode path
     encoded_path = quote(path, safe='/')
     sign_endpoint = f"{SUPABASE_URL}/storage/v1/object/sign/{BUCKET}/{encoded_path}"
@@ -45,8 +53,9 @@ def get_signed_url():
 
     try:
         print(f"[DEBUG] Supabase sign request: endpoint={sign_endpoint} expires={expires}")
-        resp = requests.post(sign_endpoint, headers=headers, json=body, timeout=10)
-    except requests.RequestException as e:
+        signed_at = time.time()
+        resp = http_client.post(sign_endpoint, metric="storage.sign", headers=headers, json=body)
+    except httpx.HTTPError as e:
         return jsonify({"error": "failed to contact supabase storage", "detail": str(e)}), 502
 
     if resp.status_code != 200:
@@ -60,8 +69,10 @@ def get_signed_url():
         if isinstance(data, dict):
             possible_keys = ("signedURL", "signedUrl", "signed_url", "url")
             for key in possible_keys:
-                if key in data and isinstance(data[key], str) and data[key].startswith("/"):
-                    data[key] = f"{SUPABASE_URL}/storage/v1{data[key]}"
+                if key in data and isinstance(data[key], str):
+                    if data[key].startswith("/"):
+                        data[key] = f"{SUPABASE_URL}/storage/v1{data[key]}"
+                    signed_url_cache.set(BUCKET, path, expires, data[key], signed_at=signed_at)
                     break
         return jsonify(data), 200
     except Exception:
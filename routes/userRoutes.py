@@ -26,6 +26,10 @@ from controllers.userProfileController import (
     get_my_profile_controller,
     update_my_profile_controller,
 )
+from controllers.userUploadController import (
+    create_upload_ticket_controller,
+    finalize_upload_controller,
+)
 from controllers.userSktmController import (
     can_download_sktm_controller,
     download_sktm_controller,
@@ -115,6 +119,19 @@ def update_aset_self():
     return update_user_aset_self_controller()
 
 
+# --- Direct-to-storage uploads (signed upload ticket + finalize) ---
+@user_bp.route('/uploads/ticket', methods=['POST'])
+@jwt_required_custom()
+def create_upload_ticket():
+    return create_upload_ticket_controller()
+
+
+@user_bp.route('/uploads/finalize', methods=['POST'])
+@jwt_required_custom()
+def finalize_upload():
+    return finalize_upload_controller()
+
+
 # --- Profil routes ---
 @user_bp.route('/profil/<int:nik>', methods=['GET'])
 @jwt_required_custom()
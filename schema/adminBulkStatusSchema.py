@@ -0,0 +1,19 @@
+from extension import ma
+from marshmallow import fields, validate
+# Schemas for the admin bulk status endpoint (status itself is validated by each section's own schema)
+
+BULK_STATUS_SECTIONS = ["ktp", "kartu_keluarga", "human_capital", "kondisi_rumah", "kondisi_ekonomi", "aset_non_financial"]
+
+
+class AdminBulkStatusItemSchema(ma.Schema):
+    nik = fields.Integer(required=True, strict=True)
+    section = fields.String(required=True, validate=validate.OneOf(BULK_STATUS_SECTIONS))
+    status = fields.Raw(required=True)
+
+
+class AdminBulkStatusSchema(ma.Schema):
+    decisions = fields.List(fields.Raw(), required=True, validate=validate.Length(min=1))
+
+
+admin_bulk_status_schema = AdminBulkStatusSchema()
+admin_bulk_status_item_schema = AdminBulkStatusItemSchema()
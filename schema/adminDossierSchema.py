@@ -0,0 +1,24 @@
+from extension import ma
+from marshmallow import fields
+# Schemas for the admin dossier (sections that have no admin schema of their own)
+
+class DossierMasyarakatSchema(ma.Schema):
+    nik = fields.Integer()
+    nama = fields.String(allow_none=True)
+    jenis_kelamin = fields.String(allow_none=True)
+    email = fields.String(allow_none=True)
+    nomor_hp = fields.String(allow_none=True)
+
+
+class DossierApplicationStatusSchema(ma.Schema):
+    ktp_status = fields.String(allow_none=True)
+    kartu_keluarga_status = fields.String(allow_none=True)
+    kondisi_rumah_status = fields.String(allow_none=True)
+    kondisi_ekonomi_status = fields.String(allow_none=True)
+    aset_non_financial_status = fields.String(allow_none=True)
+    fill_progress = fields.Float()
+    updated_at = fields.DateTime()
+
+
+dossier_masyarakat_schema = DossierMasyarakatSchema()
+dossier_application_status_schema = DossierApplicationStatusSchema()
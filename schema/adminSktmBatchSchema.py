@@ -0,0 +1,10 @@
+from extension import ma
+from marshmallow import fields, validate
+# Schema for the admin SKTM batch generation request
+
+class AdminSktmBatchSchema(ma.Schema):
+    niks = fields.List(fields.Integer(strict=True), missing=None)
+    limit = fields.Integer(missing=200, validate=validate.Range(min=1, max=1000))
+
+
+admin_sktm_batch_schema = AdminSktmBatchSchema()
@@ -0,0 +1,25 @@
+from extension import ma
+from marshmallow import fields, validate, validates_schema, ValidationError
+from utils.upload_tickets import UPLOAD_SECTIONS, UPLOAD_ALLOWED_TYPES, UPLOAD_MAX_BYTES
+
+
+class UploadTicketRequestSchema(ma.Schema):
+    section = fields.String(required=True, validate=validate.OneOf(list(UPLOAD_SECTIONS.keys())))
+    field = fields.String(required=True)
+    filename = fields.String(allow_none=True)
+    content_type = fields.String(required=True, validate=validate.OneOf(list(UPLOAD_ALLOWED_TYPES)))
+    size = fields.Integer(allow_none=True, validate=validate.Range(min=1, max=UPLOAD_MAX_BYTES))
+
+    @validates_schema
+    def validate_field(self, data, **kwargs):
+        section = data.get("section")
+        if section in UPLOAD_SECTIONS and data.get("field") not in UPLOAD_SECTIONS[section][1]:
+            raise ValidationError(f"field harus salah satu dari {list(UPLOAD_SECTIONS[section][1])}", "field")
+
+
+class UploadFinalizeSchema(ma.Schema):
+    ticket = fields.String(required=True)
+
+
+upload_ticket_request_schema = UploadTicketRequestSchema()
+upload_finalize_schema = UploadFinalizeSchema()
@@ -0,0 +1,156 @@
+"""Benchmark NIK lookups on INT vs BIGINT key columns.
+
+Usage:
+    python scripts/bench_nik_lookup.py                                  # in-memory SQLite
+    python scripts/bench_nik_lookup.py --database-url mysql+pymysql://user:pw@localhost/sktm_bench --rows 200000
+
+Builds two throw-away table pairs shaped like masyarakat/ktp. `int` uses INT keys
+seeded with the 9-digit values that are all the old schema can hold. `bigint`
+uses BIGINT keys seeded with realistic 16-digit NIKs:
+province+regency+district, birth date (+40 for women) and a 4-digit serial.
+It times point lookups by primary key, by the child's nik index and the
+parent/child join, and on MySQL also prints the index sizes. The tables are
+dropped afterwards unless --keep is given.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+
+import sqlalchemy as sa
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.environ.get("BENCH_DATABASE_URL", "sqlite://"))
+    parser.add_argument("--rows", type=int, default=50000, help="citizens per variant (default: 50000)")
+    parser.add_argument("--lookups", type=int, default=5000, help="timed lookups per query (default: 5000)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="keep the bench tables")
+    return parser.parse_args()
+
+
+def realistic_nik(rng: random.Random) -> int:
+    """16-digit NIK: 35 (Jawa Timur) 15 (Sidoarjo) district, DDMMYY (+40 for women), serial."""
+    district = rng.randint(1, 18)
+    day = rng.randint(1, 28) + (40 if rng.random() < 0.5 else 0)
+    month = rng.randint(1, 12)
+    year = rng.randint(0, 99)
+    serial = rng.randint(1, 9999)
+    return int(f"3515{district:02d}{day:02d}{month:02d}{year:02d}{serial:04d}")
+
+
+def build_tables(metadata, suffix, key_type):
+    parent = sa.Table(
+        f"bench_masyarakat_{suffix}", metadata,
+        sa.Column("nik", key_type, primary_key=True, autoincrement=False),
+        sa.Column("nama", sa.String(255)),
+    )
+    child = sa.Table(
+        f"bench_ktp_{suffix}", metadata,
+        sa.Column("id_ktp", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("nik", key_type, sa.ForeignKey(parent.c.nik), nullable=False, unique=True),
+        sa.Column("alamat", sa.String(255)),
+    )
+    return parent, child
+
+
+def seed(conn, parent, child, keys):
+    for i in range(0, len(keys), 5000):
+        chunk = keys[i:i + 5000]
+        conn.execute(parent.insert(), [{"nik": k, "nama": f"Warga {k}"} for k in chunk])
+        conn.execute(child.insert(), [{"nik": k, "alamat": "Candi"} for k in chunk])
+
+
+def time_query(conn, stmt_for, probes):
+    samples = []
+    for key in probes:
+        stmt = stmt_for(key)
+        t0 = time.perf_counter()
+        conn.execute(stmt).fetchall()
+        samples.append((time.perf_counter() - t0) * 1e6)
+    samples.sort()
+    return {
+        "mean_us": round(statistics.fmean(samples), 1),
+        "p50_us": round(samples[len(samples) // 2], 1),
+        "p95_us": round(samples[int(len(samples) * 0.95) - 1], 1),
+    }
+
+
+def index_sizes(conn, tables):
+    if conn.dialect.name != "mysql":
+        return {}
+    rows = conn.execute(sa.text(
+        "SELECT table_name, data_length, index_length FROM information_schema.tables "
+        "WHERE table_schema = DATABASE() AND table_name IN :names"
+    ).bindparams(sa.bindparam("names", expanding=True)), {"names": [t.name for t in tables]}).fetchall()
+    return {name: {"data_kb": data // 1024, "index_kb": index // 1024} for name, data, index in rows}
+
+
+def main():
+    args = parse_args()
+    rng = random.Random(args.seed)
+    engine = sa.create_engine(args.database_url)
+    metadata = sa.MetaData()
+
+    int_keys = rng.sample(range(100_000_000, 999_999_999), args.rows)
+    big_keys = set()
+    while len(big_keys) < args.rows:
+        big_keys.add(realistic_nik(rng))
+    big_keys = list(big_keys)
+
+    overflow = sum(1 for k in big_keys if k > 2**31 - 1)
+    print(f"realistic NIKs above the INT range: {overflow}/{len(big_keys)}")
+
+    variants = {
+        "int": (build_tables(metadata, "int", sa.Integer), int_keys),
+        "bigint": (build_tables(metadata, "bigint", sa.BigInteger), big_keys),
+    }
+    all_tables = [t for (tables, _) in variants.values() for t in tables]
+    metadata.drop_all(engine, tables=all_tables)
+    metadata.create_all(engine, tables=all_tables)
+
+    results = {}
+    try:
+        with engine.begin() as conn:
+            for name, ((parent, child), keys) in variants.items():
+                t0 = time.perf_counter()
+                seed(conn, parent, child, keys)
+                print(f"[{name}] seeded {len(keys)} rows in {time.perf_counter() - t0:.1f}s")
+            if conn.dialect.name == "mysql":
+                for table in all_tables:
+                    conn.execute(sa.text(f"ANALYZE TABLE {table.name}"))
+            elif conn.dialect.name == "sqlite":
+                conn.execute(sa.text("ANALYZE"))
+
+        with engine.connect() as conn:
+            for name, ((parent, child), keys) in variants.items():
+                probes = [rng.choice(keys) for _ in range(args.lookups)]
+                results[name] = {
+                    "pk_lookup": time_query(conn, lambda k: sa.select(parent).where(parent.c.nik == k), probes),
+                    "child_by_nik": time_query(conn, lambda k: sa.select(child).where(child.c.nik == k), probes),
+                    "join": time_query(
+                        conn,
+                        lambda k: sa.select(parent, child).join(child, child.c.nik == parent.c.nik).where(parent.c.nik == k),
+                        probes,
+                    ),
+                }
+            sizes = index_sizes(conn, all_tables)
+    finally:
+        if not args.keep:
+            metadata.drop_all(engine, tables=all_tables)
+
+    print(f"\n{'query':<14}{'variant':<9}{'mean_us':>10}{'p50_us':>10}{'p95_us':>10}")
+    for query in ("pk_lookup", "child_by_nik", "join"):
+        for name in variants:
+            r = results[name][query]
+            print(f"{query:<14}{name:<9}{r['mean_us']:>10}{r['p50_us']:>10}{r['p95_us']:>10}")
+    for table, size in sizes.items():
+        print(f"{table}: data={size['data_kb']}KB index={size['index_kb']}KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
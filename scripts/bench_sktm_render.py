@@ -0,0 +1,78 @@
+"""Benchmark SKTM PDF rendering (PDFs per second).
+
+Usage:
+    python scripts/bench_sktm_render.py                 # 500 renders of the current layout
+    python scripts/bench_sktm_render.py --count 2000 --pool
+
+Renders --count letters for distinct synthetic citizens with
+templates.sktm.reportlab_layout.generate_sktm_pdf_bytes and prints throughput
+plus per-PDF latency. --pool renders through utils.sktm_renderer instead, so
+the process pool's overhead is included. Run it on two checkouts to compare
+layouts (e.g. `git stash` / `git checkout <rev> -- templates/sktm`).
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=500, help="PDFs to render (default: 500)")
+    parser.add_argument("--warmup", type=int, default=20, help="untimed renders first (default: 20)")
+    parser.add_argument("--pool", action="store_true", help="render through the process pool")
+    return parser.parse_args()
+
+
+def sample_data(i: int) -> dict:
+    nik = 3515010101900001 + i
+    return {
+        "kepala_desa": "Muhammad Muslich",
+        "kecamatan": "Candi",
+        "kabupaten": "Sidoarjo",
+        "nama": f"Warga Nomor {i}",
+        "no_ktp": str(nik),
+        "tempat_tanggal_lahir": f"Sidoarjo / {1 + i % 28:02d} Januari 1990",
+        "jenis_kelamin": "Laki-laki" if i % 2 else "Perempuan",
+        "alamat": f"Jl. Raya Candi No. {i}, RT 0{i % 9 + 1}/RW 0{i % 5 + 1}",
+        "pernyataan_paragraf": None,
+        "kota_tanggal": "Candi, 18 Oktober 2026",
+        "kepala_nama": "",
+    }
+
+
+def main():
+    args = parse_args()
+    from templates.sktm.reportlab_layout import TEMPLATE_VERSION
+    if args.pool:
+        from utils.sktm_renderer import render_sktm_pdf as render
+    else:
+        # same ReportLab settings as a render pool process
+        from templates.sktm.reportlab_layout import configure_render_process, generate_sktm_pdf_bytes as render
+        configure_render_process()
+
+    for i in range(args.warmup):
+        render(sample_data(i))
+
+    samples, size = [], 0
+    started = time.perf_counter()
+    for i in range(args.count):
+        t0 = time.perf_counter()
+        pdf = render(sample_data(i))
+        samples.append((time.perf_counter() - t0) * 1000.0)
+        size += len(pdf)
+    elapsed = time.perf_counter() - started
+
+    samples.sort()
+    print(f"template={TEMPLATE_VERSION} mode={'pool' if args.pool else 'inline'} count={args.count}")
+    print(f"pdf_per_sec={args.count / elapsed:.1f} mean_ms={statistics.fmean(samples):.2f} "
+          f"p50_ms={samples[len(samples) // 2]:.2f} p95_ms={samples[int(len(samples) * 0.95) - 1]:.2f} "
+          f"avg_bytes={size // args.count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
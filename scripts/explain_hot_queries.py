@@ -0,0 +1,181 @@
+"""Run EXPLAIN on the hot queries and fail if any of them scans a whole table.
+
+Usage:
+    python scripts/explain_hot_queries.py                       # seeded in-memory SQLite
+    python scripts/explain_hot_queries.py --database-url mysql+pymysql://user:pw@localhost/sktm_explain
+
+The target database must be a scratch one: tables are created with
+db.create_all() and filled with --rows synthetic citizens unless --no-seed is given.
+Exit code is 1 when a full table scan shows up in any plan.
+"""
+import os
+import sys
+import argparse
+from datetime import datetime, date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.environ.get("EXPLAIN_DATABASE_URL", "sqlite://"))
+    parser.add_argument("--rows", type=int, default=2000, help="citizens to seed (default: 2000)")
+    parser.add_argument("--no-seed", action="store_true", help="explain against the existing data")
+    return parser.parse_args()
+
+
+def seed(db, models, rows: int):
+    from sqlalchemy import insert
+
+    statuses = ("P", "T", "B")
+    niks = [3515010101900001 + i for i in range(rows)]  # 16-digit NIKs
+    now = datetime.utcnow()
+    db.session.execute(insert(models.Masyarakat), [
+        {"nik": n, "nama": f"Warga {n}", "jenis_kelamin": "LP"[n % 2]} for n in niks
+    ])
+    db.session.execute(insert(models.KTP), [
+        {"nik": n, "tempat_lahir": "Sidoarjo", "tanggal_lahir": date(1990, 1, 1), "alamat": "Candi", "status": statuses[n % 3]}
+        for n in niks
+    ])
+    db.session.execute(insert(models.KartuKeluarga), [
+        {"nik": n, "no_kk": n, "nama_kepala_keluarga": f"KK {n}", "status": statuses[n % 3]} for n in niks
+    ])
+    db.session.execute(insert(models.HumanCapital), [{"nik": n, "status": statuses[n % 3]} for n in niks[::2]])
+    db.session.execute(insert(models.KondisiRumah), [{"nik": n, "status": statuses[n % 3]} for n in niks if n % 3])
+    db.session.execute(insert(models.KondisiEkonomi), [{"nik": n, "status": statuses[n % 3]} for n in niks if n % 5])
+    db.session.execute(insert(models.AsetNonFinancial), [{"nik": n, "total_kendaraan": 1, "status": statuses[n % 3]} for n in niks])
+    db.session.execute(insert(models.DetailKendaraan), [
+        {"id_aset_non_financial": i + 1, "jenis_kendaraan": "motor", "tipe_kendaraan": "x", "tahun_pembuatan": 2015, "status": "P"}
+        for i in range(rows)
+    ])
+    db.session.execute(insert(models.DraftServer), [{"nik": n, "status": "P", "last_edit": now} for n in niks])
+    db.session.execute(insert(models.Petugas), [{"nip": i + 1, "nik": n, "role": "petugas"} for i, n in enumerate(niks[:50])])
+    db.session.execute(insert(models.SktmDocument), [
+        {"nik": n, "content_hash": f"{n:064x}", "bucket": "sktm", "path": f"{n}/sktm/sktm_{n}.pdf", "created_at": now}
+        for n in niks
+    ])
+    db.session.execute(insert(models.ApplicationStatus), [
+        {"nik": n, "fill_progress": 100.0, "fill_satisfied": 8, "fill_total": 8, "updated_at": now} for n in niks
+    ])
+    db.session.commit()
+    return niks
+
+
+def hot_queries(models, nik: int) -> dict:
+    """The statements behind the busiest endpoints, keyed by a short name."""
+    from sqlalchemy import select, or_
+    from sqlalchemy.orm import joinedload
+
+    m = models
+    page = 100
+    return {
+        "ktp_by_nik": select(m.KTP).where(m.KTP.nik == nik),
+        "kk_by_nik": select(m.KartuKeluarga).where(m.KartuKeluarga.nik == nik),
+        "human_capital_by_nik": select(m.HumanCapital).where(m.HumanCapital.nik == nik),
+        "draft_server_by_nik": select(m.DraftServer).where(m.DraftServer.nik == nik),
+        "petugas_by_nik": select(m.Petugas).where(m.Petugas.nik == nik),
+        "detail_kendaraan_by_aset": select(m.DetailKendaraan).where(m.DetailKendaraan.id_aset_non_financial == 1),
+        "application_status_pk": select(m.ApplicationStatus).where(m.ApplicationStatus.nik == nik),
+        "sktm_document_by_hash": select(m.SktmDocument).where(m.SktmDocument.content_hash == f"{nik:064x}"),
+        "sktm_document_by_nik": select(m.SktmDocument).where(m.SktmDocument.nik == nik).order_by(m.SktmDocument.created_at.desc()),
+        "application_snapshot": select(m.Masyarakat).options(
+            joinedload(m.Masyarakat.ktp),
+            joinedload(m.Masyarakat.kartu_keluarga),
+            joinedload(m.Masyarakat.kondisi_rumah),
+            joinedload(m.Masyarakat.kondisi_ekonomi),
+            joinedload(m.Masyarakat.aset_non_financial),
+        ).where(m.Masyarakat.nik == nik),
+        # admin queues (keyset pages, see utils.pagination)
+        "ktp_queue": select(m.KTP).where(m.KTP.status == "P", m.KTP.id_ktp < 10**9).order_by(m.KTP.id_ktp.desc()).limit(page),
+        "kk_queue": select(m.KartuKeluarga, m.HumanCapital)
+            .outerjoin(m.HumanCapital, m.HumanCapital.nik == m.KartuKeluarga.nik)
+            .where(m.KartuKeluarga.status == "P", m.KartuKeluarga.id_kk < 10**9)
+            .order_by(m.KartuKeluarga.id_kk.desc()).limit(page),
+        "kk_list": select(m.KartuKeluarga, m.HumanCapital)
+            .outerjoin(m.HumanCapital, m.HumanCapital.nik == m.KartuKeluarga.nik)
+            .where(m.KartuKeluarga.id_kk < 10**9)
+            .order_by(m.KartuKeluarga.id_kk.desc()).limit(page),
+        "kondisi_rumah_queue": select(m.KondisiRumah).where(m.KondisiRumah.status == "P", m.KondisiRumah.id_kondisi_rumah > 0)
+            .order_by(m.KondisiRumah.id_kondisi_rumah).limit(page),
+        "kondisi_ekonomi_queue": select(m.KondisiEkonomi).where(m.KondisiEkonomi.status == "P", m.KondisiEkonomi.id_kondisi_ekonomi > 0)
+            .order_by(m.KondisiEkonomi.id_kondisi_ekonomi).limit(page),
+        "aset_queue": select(m.AsetNonFinancial).where(m.AsetNonFinancial.status == "P", m.AsetNonFinancial.id_aset_non_financial > 0)
+            .order_by(m.AsetNonFinancial.id_aset_non_financial).limit(page),
+        "kondisi_list": select(m.Masyarakat.nik, m.KondisiRumah, m.KondisiEkonomi)
+            .outerjoin(m.KondisiRumah, m.KondisiRumah.nik == m.Masyarakat.nik)
+            .outerjoin(m.KondisiEkonomi, m.KondisiEkonomi.nik == m.Masyarakat.nik)
+            .where(or_(m.KondisiRumah.id_kondisi_rumah.isnot(None), m.KondisiEkonomi.id_kondisi_ekonomi.isnot(None)))
+            .where(m.Masyarakat.nik > nik)
+            .order_by(m.Masyarakat.nik).limit(page),
+    }
+
+
+def explain(db, stmt):
+    """Return (plan lines, full-scan tables) for one statement on the current dialect."""
+    from sqlalchemy import text
+
+    dialect = db.engine.dialect
+    sql = str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    if dialect.name == "sqlite":
+        rows = db.session.execute(text("EXPLAIN QUERY PLAN " + sql)).fetchall()
+        lines = [row[-1] for row in rows]
+        scans = [
+            line.split()[1] for line in lines
+            if line.startswith("SCAN ") and " USING " not in line and "CONSTANT ROW" not in line
+        ]
+        return lines, scans
+    if dialect.name == "mysql":
+        result = db.session.execute(text("EXPLAIN " + sql))
+        keys = list(result.keys())
+        lines, scans = [], []
+        for row in result.fetchall():
+            info = dict(zip(keys, row))
+            lines.append(f"{info.get('table')}: type={info.get('type')} key={info.get('key')} rows={info.get('rows')} extra={info.get('Extra')}")
+            if info.get("type") == "ALL":
+                scans.append(info.get("table"))
+        return lines, scans
+    raise SystemExit(f"unsupported dialect: {dialect.name}")
+
+
+def main():
+    args = parse_args()
+    os.environ["DATABASE_URL"] = args.database_url
+
+    from server import create_app
+    from extension import db
+    import models
+
+    app = create_app()
+    with app.app_context():
+        if args.no_seed:
+            nik = db.session.query(models.Masyarakat.nik).order_by(models.Masyarakat.nik).limit(1).scalar() or 1
+        else:
+            db.create_all()
+            niks = seed(db, models, args.rows)
+            nik = niks[len(niks) // 2]
+            if db.engine.dialect.name == "sqlite":
+                db.session.execute(db.text("ANALYZE"))
+            else:
+                for table in db.metadata.sorted_tables:
+                    db.session.execute(db.text(f"ANALYZE TABLE {table.name}"))
+
+        failures = {}
+        for name, stmt in hot_queries(models, nik).items():
+            lines, scans = explain(db, stmt)
+            print(f"[{'SCAN' if scans else ' ok '}] {name}")
+            for line in lines:
+                print(f"         {line}")
+            if scans:
+                failures[name] = scans
+
+    if failures:
+        print("\nFull table scans:")
+        for name, tables in failures.items():
+            print(f"  {name}: {', '.join(tables)}")
+        return 1
+    print("\nNo full table scans.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
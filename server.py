@@ -36,6 +36,9 @@ def create_app(config_class: type[Config] = Config) -> Flask:
         app.register_blueprint(admin_bp, url_prefix='/api/admin')
         app.register_blueprint(supabase_bp, url_prefix='/api')
 
+        from commands import register_commands
+        register_commands(app)
+
         try:
             db.session.execute(text("SELECT 1 "))
             print("Database Connected")
@@ -0,0 +1,17 @@
+-- Single round-trip revocation check used by utils/supabase_client.py::check_token_revocation.
+-- Answers "is this (jti, device_id) pair still valid" against token_blocklist and device.
+create or replace function public.check_token_revocation(p_jti text default null, p_device_id text default null)
+returns table (jti_revoked boolean, device_revoked boolean)
+language sql
+stable
+security definer
+set search_path = public
+as $$
+  select
+    (p_jti is not null and exists (select 1 from token_blocklist where jti = p_jti)) as jti_revoked,
+    (p_device_id is not null and coalesce((select d.revoked from device d where d.device_id = p_device_id limit 1), false)) as device_revoked;
+$$;
+
+-- Only the backend (service_role key) may probe revocation state; functions are executable by PUBLIC by default.
+revoke execute on function public.check_token_revocation(text, text) from public, anon, authenticated;
+grant execute on function public.check_token_revocation(text, text) to service_role;
@@ -1,12 +1,115 @@
+import threading
+from functools import lru_cache
 from io import BytesIO
+from reportlab import rl_config
 from reportlab.pdfgen import canvas
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import Paragraph
-from reportlab.lib.enums import TA_JUSTIFY, TA_CENTER
-from reportlab.lib import colors
-import textwrap
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph, Frame
+from reportlab.lib.enums import TA_JUSTIFY
+
+# Bump when the rendered layout changes so cached PDFs (keyed by content hash) are regenerated
+TEMPLATE_VERSION = "2"
+
+# Layout, computed once per process
+WIDTH, HEIGHT = A4
+LEFT = 20 * mm
+RIGHT = WIDTH - 20 * mm
+CENTER_X = (LEFT + RIGHT) / 2.0
+LABEL_X = LEFT + 8 * mm
+VALUE_X = LEFT + 60 * mm
+VALUE_TEXT_X = VALUE_X + 8 * mm
+
+TITLE_Y = HEIGHT - 20 * mm
+NO_Y = TITLE_Y - 14 * mm
+INTRO_Y = NO_Y - 8 * mm
+HEADER_ROWS = [  # (label, data key, y)
+    ("KEPALA DESA", "kepala_desa", INTRO_Y - 8 * mm),
+    ("KECAMATAN", "kecamatan", INTRO_Y - 15 * mm),
+    ("KABUPATEN", "kabupaten", INTRO_Y - 22 * mm),
+]
+NAMA_Y = INTRO_Y - 33 * mm
+PERSONAL_ROWS = [
+    ("NO KTP", "no_ktp", NAMA_Y - 7 * mm),
+    ("TEMPAT / TANGGAL LAHIR", "tempat_tanggal_lahir", NAMA_Y - 13.5 * mm),
+    ("JENIS KELAMIN", "jenis_kelamin", NAMA_Y - 20 * mm),
+    ("ALAMAT", "alamat", NAMA_Y - 26.5 * mm),
+]
+PARAGRAPH_Y = NAMA_Y - 39 * mm
+FRAME_HEIGHT = 60 * mm
+FRAME = (LEFT, PARAGRAPH_Y - FRAME_HEIGHT + 6 * mm, RIGHT - LEFT, FRAME_HEIGHT)
+KOTA_Y = PARAGRAPH_Y - FRAME_HEIGHT - 12 * mm
+KEPALA_LABEL_Y = KOTA_Y - 8 * mm
+SIGNATURE_Y = KEPALA_LABEL_Y - 26 * mm
+SIGNATURE_HALF = 30 * mm
+KEPALA_NAME_Y = SIGNATURE_Y - 10 * mm
+
+DEFAULT_PARAGRAPH = (
+    "Dengan ini menerangkan bahwa nama tersebut benar merupakan warga kami yang tergolong keluarga kurang mampu "
+    "dan memerlukan keterangan ini untuk keperluan administratif serta mendapatkan bantuan yang semestinya. "
+    "Surat keterangan ini dibuat berdasarkan data yang tercatat dan dapat digunakan sesuai kebutuhan penerima.")
+
+PARAGRAPH_STYLE = ParagraphStyle("SktmStatement", fontName="Helvetica", fontSize=11, leading=14, alignment=TA_JUSTIFY)
+
+# Registration order fixes the internal names (/F1, /F2) the static layer refers to
+FONTS = ("Helvetica-Bold", "Helvetica")
+
+_local = threading.local()
+
+
+def configure_render_process():
+    """Switch ReportLab to Flate-only page streams for this process.
+
+    The ASCII85 pass made every PDF ~25% larger and is the slowest part of save(), but
+    rl_config is process-wide, so only call this in a process that just renders SKTM
+    letters (the render pool's workers).
+    """
+    rl_config.useA85 = 0
+
+
+def _register_fonts(p):
+    for font in FONTS:
+        p.setFont(font, 11)
+
+
+@lru_cache(maxsize=1)
+def _static_layer() -> str:
+    """PDF operators for everything that is the same on every letter, built once per process."""
+    scratch = canvas.Canvas(BytesIO(), pagesize=A4)
+    _register_fonts(scratch)
+    t = scratch.beginText()
+
+    def text(font, size, x, y, s, centred=False):
+        t.setFont(font, size)
+        t.setTextOrigin(x - stringWidth(s, font, size) / 2.0 if centred else x, y)
+        t.textOut(s)
+
+    text("Helvetica-Bold", 18, WIDTH / 2.0, TITLE_Y, "SURAT KETERANGAN TIDAK MAMPU", centred=True)
+    text("Helvetica", 10, LEFT, NO_Y, "NO:")
+    text("Helvetica", 11, LEFT, INTRO_Y, "YANG BERTANDA TANGAN DIBAWAH INI")
+    for label, _, y in HEADER_ROWS:
+        text("Helvetica-Bold", 11, LABEL_X, y, label)
+        text("Helvetica", 11, VALUE_X, y, ":")
+    text("Helvetica-Bold", 12, LEFT, NAMA_Y, "NAMA")
+    text("Helvetica-Bold", 12, VALUE_X, NAMA_Y, ":")
+    for label, _, y in PERSONAL_ROWS:
+        text("Helvetica-Bold", 11, LEFT, y, label)
+        text("Helvetica", 11, VALUE_X, y, ":")
+    text("Helvetica-Bold", 11, CENTER_X, KEPALA_LABEL_Y, "KEPALA DESA :", centred=True)
+    return t.getCode()
+
+
+def _default_paragraph():
+    """The standard statement, wrapped once per thread (drawOn keeps per-call state on the flowable)."""
+    para = getattr(_local, "paragraph", None)
+    if para is None:
+        x, y, width, height = FRAME
+        para = Paragraph(DEFAULT_PARAGRAPH, PARAGRAPH_STYLE)
+        para.wrap(width - 12, height - 12)  # Frame's default 6pt padding on each side
+        _local.paragraph = para
+    return para
 
 
 def generate_sktm_pdf_bytes(data: dict) -> bytes:
@@ -16,115 +119,46 @@ def generate_sktm_pdf_bytes(data: dict) -> bytes:
             kepala_desa, kecamatan, kabupaten,
             nama, no_ktp, tempat_tanggal_lahir, jenis_kelamin, alamat,
       pernyataan_paragraf (optional), kota_tanggal, kepala_nama
+
+    The static layer (title, labels, signature block) is replayed from _static_layer();
+    only the citizen's values are laid out per call.
     """
     buffer = BytesIO()
     p = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
-
-    # Margins
-    left = 20 * mm
-    right = width - 20 * mm
-    y = height - 20 * mm
-
-    # Title
-    p.setFont("Helvetica-Bold", 18)
-    p.drawCentredString(width / 2.0, y, "SURAT KETERANGAN TIDAK MAMPU")
-    y -= 14 * mm
-
-    # NO placeholder
-    p.setFont("Helvetica", 10)
-    p.drawString(left, y, "NO:")
-    y -= 8 * mm
-
-    # Header block (Kepala Desa / Kecamatan / Kabupaten)
-    p.setFont("Helvetica", 11)
-    p.drawString(left, y, "YANG BERTANDA TANGAN DIBAWAH INI")
-    y -= 8 * mm
-
-    label_x = left + 8 * mm
-    value_x = left + 60 * mm
-    for label, key in (("KEPALA DESA", "kepala_desa"), ("KECAMATAN", "kecamatan"), ("KABUPATEN", "kabupaten")):
-        val = data.get(key, "") or ""
-        p.setFont("Helvetica-Bold", 11)
-        p.drawString(label_x, y, label)
-        p.setFont("Helvetica", 11)
-        # draw colon aligned at value_x like other fields
-        p.drawString(value_x, y, ":")
-        p.drawString(value_x + 8 * mm, y, str(val))
-        y -= 7 * mm
-
-    y -= 4 * mm
-
-    # Personal data left-aligned in two columns style
-    p.setFont("Helvetica-Bold", 12)
-    p.drawString(left, y, "NAMA")
-    p.drawString(value_x, y, ":")
-    p.setFont("Helvetica", 12)
-    p.drawString(value_x + 8 * mm, y, data.get('nama', ''))
-    y -= 7 * mm
-
-    fields = [
-        ("NO KTP", 'no_ktp'),
-        ("TEMPAT / TANGGAL LAHIR", 'tempat_tanggal_lahir'),
-        ("JENIS KELAMIN", 'jenis_kelamin'),
-        ("ALAMAT", 'alamat'),
-    ]
-    for label, key in fields:
-        p.setFont("Helvetica-Bold", 11)
-        p.drawString(left, y, f"{label}")
-        p.setFont("Helvetica", 11)
-        p.drawString(value_x, y, ":")
-        p.drawString(value_x + 8 * mm, y, str(data.get(key, '') or ''))
-        y -= 6.5 * mm
-
-    y -= 6 * mm
-
-    # Statement paragraph
-    p.setFont("Helvetica", 11)
-    paragraph = data.get('pernyataan_paragraf') or (
-        "Dengan ini menerangkan bahwa nama tersebut benar merupakan warga kami yang tergolong keluarga kurang mampu "
-        "dan memerlukan keterangan ini untuk keperluan administratif serta mendapatkan bantuan yang semestinya. "
-        "Surat keterangan ini dibuat berdasarkan data yang tercatat dan dapat digunakan sesuai kebutuhan penerima.")
-    # Use platypus Paragraph for nicer justification and let it wrap naturally
-    max_width = right - left
-    styles = getSampleStyleSheet()
-    ps = styles['Normal']
-    ps.fontName = 'Helvetica'
-    ps.fontSize = 11
-    ps.leading = 14
-    ps.alignment = TA_JUSTIFY
-    # preserve any intentional line breaks, but let Paragraph handle wrapping
-    para = Paragraph(paragraph.replace('\n', '<br/>'), ps)
-    # draw the paragraph with a slightly larger frame to avoid premature clipping
-    from reportlab.platypus import Frame
-    frame_height = 60 * mm
-    f = Frame(left, y - frame_height + 6 * mm, max_width, frame_height, showBoundary=0)
-    f.addFromList([para], p)
-    y -= frame_height + 6 * mm
-
-    # Closing and signature area (centered)
-    y -= 6 * mm
-    kota = data.get('kota_tanggal') or ''
-    p.drawCentredString((left + right) / 2.0, y, kota)
-    y -= 8 * mm
-
-    # Center label and signature block
-    center_x = (left + right) / 2.0
-    p.setFont("Helvetica-Bold", 11)
-    p.drawCentredString(center_x, y, "KEPALA DESA :")
-    y -= 6 * mm
-
-    # leave space for handwritten signature: draw a centered signature line
-    sig_gap = 20 * mm
-    sig_y = y - sig_gap
-    line_length = 60 * mm
-    p.line(center_x - line_length / 2.0, sig_y, center_x + line_length / 2.0, sig_y)
-
+    _register_fonts(p)
+    p.addLiteral(_static_layer())
+
+    # Dynamic overlay: every citizen value in one text object
+    t = p.beginText()
+
+    def text(font, size, x, y, s, centred=False):
+        t.setFont(font, size)
+        t.setTextOrigin(x - stringWidth(s, font, size) / 2.0 if centred else x, y)
+        t.textOut(s)
+
+    for _, key, y in HEADER_ROWS:
+        text("Helvetica", 11, VALUE_TEXT_X, y, str(data.get(key, "") or ""))
+    text("Helvetica", 12, VALUE_TEXT_X, NAMA_Y, data.get('nama', '') or '')
+    for _, key, y in PERSONAL_ROWS:
+        text("Helvetica", 11, VALUE_TEXT_X, y, str(data.get(key, '') or ''))
+    text("Helvetica", 11, CENTER_X, KOTA_Y, data.get('kota_tanggal') or '', centred=True)
     # print kepala name below the signature line (use kepala_desa first, fallback to kepala_nama)
-    name_y = sig_y - 10 * mm
-    p.setFont("Helvetica-Bold", 11)
-    kepala_print = data.get('kepala_desa') or data.get('kepala_nama') or ''
-    p.drawCentredString(center_x, name_y, kepala_print)
+    text("Helvetica-Bold", 11, CENTER_X, KEPALA_NAME_Y, data.get('kepala_desa') or data.get('kepala_nama') or '', centred=True)
+    p.drawText(t)
+
+    # leave space for handwritten signature: a centered signature line
+    p.line(CENTER_X - SIGNATURE_HALF, SIGNATURE_Y, CENTER_X + SIGNATURE_HALF, SIGNATURE_Y)
+
+    # Statement paragraph: the standard text is pre-wrapped, a custom one goes through a Frame
+    x, y, width, height = FRAME
+    paragraph = data.get('pernyataan_paragraf')
+    if not paragraph:
+        para = _default_paragraph()
+        para.drawOn(p, x + 6, y + height - 6 - para.height)
+    else:
+        # preserve any intentional line breaks, but let Paragraph handle wrapping
+        para = Paragraph(paragraph.replace('\n', '<br/>'), PARAGRAPH_STYLE)
+        Frame(x, y, width, height, showBoundary=0).addFromList([para], p)
 
     p.showPage()
     p.save()
@@ -0,0 +1,181 @@
+import os
+import sys
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+# configure before anything imports config/server: never fall back to the production database
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ["SECRET_KEY"] = "test-secret-key-long-enough-for-hs256-signing"
+os.environ.pop("SUPABASE_URL", None)
+os.environ.pop("SUPABASE_KEY", None)
+os.environ["SKTM_RENDER_WORKERS"] = "0"
+os.environ["SKTM_PREGEN"] = "0"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import event
+
+
+class FakeQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+
+    def select(self, *args, **kwargs):
+        return self
+
+    def eq(self, *args, **kwargs):
+        return self
+
+    def limit(self, *args, **kwargs):
+        return self
+
+    def execute(self):
+        self.client.calls.append(("table", self.table))
+        return SimpleNamespace(data=self.client.table_rows.get(self.table, []))
+
+
+class FakeRpc:
+    def __init__(self, client, name, params):
+        self.client = client
+        self.name = name
+        self.params = params
+
+    def execute(self):
+        self.client.calls.append(("rpc", self.name))
+        if self.client.rpc_error:
+            raise self.client.rpc_error
+        return SimpleNamespace(data=[dict(self.client.rpc_result)])
+
+
+class FakeSupabase:
+    """Records every outbound PostgREST call made through utils.supabase_client._client."""
+
+    def __init__(self):
+        self.calls = []
+        self.table_rows = {}
+        self.rpc_result = {"jti_revoked": False, "device_revoked": False}
+        self.rpc_error = None
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        return FakeRpc(self, name, params)
+
+    def count(self, kind):
+        return sum(1 for call in self.calls if call[0] == kind)
+
+
+@pytest.fixture
+def supabase(mocker):
+    import utils.supabase_client as sc
+    from utils.revocation_cache import revocation_cache
+    from utils.signed_url_cache import signed_url_cache
+
+    fake = FakeSupabase()
+    mocker.patch.object(sc, "_client", fake)
+    revocation_cache.clear()
+    signed_url_cache.clear()
+    return fake
+
+
+@pytest.fixture
+def database_uri():
+    """Override in a module with a file-backed SQLite URI when threads need their own connections."""
+    return "sqlite://"
+
+
+@pytest.fixture
+def app(supabase, database_uri):
+    from config import Config
+    from server import create_app
+    from extension import db
+
+    class TestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_uri
+
+    app = create_app(TestConfig)
+    app.config["TESTING"] = True
+    with app.app_context():
+        db.create_all()
+    supabase.calls.clear()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(app):
+    from utils.auth import create_tokens_for_user
+
+    def make(identity, role=None):
+        with app.app_context():
+            token = create_tokens_for_user(identity, role=role)["access_token"]
+        return {"Authorization": f"Bearer {token}"}
+    return make
+
+
+@pytest.fixture
+def petugas_headers(auth_headers):
+    return auth_headers(99, role="petugas")
+
+
+@pytest.fixture
+def count_queries(app):
+    """with count_queries() as statements: ... -> list of SQL strings executed inside the block."""
+    from extension import db
+
+    @contextmanager
+    def counter():
+        statements = []
+
+        def listener(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+    return counter
+
+
+@pytest.fixture
+def make_citizen(app):
+    """Create a citizen with every SKTM section; `status` applies to all sections unless overridden."""
+    import datetime
+    from extension import db
+    from models import Masyarakat, KTP, KartuKeluarga, HumanCapital, KondisiRumah, KondisiEkonomi, AsetNonFinancial
+    from utils.application_status import refresh_application_status
+
+    def make(nik, status="B", sections=None, human_capital=True):
+        statuses = {s: status for s in ("ktp", "kartu_keluarga", "kondisi_rumah", "kondisi_ekonomi", "aset_non_financial")}
+        statuses.update(sections or {})
+        with app.app_context():
+            db.session.add(Masyarakat(nik=nik, nama=f"Warga {nik}", jenis_kelamin="L"))
+            if statuses["ktp"]:
+                db.session.add(KTP(nik=nik, tempat_lahir="Sidoarjo", tanggal_lahir=datetime.date(1990, 1, 1), alamat="Candi", status=statuses["ktp"]))
+            if statuses["kartu_keluarga"]:
+                db.session.add(KartuKeluarga(nik=nik, no_kk=nik, nama_kepala_keluarga=f"KK {nik}", status=statuses["kartu_keluarga"]))
+            if human_capital:
+                db.session.add(HumanCapital(nik=nik, status="P"))
+            if statuses["kondisi_rumah"]:
+                db.session.add(KondisiRumah(nik=nik, status=statuses["kondisi_rumah"]))
+            if statuses["kondisi_ekonomi"]:
+                db.session.add(KondisiEkonomi(nik=nik, status=statuses["kondisi_ekonomi"]))
+            if statuses["aset_non_financial"]:
+                db.session.add(AsetNonFinancial(nik=nik, total_kendaraan=0, status=statuses["aset_non_financial"]))
+            db.session.flush()
+            refresh_application_status(nik)
+            db.session.commit()
+        return nik
+    return make
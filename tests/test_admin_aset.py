@@ -0,0 +1,31 @@
+def test_update_100_vehicles_is_set_based(app, client, make_citizen, petugas_headers, count_queries):
+    from extension import db
+    from models import AsetNonFinancial, DetailKendaraan
+
+    make_citizen(7, status="P")
+    make_citizen(8, status="P")
+    with app.app_context():
+        own = AsetNonFinancial.query.filter_by(nik=7).one()
+        other = AsetNonFinancial.query.filter_by(nik=8).one()
+        db.session.add_all([DetailKendaraan(id_aset_non_financial=own.id_aset_non_financial, status="P") for _ in range(100)])
+        db.session.add(DetailKendaraan(id_aset_non_financial=other.id_aset_non_financial, status="P"))
+        db.session.commit()
+        own_ids = [d.id_detail_kendaraan for d in DetailKendaraan.query.filter_by(id_aset_non_financial=own.id_aset_non_financial)]
+        foreign_id = DetailKendaraan.query.filter_by(id_aset_non_financial=other.id_aset_non_financial).one().id_detail_kendaraan
+
+    decisions = [{"id_detail_kendaraan": i, "status": "B" if n % 2 else "T"} for n, i in enumerate(own_ids)]
+    decisions += [{"id_detail_kendaraan": foreign_id, "status": "B"}, {"id_detail_kendaraan": 999999, "status": "B"}]
+
+    with count_queries() as statements:
+        resp = client.put("/api/admin/asetNonFinansial/7/status", headers=petugas_headers, json={"detail_kendaraan": decisions})
+
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert sorted(body["applied_ids"]) == sorted(own_ids)
+    assert sorted(body["rejected_ids"]) == [foreign_id, 999999]
+    vehicle_statements = [s for s in statements if "detail_kendaraan" in s]
+    assert len(vehicle_statements) == 3  # ownership SELECT + one UPDATE per status
+    with app.app_context():
+        statuses = dict(db.session.query(DetailKendaraan.id_detail_kendaraan, DetailKendaraan.status))
+        assert [statuses[i] for i in own_ids] == ["B" if n % 2 else "T" for n in range(100)]
+        assert statuses[foreign_id] == "P"
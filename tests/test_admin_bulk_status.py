@@ -0,0 +1,34 @@
+def test_bulk_kk_decision_updates_first_row_like_single_item(app, client, make_citizen, petugas_headers, count_queries):
+    from extension import db
+    from models import KartuKeluarga, ApplicationStatus
+
+    make_citizen(7, status="P")
+    make_citizen(8, status="P")
+    with app.app_context():
+        db.session.add(KartuKeluarga(nik=7, no_kk=70, nama_kepala_keluarga="KK kedua", status="P"))
+        db.session.commit()
+
+    with count_queries() as statements:
+        resp = client.post("/api/admin/status/bulk", headers=petugas_headers, json={"decisions": [
+            {"nik": 7, "section": "kartu_keluarga", "status": "B"},
+            {"nik": 8, "section": "kartu_keluarga", "status": "B"},
+            {"nik": 8, "section": "ktp", "status": "T"},
+            {"nik": 9, "section": "ktp", "status": "B"},
+        ]})
+
+    assert resp.status_code == 200
+    assert resp.get_json()["summary"] == {"updated": 3, "not_found": 1, "invalid": 0}
+    updates = [s for s in statements if s.startswith("UPDATE kartu_keluarga") or s.startswith("UPDATE ktp")]
+    assert len(updates) == 2
+    with app.app_context():
+        kk7 = KartuKeluarga.query.filter_by(nik=7).order_by(KartuKeluarga.id_kk).all()
+        assert [kk.status for kk in kk7] == ["B", "P"]
+        assert KartuKeluarga.query.filter_by(nik=8).one().status == "B"
+        assert db.session.get(ApplicationStatus, 8).ktp_status == "T"
+        # the second KK row is still pending, so the section is not approved yet
+        assert db.session.get(ApplicationStatus, 7).kartu_keluarga_status == "P"
+
+    single = client.put("/api/admin/kk/7", headers=petugas_headers, json={"status": "T"})
+    assert single.status_code == 200
+    with app.app_context():
+        assert [kk.status for kk in KartuKeluarga.query.filter_by(nik=7).order_by(KartuKeluarga.id_kk)] == ["T", "P"]
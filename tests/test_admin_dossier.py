@@ -0,0 +1,57 @@
+import pytest
+
+
+@pytest.fixture
+def citizen(app, make_citizen):
+    from extension import db
+    from models import AsetNonFinancial, DetailKendaraan
+
+    make_citizen(7)
+    with app.app_context():
+        aset = AsetNonFinancial.query.filter_by(nik=7).one()
+        db.session.add_all([DetailKendaraan(id_aset_non_financial=aset.id_aset_non_financial, jenis_kendaraan="Motor", status="B")
+                            for _ in range(3)])
+        db.session.commit()
+    return 7
+
+
+def test_sparse_fields_take_one_statement(client, citizen, petugas_headers, count_queries):
+    with count_queries() as statements:
+        resp = client.get(f"/api/admin/dossier/{citizen}?fields=ktp.status,kartu_keluarga.status", headers=petugas_headers)
+
+    assert resp.status_code == 200
+    data = resp.get_json()["data"]
+    assert data == {"ktp": {"status": "B"}, "kartu_keluarga": [{"status": "B"}]}
+    assert len(statements) == 1
+
+
+def test_nested_vehicles_take_one_extra_statement(client, citizen, petugas_headers, count_queries):
+    with count_queries() as statements:
+        resp = client.get(f"/api/admin/dossier/{citizen}?fields=aset_non_financial.detail_kendaraan", headers=petugas_headers)
+
+    assert resp.status_code == 200
+    vehicles = resp.get_json()["data"]["aset_non_financial"]["detail_kendaraan"]
+    assert [v["jenis_kendaraan"] for v in vehicles] == ["Motor"] * 3
+    assert len(statements) == 2  # joined dossier + SELECT ... IN for the vehicles
+
+
+def test_full_dossier_takes_two_statements(client, citizen, petugas_headers, count_queries):
+    with count_queries() as statements:
+        resp = client.get(f"/api/admin/dossier/{citizen}", headers=petugas_headers)
+
+    assert resp.status_code == 200
+    assert set(resp.get_json()["data"]) == {
+        "masyarakat", "ktp", "kartu_keluarga", "human_capital", "kondisi_rumah",
+        "kondisi_ekonomi", "aset_non_financial", "application_status",
+    }
+    assert len(statements) == 2
+
+
+@pytest.mark.parametrize("fields", ["ktp.tidak_ada", "tidak_ada", "kartu_keluarga.status,aset_non_financial.x"])
+def test_unknown_field_is_rejected_before_querying(client, citizen, petugas_headers, count_queries, fields):
+    with count_queries() as statements:
+        resp = client.get(f"/api/admin/dossier/{citizen}?fields={fields}", headers=petugas_headers)
+
+    assert resp.status_code == 400
+    assert resp.get_json()["message"].startswith("fields tidak valid")
+    assert statements == []
@@ -0,0 +1,22 @@
+import pytest
+
+
+@pytest.mark.parametrize("count", [1, 5, 40])
+def test_kk_list_statement_count_is_constant(app, client, make_citizen, count_queries, petugas_headers, count):
+    for nik in range(1, count + 1):
+        make_citizen(nik, sections={"kartu_keluarga": "B" if nik % 2 else "P"})
+
+    with count_queries() as statements:
+        resp = client.get("/api/admin/kk?per_page=50", headers=petugas_headers)
+
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body["count"] == count
+    assert all(item["human_capital"] is not None for item in body["data"])
+    assert len(statements) == 1
+
+    with count_queries() as statements:
+        resp = client.get("/api/admin/kk?per_page=50&status=B&include_total=1", headers=petugas_headers)
+
+    assert resp.get_json()["count"] == (count + 1) // 2
+    assert len(statements) == 2  # page + COUNT
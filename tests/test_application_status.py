@@ -0,0 +1,26 @@
+from sqlalchemy import event
+from sqlalchemy.dialects import mysql
+
+
+def test_refresh_locks_before_reading_sections(app, make_citizen):
+    from extension import db
+    from utils.application_status import refresh_application_status
+
+    make_citizen(7)
+    with app.app_context():
+        rendered = []
+
+        def capture(state):
+            rendered.append(str(state.statement.compile(dialect=mysql.dialect())))
+        session = db.session()
+        event.listen(session, "do_orm_execute", capture)
+        try:
+            refresh_application_status(7)
+        finally:
+            event.remove(session, "do_orm_execute", capture)
+
+    # citizen row locked first, then sections and the status row read with locking reads
+    assert rendered[0].startswith("SELECT masyarakat.nik") and rendered[0].endswith("FOR UPDATE")
+    assert "LEFT OUTER JOIN ktp" in rendered[1] and rendered[1].endswith("LOCK IN SHARE MODE")
+    assert "FROM application_status" in rendered[2] and rendered[2].endswith("FOR UPDATE")
+
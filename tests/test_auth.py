@@ -0,0 +1,46 @@
+def test_admin_request_checks_revocation_once(client, supabase, petugas_headers):
+    # @jwt_required_custom + @role_required (which wraps it again) share one verification
+    resp = client.get("/api/admin/metrics", headers=petugas_headers)
+
+    assert resp.status_code == 200
+    assert supabase.count("rpc") == 1
+    assert supabase.count("table") == 0
+
+
+def test_revoked_token_is_rejected_with_one_lookup(client, supabase, petugas_headers):
+    supabase.rpc_result = {"jti_revoked": True, "device_revoked": False}
+
+    resp = client.get("/api/admin/metrics", headers=petugas_headers)
+
+    assert resp.status_code == 401
+    assert resp.get_json()["message"] == "token_revoked"
+    assert supabase.count("rpc") == 1
+
+
+def test_valid_token_is_cached_across_requests(client, supabase, petugas_headers):
+    client.get("/api/admin/metrics", headers=petugas_headers)
+    client.get("/api/admin/metrics", headers=petugas_headers)
+
+    assert supabase.count("rpc") == 1
+
+
+def test_wrong_role_is_forbidden_without_extra_lookup(client, supabase, auth_headers):
+    resp = client.get("/api/admin/metrics", headers=auth_headers(1))
+
+    assert resp.status_code == 403
+    assert supabase.count("rpc") == 1
+
+
+def test_rpc_failure_falls_back_and_is_counted(client, supabase, petugas_headers):
+    from utils.supabase_client import get_revocation_rpc_stats
+
+    before = get_revocation_rpc_stats()
+    supabase.rpc_error = RuntimeError("function check_token_revocation does not exist")
+
+    resp = client.get("/api/admin/metrics", headers=petugas_headers)
+
+    assert resp.status_code == 200
+    assert supabase.count("table") == 1  # token_blocklist lookup
+    after = resp.get_json()["data"]["revocation_rpc"]
+    assert after["fallback"] == before["fallback"] + 1
+    assert after["rpc"] == before["rpc"]
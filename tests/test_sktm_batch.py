@@ -0,0 +1,71 @@
+import datetime
+
+import pytest
+
+
+@pytest.fixture
+def database_uri(tmp_path):
+    # batch worker threads each get their own connection
+    return f"sqlite:///{tmp_path / 'sktm.db'}"
+
+
+@pytest.fixture
+def storage(mocker):
+    import utils.sktm_documents as documents
+
+    calls = {"upload": [], "delete": []}
+
+    def upload(bucket, path, file_bytes, content_type=None, upsert=False):
+        calls["upload"].append((bucket, path, upsert))
+        return f"https://storage.test/{bucket}/{path}"
+
+    def delete(bucket, path):
+        calls["delete"].append((bucket, path))
+        return True
+    mocker.patch.object(documents, "upload_file", upload)
+    mocker.patch.object(documents, "delete_file", delete)
+    return calls
+
+
+def test_batch_records_the_path_it_uploaded(app, make_citizen, storage, mocker):
+    import utils.sktm_batch as batch
+    from models import SktmDocument, SktmGenerationLock
+
+    make_citizen(3515000000000001)
+    make_citizen(3515000000000002)
+    generate = mocker.spy(batch, "generate_sktm_document_once")
+
+    with app.app_context():
+        result = batch.run_sktm_batch(workers=2)
+
+        assert result["summary"]["rendered"] == 2
+        assert generate.call_count == 2  # through the generation lock, like a download
+        uploaded = {(bucket, path) for bucket, path, upsert in storage["upload"] if upsert}
+        assert {(doc.bucket, doc.path) for doc in SktmDocument.query.all()} == uploaded
+        assert {(e["bucket"], e["path"]) for e in result["manifest"]} == uploaded
+        assert SktmGenerationLock.query.count() == 0
+
+        again = batch.run_sktm_batch(workers=2)
+    assert again["summary"]["existing"] == 2
+    assert len(storage["upload"]) == 2
+
+
+@pytest.mark.parametrize("same_object", [True, False])
+def test_concurrent_insert_never_deletes_the_stored_object(app, make_citizen, storage, same_object):
+    from extension import db
+    from models import SktmDocument
+    from utils.sktm_documents import create_sktm_document, sktm_document_path, get_sktm_bucket
+
+    nik = make_citizen(3515000000000003)
+    content_hash = "ab" * 32
+    path = sktm_document_path(nik, content_hash)
+    with app.app_context():
+        stored = path if same_object else f"{nik}/sktm/sktm_{nik}_older.pdf"
+        db.session.add(SktmDocument(nik=nik, content_hash=content_hash, bucket=get_sktm_bucket(), path=stored,
+                                    created_at=datetime.datetime.utcnow()))
+        db.session.commit()
+
+        doc = create_sktm_document(nik, {"nama": "Warga"}, content_hash)
+
+        assert doc.path == stored
+    assert storage["delete"] == ([] if same_object else [(get_sktm_bucket(), path)])
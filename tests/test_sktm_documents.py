@@ -0,0 +1,63 @@
+from datetime import datetime
+
+import pytest
+
+
+@pytest.fixture
+def stored_doc(app):
+    from extension import db
+    from models.sktmdocumentModel import SktmDocument
+
+    with app.app_context():
+        doc = SktmDocument(nik=7, content_hash="a" * 64, bucket="sktm", path="7/sktm/sktm_7_1.pdf", created_at=datetime.utcnow())
+        db.session.add(doc)
+        db.session.commit()
+        return doc.id_sktm_document
+
+
+@pytest.mark.parametrize("exists,forgotten", [(False, True), (None, False), (True, False)])
+def test_forget_only_when_storage_confirms_missing(app, mocker, stored_doc, exists, forgotten):
+    from extension import db
+    from models.sktmdocumentModel import SktmDocument
+    import utils.sktm_documents as sd
+
+    mocker.patch.object(sd, "object_exists", return_value=exists)
+    with app.app_context():
+        assert sd.forget_sktm_document(db.session.get(SktmDocument, stored_doc)) is forgotten
+        db.session.expire_all()
+        assert (db.session.get(SktmDocument, stored_doc) is None) is forgotten
+
+
+def _docs(nik, count):
+    from datetime import timedelta
+    from models.sktmdocumentModel import SktmDocument
+
+    base = datetime(2026, 1, 1)
+    return [
+        SktmDocument(nik=nik, content_hash=f"{nik}-{i}".ljust(64, "0"), bucket="sktm", path=f"{nik}/sktm/{i}.pdf", created_at=base + timedelta(minutes=i))
+        for i in range(count)
+    ]
+
+
+def test_retention_keeps_hint_requested_during_run(app, mocker):
+    from extension import db
+    from models.sktmprunehintModel import SktmPruneHint
+    import utils.sktm_documents as sd
+
+    with app.app_context():
+        db.session.add_all(_docs(7, 4) + _docs(8, 4))
+        db.session.add_all([SktmPruneHint(nik=7, requested_at=datetime(2026, 1, 2)), SktmPruneHint(nik=8, requested_at=datetime(2026, 1, 2))])
+        db.session.commit()
+
+    def delete_files(bucket, paths, batch_size):
+        # a download for nik 7 finishes while storage deletes are in flight
+        with app.app_context():
+            db.session.merge(SktmPruneHint(nik=7, requested_at=datetime(2026, 1, 3)))
+            db.session.commit()
+        return paths
+    mocker.patch.object(sd, "delete_files", side_effect=delete_files)
+
+    with app.app_context():
+        stats = sd.run_sktm_retention(keep=3)
+        assert stats["files_removed"] == 2
+        assert [h.nik for h in SktmPruneHint.query.all()] == [7]
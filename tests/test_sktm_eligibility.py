@@ -0,0 +1,59 @@
+from datetime import datetime
+
+import pytest
+
+
+def _section_statements(statements):
+    tables = ("ktp", "kartu_keluarga", "kondisi_rumah", "kondisi_ekonomi", "aset_non_financial", "masyarakat")
+    return [s for s in statements if any(f"FROM {t}" in s or f"JOIN {t}" in s for t in tables)]
+
+
+@pytest.mark.parametrize("status", ["B", "P"])
+def test_snapshot_loads_every_section_in_one_statement(app, make_citizen, count_queries, status):
+    from utils.application_status import load_application_snapshot
+
+    make_citizen(7, status=status)
+    with app.app_context(), count_queries() as statements:
+        snapshot = load_application_snapshot(7)
+        failures = snapshot.failures()
+
+    assert (failures == []) is (status == "B")
+    assert 1 <= len(statements) <= 2
+
+
+def test_can_download_is_a_single_statement(app, client, make_citizen, count_queries, auth_headers):
+    make_citizen(7, sections={"kondisi_ekonomi": "P"})
+    headers = auth_headers(7)
+
+    with count_queries() as statements:
+        resp = client.get("/api/user/sktm/7/can-download", headers=headers)
+
+    assert resp.status_code == 403
+    assert resp.get_json()["failures"]
+    assert len(statements) == 1
+
+
+def test_cached_download_checks_statuses_once(app, client, make_citizen, count_queries, auth_headers, mocker):
+    from extension import db
+    from models.sktmdocumentModel import SktmDocument
+    from utils.application_status import load_application_snapshot
+    from utils.sktm_documents import build_sktm_data, sktm_content_hash
+    import controllers.userSktmController as ctl
+
+    make_citizen(7)
+    with app.app_context():
+        snapshot = load_application_snapshot(7)
+        content_hash = sktm_content_hash(build_sktm_data(7, snapshot.masyarakat, snapshot.ktp))
+        db.session.add(SktmDocument(nik=7, content_hash=content_hash, bucket="sktm", path="7/sktm/a.pdf", created_at=datetime.utcnow()))
+        db.session.commit()
+    mocker.patch.object(ctl, "create_signed_url", return_value="https://storage.example/7/sktm/a.pdf?token=t")
+    headers = auth_headers(7)
+
+    with count_queries() as statements:
+        resp = client.get("/api/user/sktm/7/download", headers=headers)
+
+    assert resp.status_code == 200
+    assert resp.get_json()["cached"] is True
+    # status snapshot + the sktm_document lookup, no per-section queries
+    assert 1 <= len(_section_statements(statements)) <= 2
+    assert len(statements) <= 3
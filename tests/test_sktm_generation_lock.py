@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+
+NIK = 3515000000000001
+CONTENT_HASH = "cd" * 32
+
+
+@pytest.fixture
+def database_uri(tmp_path):
+    # every simulated request/worker gets its own connection
+    return f"sqlite:///{tmp_path / 'sktm.db'}"
+
+
+@pytest.fixture
+def renders(mocker):
+    """Counts renders; each one takes `renders.seconds`."""
+    import utils.sktm_documents as documents
+
+    state = type("Renders", (), {"count": 0, "seconds": 0.3})()
+    lock = threading.Lock()
+
+    def render(data):
+        with lock:
+            state.count += 1
+        time.sleep(state.seconds)
+        return b"%PDF"
+    mocker.patch.object(documents, "render_sktm_pdf", render)
+    mocker.patch.object(documents, "upload_file", return_value="https://storage.test/sktm.pdf")
+    mocker.patch.object(documents, "delete_file")
+    return state
+
+
+def run_concurrently(app, target, n=20):
+    barrier = threading.Barrier(n)
+    results = [None] * n
+
+    def run(i):
+        with app.app_context():
+            barrier.wait()
+            try:
+                doc, rendered = target()
+                results[i] = (doc.id_sktm_document, rendered)
+            except Exception as e:
+                results[i] = e
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_twenty_simultaneous_requests_render_once(app, make_citizen, renders):
+    from utils.sktm_documents import generate_sktm_document_once
+
+    make_citizen(NIK)
+    results = run_concurrently(app, lambda: generate_sktm_document_once(NIK, {}, CONTENT_HASH))
+
+    assert renders.count == 1
+    assert len({doc_id for doc_id, _ in results}) == 1
+    assert sum(rendered for _, rendered in results) == 1
+
+
+def test_twenty_workers_render_once(app, make_citizen, renders):
+    # bypass the in-process flight: every thread behaves like a separate worker on the lock row
+    from utils.sktm_documents import _generate_locked
+
+    make_citizen(NIK)
+    results = run_concurrently(app, lambda: _generate_locked(NIK, {}, CONTENT_HASH))
+
+    assert renders.count == 1
+    assert len({doc_id for doc_id, _ in results}) == 1
+
+
+def test_heartbeat_keeps_a_slow_render_locked(app, make_citizen, renders, monkeypatch):
+    import utils.sktm_documents as documents
+
+    monkeypatch.setattr(documents, "SKTM_LOCK_TTL", 1)
+    monkeypatch.setattr(documents, "SKTM_LOCK_HEARTBEAT", 0.2)
+    renders.seconds = 2.5  # well past the TTL
+    make_citizen(NIK)
+
+    results = run_concurrently(app, lambda: documents._generate_locked(NIK, {}, CONTENT_HASH), n=2)
+
+    assert renders.count == 1
+    assert len({doc_id for doc_id, _ in results}) == 1
+
+
+def test_acquiring_the_lock_does_not_commit_the_callers_session(app, make_citizen):
+    from extension import db
+    from models import Masyarakat, SktmGenerationLock
+    from utils.sktm_documents import _acquire_generation_lock, _release_generation_lock
+
+    make_citizen(NIK)
+    with app.app_context():
+        db.session.add(Masyarakat(nik=NIK + 1, nama="Belum disimpan", jenis_kelamin="P"))
+        assert _acquire_generation_lock(NIK, CONTENT_HASH, "owner")
+        db.session.rollback()
+
+        assert db.session.get(Masyarakat, NIK + 1) is None
+        assert db.session.get(SktmGenerationLock, NIK) is not None
+        _release_generation_lock(NIK, "owner")
+        db.session.expire_all()
+        assert db.session.get(SktmGenerationLock, NIK) is None
@@ -0,0 +1,19 @@
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.mark.parametrize("rendered, outcome", [(True, "generated"), (False, "joined")])
+def test_pregen_counts_only_its_own_renders(app, make_citizen, mocker, rendered, outcome):
+    import utils.sktm_pregen as pregen
+
+    nik = make_citizen(3515000000000001)
+    doc = SimpleNamespace(path=f"{nik}/sktm/sktm_{nik}.pdf")
+    mocker.patch.object(pregen, "generate_sktm_document_once", return_value=(doc, rendered))
+    before = pregen.get_pregen_metrics()
+
+    assert pregen._pregen(app, nik) == doc.path
+
+    after = pregen.get_pregen_metrics()
+    assert {key: after[key] - before[key] for key in ("generated", "joined")} == {
+        "generated": int(outcome == "generated"), "joined": int(outcome == "joined")}
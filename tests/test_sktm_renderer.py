@@ -0,0 +1,88 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import utils.sktm_renderer as renderer
+
+
+class ThreadPool(ThreadPoolExecutor):
+    """Stands in for the process pool so the test controls how long a render runs."""
+
+    def __init__(self, max_workers, mp_context=None, initializer=None):
+        super().__init__(max_workers=max_workers)
+
+
+def slow_render(data):
+    time.sleep(data["seconds"])
+    return b"%PDF", data["seconds"] * 1000.0
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(renderer, "ProcessPoolExecutor", ThreadPool)
+    monkeypatch.setattr(renderer, "_render_in_worker", slow_render)
+    monkeypatch.setattr(renderer, "_pool", None)
+    monkeypatch.setattr(renderer, "_slots", None)
+
+    def configure(workers):
+        monkeypatch.setattr(renderer, "SKTM_RENDER_WORKERS", workers)
+    yield configure
+    if renderer._pool is not None:
+        renderer._pool.shutdown(wait=False)
+
+
+def render_concurrently(*jobs):
+    results = [None] * len(jobs)
+
+    def run(i, seconds, timeout):
+        try:
+            results[i] = renderer.render_sktm_pdf({"seconds": seconds}, timeout=timeout)
+        except Exception as e:
+            results[i] = e
+    threads = []
+    for i, (seconds, timeout) in enumerate(jobs):
+        threads.append(threading.Thread(target=run, args=(i, seconds, timeout)))
+        threads[-1].start()
+        time.sleep(0.05)  # keep submission order stable
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_timeout_does_not_count_queue_wait(pool):
+    pool(1)
+    restarts = renderer.get_render_metrics()["pool_restarts"]
+
+    # the second render waits ~0.4s for the only process, then runs 0.4s: 0.8s in total
+    results = render_concurrently((0.4, 0.6), (0.4, 0.6))
+
+    assert results == [b"%PDF", b"%PDF"]
+    assert renderer.get_render_metrics()["pool_restarts"] == restarts
+
+
+def test_stuck_render_does_not_fail_the_others(pool):
+    pool(2)
+    before = renderer.get_render_metrics()
+
+    results = render_concurrently((1.5, 0.3), (0.5, 1.0))
+
+    assert isinstance(results[0], renderer.RenderTimeout)
+    assert results[1] == b"%PDF"
+    after = renderer.get_render_metrics()
+    assert after["pool_restarts"] == before["pool_restarts"] + 1
+    assert after["timeouts"] == before["timeouts"] + 1
+    # new renders go to a fresh pool
+    assert renderer.render_sktm_pdf({"seconds": 0.01}, timeout=1.0) == b"%PDF"
+
+
+def test_layout_import_leaves_reportlab_settings_alone(monkeypatch):
+    from reportlab import rl_config
+    import templates.sktm.reportlab_layout  # noqa: F401
+
+    assert rl_config.useA85 == 1
+
+    monkeypatch.setattr(rl_config, "useA85", 1)
+    renderer._warm_worker()  # pool process initializer
+    assert rl_config.useA85 == 0
@@ -0,0 +1,87 @@
+import pytest
+
+
+@pytest.fixture
+def receipt(app):
+    from utils.upload_tickets import issue_receipt
+
+    def make(nik=7, section="ktp", field="foto_ktp", bucket="public", path="7/ktp/foto_ktp_abc.jpg"):
+        with app.app_context():
+            return issue_receipt(nik, section, field, bucket, path)
+    return make
+
+
+@pytest.mark.parametrize("overrides,accepted", [
+    ({}, True),
+    ({"nik": 8}, False),
+    ({"section": "kk"}, False),
+    ({"field": "foto_surat_pengantar_rt_rw"}, False),
+    ({"bucket": "other-bucket"}, False),
+])
+def test_receipt_is_bound_to_citizen_section_field_and_bucket(app, receipt, overrides, accepted):
+    from utils.upload_tickets import verified_upload_ref
+
+    value = receipt(**overrides)
+    with app.app_context():
+        ref = verified_upload_ref(value, 7, "ktp", "foto_ktp", "public")
+    assert ref == ("/object/sign/public/7/ktp/foto_ktp_abc.jpg" if accepted else None)
+
+
+@pytest.mark.parametrize("value", [
+    "/object/sign/public/7/ktp/foto_ktp_abc.jpg",  # a ref alone proves nothing about the object
+    "https://evil.example/7/ktp/x.jpg",
+    "not-a-receipt",
+    None,
+])
+def test_anything_but_a_receipt_is_rejected(app, value):
+    from utils.upload_tickets import verified_upload_ref
+
+    with app.app_context():
+        assert verified_upload_ref(value, 7, "ktp", "foto_ktp", "public") is None
+
+
+def test_create_ktp_accepts_only_finalize_receipts(app, client, auth_headers, receipt):
+    from extension import db
+    from models import Masyarakat
+
+    with app.app_context():
+        db.session.add(Masyarakat(nik=7, nama="Warga 7", jenis_kelamin="L"))
+        db.session.commit()
+
+    resp = client.post("/api/user/ktp", headers=auth_headers(7), json={
+        "alamat": "Candi",
+        "foto_ktp": receipt(),
+        # uploaded to a ticket's signed URL but never finalized
+        "foto_surat_pengantar_rt_rw": "/object/sign/public/7/ktp/foto_surat_abc.jpg",
+    })
+
+    assert resp.status_code == 200
+    data = resp.get_json()["data"]
+    assert data["foto_ktp"] == "/object/sign/public/7/ktp/foto_ktp_abc.jpg"
+    assert data["foto_surat_pengantar_rt_rw"] is None
+
+
+@pytest.mark.parametrize("info,status", [
+    ({"size": 1024, "content_type": "image/jpeg"}, 200),
+    ({"size": 50 * 1024 * 1024, "content_type": "image/jpeg"}, 400),
+    ({"size": 1024, "content_type": "text/html"}, 400),
+])
+def test_finalize_issues_a_receipt_only_for_a_verified_object(app, client, auth_headers, mocker, info, status):
+    import controllers.userUploadController as ctl
+    from utils.upload_tickets import issue_ticket, verified_upload_ref
+
+    mocker.patch.object(ctl, "get_object_info", return_value=info)
+    mocker.patch.object(ctl, "delete_file")
+    with app.app_context():
+        ticket = issue_ticket(7, "ktp", "foto_ktp", "public", "7/ktp/foto_ktp_abc.jpg", "image/jpeg")
+
+    resp = client.post("/api/user/uploads/finalize", headers=auth_headers(7), json={"ticket": ticket})
+
+    assert resp.status_code == status
+    if status == 200:
+        data = resp.get_json()["data"]
+        assert data["registered"] is False
+        with app.app_context():
+            assert verified_upload_ref(data["receipt"], 7, "ktp", "foto_ktp", "public") == data["value"]
+    else:
+        ctl.delete_file.assert_called_once_with("public", "7/ktp/foto_ktp_abc.jpg")
@@ -0,0 +1,180 @@
+import importlib.util
+import inspect
+import os
+import threading
+
+import pytest
+import sqlalchemy as sa
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+MYSQL_TEST_URL = os.environ.get("MYSQL_TEST_URL")
+mysql_only = pytest.mark.skipif(not MYSQL_TEST_URL, reason="set MYSQL_TEST_URL to a disposable MySQL database")
+
+
+def _migration():
+    path = os.path.join(MIGRATIONS, "versions", "9f273c1bbe40_widen_nik_and_no_kk_to_bigint.py")
+    spec = importlib.util.spec_from_file_location("widen_nik_migration", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_every_table_is_swapped_in_one_rename():
+    m = _migration()
+    tables = m._retyped_tables()
+    sql = m._rename_sql(tables)
+
+    assert len(tables) == 12 and tables["kartu_keluarga"] == [("nik", False), ("no_kk", True)]
+    assert sql.count("RENAME TABLE") == 1
+    for table in tables:
+        assert f"`{table}` TO `_{table}_old`, `_{table}_new` TO `{table}`" in sql
+
+
+def test_triggers_mirror_every_write_into_the_copy():
+    m = _migration()
+    ins, upd, delete = m._trigger_sql("ktp", ["id_ktp", "nik", "status"], "id_ktp")
+    upsert = ("INSERT INTO `_ktp_new` (`id_ktp`, `nik`, `status`) VALUES (NEW.`id_ktp`, NEW.`nik`, NEW.`status`) "
+              "ON DUPLICATE KEY UPDATE `id_ktp` = VALUES(`id_ktp`), `nik` = VALUES(`nik`), `status` = VALUES(`status`)")
+
+    assert ins.startswith("CREATE TRIGGER `_ktp_ins` AFTER INSERT ON `ktp`") and ins.endswith(upsert)
+    assert "AFTER UPDATE" in upd and upsert in upd
+    # a parent row referenced by copied children must be updated in place, never deleted first
+    assert "IF NOT (OLD.`id_ktp` <=> NEW.`id_ktp`) THEN DELETE FROM `_ktp_new`" in upd
+    assert "REPLACE" not in ins + upd + delete and "IGNORE" not in ins + upd + delete
+    assert delete.endswith("DELETE FROM `_ktp_new` WHERE `id_ktp` <=> OLD.`id_ktp`")
+
+
+def test_foreign_keys_get_a_new_name_and_keep_their_actions():
+    m = _migration()
+    fk = {"name": "detail_kendaraan_ibfk_1", "constrained_columns": ["id_aset_non_financial"],
+          "referred_columns": ["id_aset_non_financial"], "options": {"ondelete": "RESTRICT"}}
+
+    sql = m._foreign_key_sql(fk, "_aset_non_financial_new")
+
+    assert sql == ("ADD CONSTRAINT `_detail_kendaraan_ibfk_1` FOREIGN KEY (`id_aset_non_financial`) "
+                   "REFERENCES `_aset_non_financial_new` (`id_aset_non_financial`) ON DELETE RESTRICT")
+    assert m._toggled(m._toggled(fk["name"])) == fk["name"]
+
+
+def test_mysql_path_never_takes_table_locks():
+    source = inspect.getsource(_migration())
+
+    assert "LOCK TABLES" not in source
+
+
+@pytest.fixture
+def mysql_app(monkeypatch):
+    from flask import Flask
+    from flask_migrate import Migrate, upgrade
+    from extension import db
+
+    monkeypatch.setenv("NIK_MIGRATION_BATCH", "200")
+    engine = sa.create_engine(MYSQL_TEST_URL)
+    with engine.begin() as conn:
+        conn.execute(sa.text("SET foreign_key_checks = 0"))
+        for table in sa.inspect(conn).get_table_names():
+            conn.execute(sa.text(f"DROP TABLE `{table}`"))
+        for trigger in conn.execute(sa.text("SELECT TRIGGER_NAME FROM information_schema.TRIGGERS WHERE TRIGGER_SCHEMA = DATABASE()")).scalars():
+            conn.execute(sa.text(f"DROP TRIGGER `{trigger}`"))
+
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = MYSQL_TEST_URL
+    db.init_app(app)
+    Migrate(app, db, directory=MIGRATIONS)
+    with app.app_context():
+        upgrade(revision="bc1e3f043e3c")
+    with engine.begin() as conn:
+        for nik in range(1, 1001):
+            conn.execute(sa.text("INSERT INTO masyarakat (nik, nama, jenis_kelamin) VALUES (:nik, 'warga', 'L')"), {"nik": nik})
+            conn.execute(sa.text("INSERT INTO ktp (nik, status) VALUES (:nik, 'P')"), {"nik": nik})
+            conn.execute(sa.text("INSERT INTO kartu_keluarga (nik, no_kk, status) VALUES (:nik, :nik, 'P')"), {"nik": nik})
+            conn.execute(sa.text("INSERT INTO aset_non_financial (nik, status) VALUES (:nik, 'P')"), {"nik": nik})
+        conn.execute(sa.text(
+            "INSERT INTO detail_kendaraan (id_aset_non_financial, status) SELECT id_aset_non_financial, 'P' FROM aset_non_financial"
+        ))
+    yield app, engine
+    engine.dispose()
+
+
+def _writer(engine, stop, written, errors):
+    """Keep creating, approving and deleting citizens while the migration runs.
+
+    Also edits parent rows that have children (masyarakat with ktp/kartu_keluarga,
+    aset_non_financial with detail_kendaraan), which the copies' foreign keys must allow.
+    """
+    nik = 100000
+    try:
+        while not stop.is_set():
+            nik += 1
+            old = nik % 1000 + 1
+            with engine.begin() as conn:
+                conn.execute(sa.text("INSERT INTO masyarakat (nik, nama, jenis_kelamin) VALUES (:nik, 'baru', 'P')"), {"nik": nik})
+                conn.execute(sa.text("INSERT INTO ktp (nik, status) VALUES (:nik, 'P')"), {"nik": nik})
+            with engine.begin() as conn:
+                conn.execute(sa.text("UPDATE ktp SET status = 'B' WHERE nik IN (:nik, :old)"), {"nik": nik, "old": old})
+            with engine.begin() as conn:
+                conn.execute(sa.text("UPDATE masyarakat SET nama = :nama WHERE nik = :old"), {"nama": f"warga {nik}", "old": old})
+                conn.execute(sa.text("UPDATE aset_non_financial SET status = 'B' WHERE nik = :old"), {"old": old})
+            written["ktp"][nik] = "B"
+            written["ktp"][old] = "B"
+            written["nama"][old] = f"warga {nik}"
+            written["aset"][old] = "B"
+            if nik % 7 == 0:
+                with engine.begin() as conn:
+                    conn.execute(sa.text("DELETE FROM ktp WHERE nik = :nik"), {"nik": nik})
+                    conn.execute(sa.text("DELETE FROM masyarakat WHERE nik = :nik"), {"nik": nik})
+                written["ktp"][nik] = None
+    except Exception as e:
+        errors.append(e)
+
+
+@mysql_only
+def test_online_widen_keeps_writes_and_foreign_keys(mysql_app):
+    from flask_migrate import upgrade, downgrade
+
+    app, engine = mysql_app
+    stop, written, errors = threading.Event(), {"ktp": {}, "nama": {}, "aset": {}}, []
+    writer = threading.Thread(target=_writer, args=(engine, stop, written, errors))
+    writer.start()
+    try:
+        with app.app_context():
+            upgrade(revision="9f273c1bbe40")
+    finally:
+        stop.set()
+        writer.join()
+    assert errors == []
+    assert len(written["ktp"]) > 1000
+
+    with engine.connect() as conn:
+        insp = sa.inspect(conn)
+        m = _migration()
+        for table, columns in m._retyped_tables().items():
+            assert m._has_type(insp, table, columns, "BIGINT"), table
+            if table != "masyarakat":
+                assert [fk["referred_table"] for fk in insp.get_foreign_keys(table)] == ["masyarakat"], table
+        assert [fk["referred_table"] for fk in insp.get_foreign_keys("detail_kendaraan")] == ["aset_non_financial"]
+        assert not [t for t in insp.get_table_names() if t.startswith("_")]
+        assert not conn.execute(sa.text("SELECT COUNT(*) FROM information_schema.TRIGGERS WHERE TRIGGER_SCHEMA = DATABASE()")).scalar()
+
+        statuses = dict(conn.execute(sa.text("SELECT nik, status FROM ktp")).all())
+        for nik, status in written["ktp"].items():
+            assert statuses.get(nik) == status, nik
+        names = dict(conn.execute(sa.text("SELECT nik, nama FROM masyarakat")).all())
+        assert all(names[nik] == nama for nik, nama in written["nama"].items())
+        assets = dict(conn.execute(sa.text("SELECT nik, status FROM aset_non_financial")).all())
+        assert all(assets[nik] == status for nik, status in written["aset"].items())
+        assert conn.execute(sa.text("SELECT COUNT(*) FROM detail_kendaraan")).scalar() == 1000
+
+    with engine.begin() as conn:
+        conn.execute(sa.text("INSERT INTO masyarakat (nik, nama, jenis_kelamin) VALUES (3515012345678901, 'enam belas digit', 'L')"))
+        with pytest.raises(sa.exc.IntegrityError):
+            with conn.begin_nested():
+                conn.execute(sa.text("INSERT INTO ktp (nik, status) VALUES (42424242424242, 'P')"))
+        conn.execute(sa.text("DELETE FROM masyarakat WHERE nik = 3515012345678901"))
+
+    with app.app_context():
+        downgrade(revision="bc1e3f043e3c")
+    with engine.connect() as conn:
+        insp = sa.inspect(conn)
+        assert all(m._has_type(insp, t, cols, "INT") for t, cols in m._retyped_tables().items())
+        assert [fk["referred_table"] for fk in insp.get_foreign_keys("ktp")] == ["masyarakat"]
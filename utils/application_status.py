@@ -0,0 +1,221 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from sqlalchemy.orm import joinedload
+from extension import db
+from models.masyarakatModel import Masyarakat
+from models.applicationstatusModel import ApplicationStatus
+
+# Sections that must all be 'B' before a SKTM can be downloaded (order used in failure lists)
+SKTM_SECTIONS = ("ktp", "kartu_keluarga", "kondisi_rumah", "kondisi_ekonomi", "aset_non_financial")
+
+
+@dataclass
+class ApplicationSnapshot:
+    """Every SKTM section of one NIK, loaded with a single joined query."""
+    nik: int
+    masyarakat: object = None
+    ktp: object = None
+    kartu_keluarga: list = field(default_factory=list)
+    kondisi_rumah: object = None
+    kondisi_ekonomi: object = None
+    aset_non_financial: object = None
+
+    def section_status(self, section: str):
+        """Status of a section; for kartu_keluarga the first non-'B' status (or 'B' if all are)."""
+        if section == "kartu_keluarga":
+            if not self.kartu_keluarga:
+                return None
+            for kk in self.kartu_keluarga:
+                if getattr(kk, 'status', None) != 'B':
+                    return getattr(kk, 'status', None)
+            return 'B'
+        record = getattr(self, section)
+        return getattr(record, 'status', None) if record else None
+
+    def statuses(self) -> dict:
+        return {section: self.section_status(section) for section in SKTM_SECTIONS}
+
+    def failures(self) -> list:
+        """Same shape as the SKTM eligibility failures: [{'field': ..., 'status': ...}]."""
+        failures = [
+            {'field': section, 'status': status}
+            for section, status in self.statuses().items()
+            if status != 'B'
+        ]
+        if not self.masyarakat:
+            failures.append({'field': 'masyarakat', 'status': None})
+        return failures
+
+    @property
+    def ready(self) -> bool:
+        return not self.failures()
+
+
+def _snapshot_from(m) -> ApplicationSnapshot:
+    return ApplicationSnapshot(
+        nik=m.nik,
+        masyarakat=m,
+        ktp=m.ktp,
+        kartu_keluarga=list(m.kartu_keluarga or []),
+        kondisi_rumah=m.kondisi_rumah,
+        kondisi_ekonomi=m.kondisi_ekonomi,
+        aset_non_financial=m.aset_non_financial,
+    )
+
+
+def load_application_snapshot(nik: int, populate_existing: bool = False) -> ApplicationSnapshot:
+    """Load Masyarakat and all section rows for a NIK in one statement (LEFT OUTER JOINs).
+
+    populate_existing=True refreshes objects already in the session (use after bulk UPDATEs).
+    """
+    query = Masyarakat.query.options(
+        joinedload(Masyarakat.ktp),
+        joinedload(Masyarakat.kartu_keluarga),
+        joinedload(Masyarakat.kondisi_rumah),
+        joinedload(Masyarakat.kondisi_ekonomi),
+        joinedload(Masyarakat.aset_non_financial),
+    ).filter(Masyarakat.nik == nik)
+    if populate_existing:
+        query = query.populate_existing()
+    m = query.first()
+    if not m:
+        return ApplicationSnapshot(nik=nik)
+    return _snapshot_from(m)
+
+
+def compute_fill_progress(snapshot: ApplicationSnapshot) -> dict:
+    """Fill progress for SKTM based on presence of required fields.
+    Returns dict with keys: fill_progress (0..100), total, satisfied, missing (list)
+    """
+    m, ktp = snapshot.masyarakat, snapshot.ktp
+    checks = [
+        ('masyarakat.nama', bool(m and getattr(m, 'nama', None))),
+        ('ktp.tempat_lahir', bool(ktp and getattr(ktp, 'tempat_lahir', None))),
+        ('ktp.tanggal_lahir', bool(ktp and getattr(ktp, 'tanggal_lahir', None))),
+        ('ktp.alamat', bool(ktp and getattr(ktp, 'alamat', None))),
+        ('kartu_keluarga.exists', len(snapshot.kartu_keluarga) > 0),
+        ('kondisi_rumah.exists', bool(snapshot.kondisi_rumah)),
+        ('kondisi_ekonomi.exists', bool(snapshot.kondisi_ekonomi)),
+        ('aset_non_financial.exists', bool(snapshot.aset_non_financial)),
+    ]
+    total = len(checks)
+    satisfied = sum(1 for _, ok in checks if ok)
+    missing = [name for name, ok in checks if not ok]
+    fill_progress = (satisfied / total) * 100.0 if total > 0 else 0.0
+    return {
+        'fill_progress': round(fill_progress, 2),
+        'total': total,
+        'satisfied': satisfied,
+        'missing': missing,
+    }
+
+
+def _apply_snapshot(row: ApplicationStatus, snapshot: ApplicationSnapshot):
+    for section, status in snapshot.statuses().items():
+        setattr(row, f"{section}_status", status)
+    progress = compute_fill_progress(snapshot)
+    row.fill_progress = progress['fill_progress']
+    row.fill_satisfied = progress['satisfied']
+    row.fill_total = progress['total']
+    row.fill_missing = ",".join(progress['missing'])
+    row.updated_at = datetime.utcnow()
+
+
+def _lock_for_refresh(niks: list) -> tuple:
+    """Lock and load what a status refresh reads: ({nik: Masyarakat}, {nik: ApplicationStatus}).
+
+    The citizens' rows are locked FOR UPDATE first (in nik order), so concurrent refreshes of
+    a NIK run one after the other. Sections and the status row are then read with locking
+    reads, which see the latest committed rows; a plain read could return this transaction's
+    older REPEATABLE READ snapshot and write another request's section status back.
+    """
+    db.session.query(Masyarakat.nik).filter(Masyarakat.nik.in_(niks)).order_by(Masyarakat.nik).with_for_update().all()
+    people = Masyarakat.query.options(
+        joinedload(Masyarakat.ktp),
+        joinedload(Masyarakat.kartu_keluarga),
+        joinedload(Masyarakat.kondisi_rumah),
+        joinedload(Masyarakat.kondisi_ekonomi),
+        joinedload(Masyarakat.aset_non_financial),
+    ).filter(Masyarakat.nik.in_(niks)).with_for_update(read=True).populate_existing().all()
+    rows = ApplicationStatus.query.filter(ApplicationStatus.nik.in_(niks)).with_for_update().populate_existing().all()
+    return {m.nik: m for m in people}, {r.nik: r for r in rows}
+
+
+def refresh_application_status(nik: int):
+    """Recompute the application_status row of a NIK inside the caller's transaction.
+
+    Call right before db.session.commit() in every write that creates, updates or
+    deletes a section or changes its status; the caller's commit persists the row.
+    """
+    people, rows = _lock_for_refresh([nik])
+    m, row = people.get(nik), rows.get(nik)
+    if m is None:
+        if row is not None:
+            db.session.delete(row)
+        return None
+    if row is None:
+        row = ApplicationStatus(nik=nik)
+        db.session.add(row)
+    _apply_snapshot(row, _snapshot_from(m))
+    return row
+
+
+def get_application_status(nik: int):
+    """Primary-key read of the materialized status; computed and stored on first access."""
+    row = db.session.get(ApplicationStatus, nik)
+    if row is not None:
+        return row
+    row = refresh_application_status(nik)
+    if row is not None:
+        db.session.commit()
+    return row
+
+
+def status_failures(row) -> list:
+    """Eligibility failures from a materialized row (same shape as ApplicationSnapshot.failures)."""
+    if row is None:
+        return ApplicationSnapshot(nik=0).failures()
+    return [
+        {'field': section, 'status': getattr(row, f"{section}_status")}
+        for section in SKTM_SECTIONS
+        if getattr(row, f"{section}_status") != 'B'
+    ]
+
+
+def status_progress(row) -> dict:
+    if row is None:
+        return compute_fill_progress(ApplicationSnapshot(nik=0))
+    return {
+        'fill_progress': row.fill_progress,
+        'total': row.fill_total,
+        'satisfied': row.fill_satisfied,
+        'missing': [m for m in (row.fill_missing or '').split(',') if m],
+    }
+
+
+def refresh_application_statuses(niks) -> int:
+    """Set-based refresh_application_status for many NIKs: one batched locked load, no commit."""
+    niks = sorted(set(niks))
+    if not niks:
+        return 0
+    people, existing = _lock_for_refresh(niks)
+    for m in people.values():
+        row = existing.get(m.nik)
+        if row is None:
+            row = ApplicationStatus(nik=m.nik)
+            db.session.add(row)
+        _apply_snapshot(row, _snapshot_from(m))
+    return len(people)
+
+
+def rebuild_application_status(batch_size: int = 500) -> int:
+    """Backfill/repair application_status for every Masyarakat, one transaction per batch."""
+    niks = [row[0] for row in db.session.query(Masyarakat.nik).order_by(Masyarakat.nik).all()]
+    rebuilt = 0
+    for i in range(0, len(niks), batch_size):
+        rebuilt += refresh_application_statuses(niks[i:i + batch_size])
+        db.session.commit()
+    # rows for citizens that no longer exist
+    ApplicationStatus.query.filter(~ApplicationStatus.nik.in_(db.session.query(Masyarakat.nik))).delete(synchronize_session=False)
+    db.session.commit()
+    return rebuilt
@@ -1,6 +1,6 @@
 from datetime import timedelta
 from functools import wraps
-from flask import jsonify, current_app
+from flask import jsonify, current_app, g
 from flask_jwt_extended import (
   JWTManager,
   create_access_token,
@@ -66,27 +66,53 @@ def create_offline_token(identity: str, device_id: str, days_valid: int = 14):
     token = pyjwt.encode(payload, private_pem, algorithm="RS256")
     return token
 
+def _verify_request_auth(fresh=False, optional=False, refresh=False, locations=None):
+  """
+  Verifikasi JWT + cek revocation (jti & device) sekali per request.
+  Hasil disimpan di flask.g sehingga decorator berikutnya (mis. role_required
+  di atas jwt_required_custom) memakai ulang klaim tanpa verifikasi/lookup ulang.
+  Return dict context: {"claims": dict|None, "error": str|None}.
+  """
+  key = (fresh, optional, refresh, tuple(locations) if locations else None)
+  contexts = g.get("_auth_contexts")
+  if contexts is None:
+    contexts = {}
+    g._auth_contexts = contexts
+  if key in contexts:
+    return contexts[key]
+
+  ctx = {"claims": None, "error": None}
+  try:
+    verify_jwt_in_request(fresh=fresh, optional=optional, refresh=refresh, locations=locations)
+    from utils.supabase_client import check_token_revocation
+    claims = get_jwt()
+    revoked = check_token_revocation(claims.get("jti"), claims.get("device_id"))
+    if revoked:
+      ctx["error"] = revoked
+    else:
+      ctx["claims"] = claims
+  except Exception as e:
+    ctx["error"] = str(e)
+  contexts[key] = ctx
+  return ctx
+
+def get_auth_context(fresh=False, optional=False, refresh=False, locations=None):
+  """Ambil auth context request saat ini (memverifikasi jika belum)."""
+  return _verify_request_auth(fresh=fresh, optional=optional, refresh=refresh, locations=locations)
+
 def jwt_required_custom(fn=None, *, fresh=False, optional=False, refresh=False, locations=None):
   """
   Pengganti @jwt_required() yang mengembalikan JSON 401 jika token invalid.
   Bisa dipakai langsung: @jwt_required_custom
   atau dengan opsi: @jwt_required_custom(optional=True)
+  Verifikasi hanya dilakukan sekali per request (lihat _verify_request_auth).
   """
   def decorator(inner_fn):
     @wraps(inner_fn)
     def wrapper(*args, **kwargs):
-      try:
-        verify_jwt_in_request(fresh=fresh, optional=optional, refresh=refresh, locations=locations)
-        from utils.supabase_client import is_jti_revoked, is_device_revoked
-        claims = get_jwt()
-        jti = claims.get("jti")
-        device_id = claims.get("device_id")
-        if jti and is_jti_revoked(jti):
-          return jsonify({"error": "Unauthorized", "message": "token_revoked"}), 401
-        if device_id and is_device_revoked(device_id):
-          return jsonify({"error": "Unauthorized", "message": "device_revoked"}), 401
-      except Exception as e:
-        return jsonify({"error": "Unauthorized", "message": str(e)}), 401
+      ctx = _verify_request_auth(fresh=fresh, optional=optional, refresh=refresh, locations=locations)
+      if ctx["error"]:
+        return jsonify({"error": "Unauthorized", "message": ctx["error"]}), 401
       return inner_fn(*args, **kwargs)
 
     return wrapper
@@ -98,12 +124,14 @@ def role_required(*allowed_roles):
   """
   Decorator sederhana untuk cek klaim 'role' pada JWT.
   Contoh: @role_required('admin','petugas')
+  Memakai auth context request yang sama dengan jwt_required_custom, jadi
+  penumpukan kedua decorator tidak memverifikasi token dua kali.
 """
   def decorator(fn):
     @wraps(fn)
     @jwt_required_custom()
     def wrapper(*args, **kwargs):
-      claims = get_jwt()
+      claims = get_auth_context()["claims"] or {}
       role = claims.get("role")
       if role not in allowed_roles:
         return jsonify({"error": "Forbidden", "message": "insufficient role"}), 403
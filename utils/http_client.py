@@ -0,0 +1,108 @@
+import os
+import time
+import threading
+from collections import deque
+
+import httpx
+
+
+# Pool/timeout settings for outbound Supabase REST calls (per worker process)
+SUPABASE_HTTP_POOL_SIZE = int(os.environ.get("SUPABASE_HTTP_POOL_SIZE", "20"))
+SUPABASE_HTTP_KEEPALIVE = int(os.environ.get("SUPABASE_HTTP_KEEPALIVE", "10"))
+SUPABASE_HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("SUPABASE_HTTP_KEEPALIVE_EXPIRY", "30"))
+SUPABASE_HTTP_TIMEOUT = float(os.environ.get("SUPABASE_HTTP_TIMEOUT", "10"))
+SUPABASE_HTTP_CONNECT_TIMEOUT = float(os.environ.get("SUPABASE_HTTP_CONNECT_TIMEOUT", "5"))
+SUPABASE_HTTP2 = os.environ.get("SUPABASE_HTTP2", "1").lower() in ("1", "true", "yes")
+
+_LATENCY_SAMPLES = 256
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+_metrics = {}
+_metrics_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_http_client() -> httpx.Client:
+    """Return the shared keep-alive client for this worker process.
+
+    The client is re-created after a fork so pre-forking servers don't share sockets.
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+    with _client_lock:
+        if _client is None or _client_pid != pid:
+            _client = httpx.Client(
+                http2=SUPABASE_HTTP2 and _http2_available(),
+                limits=httpx.Limits(
+                    max_connections=SUPABASE_HTTP_POOL_SIZE,
+                    max_keepalive_connections=SUPABASE_HTTP_KEEPALIVE,
+                    keepalive_expiry=SUPABASE_HTTP_KEEPALIVE_EXPIRY,
+                ),
+                timeout=httpx.Timeout(SUPABASE_HTTP_TIMEOUT, connect=SUPABASE_HTTP_CONNECT_TIMEOUT),
+            )
+            _client_pid = pid
+    return _client
+
+
+def _record(metric: str, elapsed_ms: float, failed: bool):
+    with _metrics_lock:
+        m = _metrics.get(metric)
+        if m is None:
+            m = {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0, "samples": deque(maxlen=_LATENCY_SAMPLES)}
+            _metrics[metric] = m
+        m["count"] += 1
+        if failed:
+            m["errors"] += 1
+        m["total_ms"] += elapsed_ms
+        m["max_ms"] = max(m["max_ms"], elapsed_ms)
+        m["samples"].append(elapsed_ms)
+
+
+def request(method: str, url: str, metric: str | None = None, **kwargs) -> httpx.Response:
+    """Send a request through the pooled client and record its latency under `metric`."""
+    metric = metric or method.upper()
+    started = time.perf_counter()
+    failed = True
+    try:
+        resp = get_http_client().request(method, url, **kwargs)
+        failed = resp.status_code >= 400
+        return resp
+    finally:
+        _record(metric, (time.perf_counter() - started) * 1000.0, failed)
+
+
+def get(url: str, metric: str | None = None, **kwargs) -> httpx.Response:
+    return request("GET", url, metric=metric, **kwargs)
+
+
+def post(url: str, metric: str | None = None, **kwargs) -> httpx.Response:
+    return request("POST", url, metric=metric, **kwargs)
+
+
+def get_http_metrics() -> dict:
+    """Per-call latency summary (ms) for every metric label seen by this worker."""
+    result = {}
+    with _metrics_lock:
+        for name, m in _metrics.items():
+            samples = sorted(m["samples"])
+            n = len(samples)
+            result[name] = {
+                "count": m["count"],
+                "errors": m["errors"],
+                "avg_ms": round(m["total_ms"] / m["count"], 2) if m["count"] else 0.0,
+                "max_ms": round(m["max_ms"], 2),
+                "p50_ms": round(samples[n // 2], 2) if n else 0.0,
+                "p95_ms": round(samples[min(n - 1, int(n * 0.95))], 2) if n else 0.0,
+            }
+    return result
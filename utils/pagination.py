@@ -0,0 +1,98 @@
+import os
+import json
+import base64
+from dataclasses import dataclass
+
+
+ADMIN_LIST_DEFAULT_PER_PAGE = int(os.environ.get("ADMIN_LIST_DEFAULT_PER_PAGE", "100"))
+ADMIN_LIST_MAX_PER_PAGE = int(os.environ.get("ADMIN_LIST_MAX_PER_PAGE", "500"))
+
+_TRUE_VALUES = ("1", "true", "yes", "on")
+
+
+class PaginationError(Exception):
+    pass
+
+
+@dataclass
+class PageParams:
+    per_page: int
+    cursor: object = None      # last key of the previous page (decoded)
+    page: int | None = None    # legacy offset mode when the client sends ?page=
+    include_total: bool = False
+    descending: bool = False
+
+
+def encode_cursor(key, descending: bool) -> str:
+    raw = json.dumps({"k": key, "d": int(descending)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Return (key, descending) from an opaque cursor; raises PaginationError."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return data["k"], bool(data["d"])
+    except Exception:
+        raise PaginationError("cursor tidak valid")
+
+
+def parse_page_params(args, default_sort: str = "asc") -> PageParams:
+    """Read per_page, cursor, page, sort and include_total from request.args."""
+    try:
+        per_page = int(args.get("per_page", ADMIN_LIST_DEFAULT_PER_PAGE))
+        page = int(args["page"]) if args.get("page") else None
+    except (TypeError, ValueError):
+        raise PaginationError("page dan per_page harus berupa angka")
+    per_page = min(max(per_page, 1), ADMIN_LIST_MAX_PER_PAGE)
+
+    sort = (args.get("sort") or default_sort).lower()
+    if sort not in ("asc", "desc"):
+        raise PaginationError("sort harus 'asc' atau 'desc'")
+    descending = sort == "desc"
+
+    cursor = None
+    if args.get("cursor"):
+        cursor, cursor_desc = decode_cursor(args["cursor"])
+        if cursor_desc != descending:
+            raise PaginationError("cursor tidak cocok dengan sort")
+        page = None
+
+    include_total = str(args.get("include_total", "")).lower() in _TRUE_VALUES
+    if page is not None:
+        page = max(page, 1)
+        # offset clients always received a total
+        include_total = True
+    return PageParams(per_page=per_page, cursor=cursor, page=page, include_total=include_total, descending=descending)
+
+
+def paginate_query(query, key_column, params: PageParams, key_of=None):
+    """Page `query` on the unique `key_column`.
+
+    Keyset mode (default) seeks past the cursor with WHERE key > :last ORDER BY key
+    LIMIT n+1, so every page costs the same regardless of depth. ?page= keeps the
+    old OFFSET behaviour. COUNT(*) runs only when params.include_total is set.
+    Returns (rows, meta); `key_of(row)` extracts the key (defaults to the attribute
+    named like key_column).
+    """
+    key_of = key_of or (lambda row: getattr(row, key_column.key))
+    meta = {"per_page": params.per_page}
+
+    if params.include_total:
+        meta["total"] = query.order_by(None).count()
+
+    order = key_column.desc() if params.descending else key_column.asc()
+    if params.page is not None:
+        rows = query.order_by(order).limit(params.per_page + 1).offset((params.page - 1) * params.per_page).all()
+        meta["page"] = params.page
+    else:
+        if params.cursor is not None:
+            query = query.filter(key_column < params.cursor if params.descending else key_column > params.cursor)
+        rows = query.order_by(order).limit(params.per_page + 1).all()
+
+    has_more = len(rows) > params.per_page
+    rows = rows[:params.per_page]
+    meta["has_more"] = has_more
+    meta["next_cursor"] = encode_cursor(key_of(rows[-1]), params.descending) if has_more and rows else None
+    return rows, meta
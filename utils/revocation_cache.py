@@ -0,0 +1,100 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+
+
+# Staleness bound (seconds) for a cached "not revoked" answer and max entries kept per process
+REVOCATION_CACHE_TTL = float(os.environ.get("REVOCATION_CACHE_TTL", "30"))
+REVOCATION_CACHE_MAXSIZE = int(os.environ.get("REVOCATION_CACHE_MAXSIZE", "10000"))
+
+
+class RevocationCache:
+    """In-process TTL + LRU cache for negative ("not revoked") revocation lookups.
+
+    Only "not revoked" answers are stored. A revocation done in this process
+    (add_jti_block / revoke_device) invalidates the entry immediately; revocations
+    done by other workers become visible after at most `ttl` seconds.
+    """
+
+    def __init__(self, ttl: float = REVOCATION_CACHE_TTL, maxsize: int = REVOCATION_CACHE_MAXSIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        # keys revoked locally; blocks a concurrent lookup from re-marking them valid
+        self._tombstones = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.maxsize > 0
+
+    def is_known_valid(self, kind: str, key: str) -> bool:
+        """Return True when (kind, key) was recently confirmed as not revoked."""
+        if not self.enabled:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            expires_at = self._entries.get((kind, key))
+            if expires_at is None:
+                self.misses += 1
+                return False
+            if expires_at <= now:
+                del self._entries[(kind, key)]
+                self.misses += 1
+                return False
+            self._entries.move_to_end((kind, key))
+            self.hits += 1
+            return True
+
+    def mark_valid(self, kind: str, key: str):
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            tomb = self._tombstones.get((kind, key))
+            if tomb is not None:
+                if tomb > now:
+                    return
+                del self._tombstones[(kind, key)]
+            self._entries[(kind, key)] = now + self.ttl
+            self._entries.move_to_end((kind, key))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, kind: str, key: str):
+        with self._lock:
+            if self._entries.pop((kind, key), None) is not None:
+                self.invalidations += 1
+            if self.enabled:
+                self._tombstones[(kind, key)] = time.monotonic() + self.ttl
+                self._tombstones.move_to_end((kind, key))
+                while len(self._tombstones) > self.maxsize:
+                    self._tombstones.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tombstones.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+revocation_cache = RevocationCache()
@@ -0,0 +1,98 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+
+
+# Reuse a signed URL only while it has more than this many seconds of validity left
+SIGNED_URL_CACHE_MARGIN = float(os.environ.get("SIGNED_URL_CACHE_MARGIN", "120"))
+SIGNED_URL_CACHE_MAXSIZE = int(os.environ.get("SIGNED_URL_CACHE_MAXSIZE", "5000"))
+
+
+class SignedUrlCache:
+    """LRU cache of signed storage URLs keyed on (bucket, path, expiry bucket).
+
+    An entry is served while its remaining validity exceeds the safety margin
+    (capped at half of the requested expiry, so short-lived URLs are still cached)
+    and is evicted once it falls inside that margin.
+    """
+
+    def __init__(self, margin: float = SIGNED_URL_CACHE_MARGIN, maxsize: int = SIGNED_URL_CACHE_MAXSIZE):
+        self.margin = margin
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _margin_for(self, expires: int) -> float:
+        return min(self.margin, expires / 2.0)
+
+    def get(self, bucket: str, path: str, expires: int):
+        if self.maxsize <= 0:
+            return None
+        key = (bucket, path, int(expires))
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            url, evict_at = entry
+            if evict_at <= now:
+                del self._entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return url
+
+    def set(self, bucket: str, path: str, expires: int, url: str, signed_at: float | None = None):
+        if self.maxsize <= 0 or not url:
+            return
+        expires = int(expires)
+        signed_at = signed_at if signed_at is not None else time.time()
+        evict_at = signed_at + expires - self._margin_for(expires)
+        key = (bucket, path, expires)
+        with self._lock:
+            self._entries[key] = (url, evict_at)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._purge_expired(time.time())
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, bucket: str, path: str):
+        """Drop every cached expiry bucket of an object (e.g. after it was deleted)."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == bucket and k[1] == path]:
+                del self._entries[key]
+
+    def _purge_expired(self, now: float):
+        stale = [k for k, (_, evict_at) in self._entries.items() if evict_at <= now]
+        for k in stale:
+            del self._entries[k]
+        self.evictions += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "margin_seconds": self.margin,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+signed_url_cache = SignedUrlCache()
@@ -0,0 +1,107 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from flask import current_app
+from sqlalchemy.orm import joinedload
+from extension import db
+from models.masyarakatModel import Masyarakat
+from models.applicationstatusModel import ApplicationStatus
+from models.sktmdocumentModel import SktmDocument
+from utils.application_status import SKTM_SECTIONS
+from utils.sktm_documents import build_sktm_data, sktm_content_hash, generate_sktm_document_once
+
+# Render+upload threads; each render runs in the SKTM render pool, so keep this below SKTM_RENDER_MAX_PENDING
+SKTM_BATCH_WORKERS = int(os.environ.get("SKTM_BATCH_WORKERS", "8"))
+
+
+def _approved_niks(after, size: int, niks=None) -> list:
+    """Next `size` NIKs (keyset on nik) whose materialized sections are all 'B'."""
+    q = db.session.query(ApplicationStatus.nik).filter(
+        *[getattr(ApplicationStatus, f"{section}_status") == 'B' for section in SKTM_SECTIONS]
+    )
+    if niks:
+        q = q.filter(ApplicationStatus.nik.in_(niks))
+    if after is not None:
+        q = q.filter(ApplicationStatus.nik > after)
+    return [row[0] for row in q.order_by(ApplicationStatus.nik).limit(size).all()]
+
+
+def _generate(app, nik: int, data: dict, content_hash: str) -> dict:
+    """Worker thread: same single-flight path as a download, so the two never race on one letter."""
+    entry = {"nik": nik, "content_hash": content_hash}
+    with app.app_context():
+        try:
+            doc, rendered = generate_sktm_document_once(nik, data, content_hash)
+            entry.update({"bucket": doc.bucket, "path": doc.path, "status": "rendered" if rendered else "existing"})
+        except Exception as e:
+            db.session.rollback()
+            entry.update({"bucket": None, "path": None, "status": "failed", "error": str(e)})
+    return entry
+
+
+def run_sktm_batch(niks=None, limit: int | None = None, workers: int | None = None, batch_size: int = 50, on_entry=None) -> dict:
+    """Generate SKTM PDFs for every approved NIK (or only `niks`), restartable.
+
+    Approved NIKs are read from application_status in keyset pages of `batch_size`.
+    A NIK whose current content hash is already in sktm_document is reported as
+    "existing" without rendering, so re-running after a crash only does the missing
+    letters. Each page is generated by `workers` threads through
+    generate_sktm_document_once, holding the NIK's generation lock like a download
+    does. Stops after `limit` new renders.
+
+    Every NIK visited produces one manifest entry {nik, status, bucket, path,
+    content_hash[, error]} with status rendered / existing / failed; entries are
+    passed to `on_entry` as they are final and returned under "manifest".
+    """
+    workers = max(1, workers or SKTM_BATCH_WORKERS)
+    app = current_app._get_current_object()
+    stats = {"visited": 0, "rendered": 0, "existing": 0, "failed": 0}
+    manifest = []
+    remaining = False
+    started = time.time()
+
+    def emit(entry):
+        stats["visited"] += 1
+        stats[entry["status"]] += 1
+        manifest.append(entry)
+        if on_entry:
+            on_entry(entry)
+
+    after = None
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            page = _approved_niks(after, batch_size, niks)
+            if not page:
+                break
+            after = page[-1]
+
+            people = Masyarakat.query.options(joinedload(Masyarakat.ktp)).filter(Masyarakat.nik.in_(page)).all()
+            jobs = {}
+            for m in people:
+                data = build_sktm_data(m.nik, m, m.ktp)
+                jobs[sktm_content_hash(data)] = (m.nik, data)
+            done = {
+                doc.content_hash: doc for doc in
+                SktmDocument.query.filter(SktmDocument.content_hash.in_(list(jobs))).all()
+            }
+
+            pending = []
+            for content_hash, (nik, data) in sorted(jobs.items(), key=lambda item: item[1][0]):
+                doc = done.get(content_hash)
+                if doc is not None:
+                    emit({"nik": nik, "content_hash": content_hash, "bucket": doc.bucket, "path": doc.path, "status": "existing"})
+                elif limit is not None and stats["rendered"] + stats["failed"] + len(pending) >= limit:
+                    remaining = True
+                else:
+                    pending.append((nik, data, content_hash))
+
+            futures = [pool.submit(_generate, app, nik, data, content_hash) for nik, data, content_hash in pending]
+            entries = [f.result() for f in as_completed(futures)]
+            for entry in sorted(entries, key=lambda e: e["nik"]):
+                emit(entry)
+
+            if remaining:
+                break
+
+    stats["elapsed_s"] = round(time.time() - started, 2)
+    return {"summary": stats, "remaining": remaining, "manifest": manifest}
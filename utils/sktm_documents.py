@@ -0,0 +1,366 @@
+import os
+import json
+import time
+import socket
+import hashlib
+import threading
+from uuid import uuid4
+from datetime import datetime, timedelta
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from sqlalchemy import func, or_, and_, select, insert, update, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import make_transient_to_detached
+from extension import db
+from models.sktmdocumentModel import SktmDocument
+from models.sktmprunehintModel import SktmPruneHint
+from models.sktmgenerationlockModel import SktmGenerationLock
+from templates.sktm.reportlab_layout import TEMPLATE_VERSION
+from utils.sktm_renderer import render_sktm_pdf
+from utils.supabase_client import upload_file, delete_file, delete_files, object_exists
+
+# Static defaults for SKTM header (can be overridden via env)
+VILLAGE_HEAD = os.environ.get("SKTM_KEPALA_DESA", "Kepala Desa: Muhammad Muslich")
+KECAMATAN = os.environ.get("SKTM_KECAMATAN", "Kecamatan: Candi")
+KABUPATEN = os.environ.get("SKTM_KABUPATEN", "Kabupaten: Sidoarjo")
+
+# Single-flight generation: lock row lifetime (a crashed owner's lock is taken over after this),
+# how often a live owner pushes it forward, how long a caller waits for another generation,
+# and how often it re-checks
+SKTM_LOCK_TTL = int(os.environ.get("SKTM_LOCK_TTL", "90"))
+SKTM_LOCK_HEARTBEAT = float(os.environ.get("SKTM_LOCK_HEARTBEAT", str(SKTM_LOCK_TTL / 3)))
+SKTM_LOCK_WAIT = float(os.environ.get("SKTM_LOCK_WAIT", "60"))
+SKTM_LOCK_POLL = float(os.environ.get("SKTM_LOCK_POLL", "0.25"))
+
+_flights = {}  # (nik, content_hash) -> Future of id_sktm_document
+_flights_lock = threading.Lock()
+
+# Date printed on the letter; the content hash changes with it, so a cached PDF is reused within one day
+SKTM_DATE_FORMAT = '%d %B %Y'
+
+
+def get_sktm_bucket() -> str:
+    return os.environ.get("SUPABASE_STORAGE_BUCKET") or os.environ.get("SUPABASE_SKTM_BUCKET") or os.environ.get("SUPABASE_SKTm_BUCKET") or os.environ.get("SUPABASE_BUCKET") or "sktm"
+
+
+def build_sktm_data(nik: int, masyarakat, ktp) -> dict:
+    """Build the render input for render_sktm_pdf from Masyarakat/KTP rows."""
+    nama = getattr(masyarakat, 'nama', '') if masyarakat else ''
+    no_ktp = str(nik)
+    tempat_lahir = getattr(ktp, 'tempat_lahir', '') if ktp else ''
+    tanggal_lahir = ''
+    if ktp and getattr(ktp, 'tanggal_lahir', None):
+        try:
+            tanggal_lahir = ktp.tanggal_lahir.strftime('%d %B %Y')
+        except Exception:
+            tanggal_lahir = str(ktp.tanggal_lahir)
+
+    jenis_kelamin_code = getattr(masyarakat, 'jenis_kelamin', '') if masyarakat else ''
+    jenis_kelamin = 'Laki-laki' if jenis_kelamin_code == 'L' else ('Perempuan' if jenis_kelamin_code == 'P' else jenis_kelamin_code)
+    alamat = getattr(ktp, 'alamat', '') if ktp else ''
+
+    # compute realtime date for the surat: use env `SKTM_KOTA` if set, append today's date
+    kota_env = os.environ.get('SKTM_KOTA', '').strip()
+    # fallback to configured KECAMATAN env (strip the leading label if present)
+    if not kota_env:
+        kec = (KECAMATAN or '').replace('Kecamatan: ', '').strip()
+        kota_env = kec
+    today = datetime.utcnow().strftime(SKTM_DATE_FORMAT)
+    if kota_env:
+        kota_tanggal_val = f"{kota_env}, {today}"
+    else:
+        kota_tanggal_val = today
+
+    kepala_nama_val = os.environ.get('SKTM_KEPALA_NAMA', '').strip()
+
+    return {
+        'kepala_desa': VILLAGE_HEAD.replace('Kepala Desa: ', '') if VILLAGE_HEAD else '',
+        'kecamatan': KECAMATAN.replace('Kecamatan: ', '') if KECAMATAN else '',
+        'kabupaten': KABUPATEN.replace('Kabupaten: ', '') if KABUPATEN else '',
+        'nama': nama,
+        'no_ktp': no_ktp,
+        'tempat_tanggal_lahir': f"{tempat_lahir} / {tanggal_lahir}".strip(' / '),
+        'jenis_kelamin': jenis_kelamin,
+        'alamat': alamat,
+        'pernyataan_paragraf': None,
+        'kota_tanggal': kota_tanggal_val,
+        'kepala_nama': kepala_nama_val,
+    }
+
+
+def sktm_content_hash(data: dict) -> str:
+    """Hash of the render inputs plus the template version (hex sha256)."""
+    raw = json.dumps({"template": TEMPLATE_VERSION, "data": data}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def find_sktm_document(content_hash: str):
+    return SktmDocument.query.filter_by(content_hash=content_hash).first()
+
+
+def forget_sktm_document(doc: SktmDocument) -> bool:
+    """Drop a metadata row whose object is gone from storage. True if the row was deleted.
+
+    The row is only deleted when storage confirms the object is missing (404); a failed
+    signing or storage outage keeps it, so the object never becomes an untracked orphan.
+    """
+    if object_exists(doc.bucket, doc.path) is not False:
+        return False
+    try:
+        db.session.delete(doc)
+        db.session.commit()
+        return True
+    except Exception:
+        db.session.rollback()
+        return False
+
+
+def sktm_document_path(nik: int, content_hash: str) -> str:
+    """Storage path of a letter: one object per NIK and content, so re-rendering it overwrites."""
+    return f"{nik}/sktm/sktm_{nik}_{content_hash[:16]}.pdf"
+
+
+def create_sktm_document(nik: int, data: dict, content_hash: str) -> SktmDocument:
+    """Render (in the render pool), upload and record a SKTM PDF. Raises on render/upload failure."""
+    t0 = time.time()
+    file_bytes = render_sktm_pdf(data)
+    t1 = time.time()
+    print(f"[TIMING] pdf_generate={(t1-t0):.2f}s")
+
+    bucket = get_sktm_bucket()
+    path = sktm_document_path(nik, content_hash)
+
+    t0 = time.time()
+    # upsert: a retry after a crash between upload and commit overwrites the same object
+    url_after_upload = upload_file(bucket, path, file_bytes, content_type="application/pdf", upsert=True)
+    t1 = time.time()
+    print(f"[TIMING] upload={(t1-t0):.2f}s")
+    if not url_after_upload:
+        raise RuntimeError("Gagal mendapatkan URL setelah upload")
+
+    doc = SktmDocument(nik=nik, content_hash=content_hash, bucket=bucket, path=path, created_at=datetime.utcnow())
+    try:
+        db.session.add(doc)
+        db.session.commit()
+    except IntegrityError:
+        # the same content was stored concurrently: keep that one, drop our copy unless it is the same object
+        db.session.rollback()
+        existing = find_sktm_document(content_hash)
+        if existing is None:
+            raise
+        if (existing.bucket, existing.path) != (bucket, path):
+            delete_file(bucket, path)
+        return existing
+    return doc
+
+
+class SktmGenerationBusy(RuntimeError):
+    """Another worker held the NIK's generation lock for longer than SKTM_LOCK_WAIT."""
+
+
+# Lock rows are written on their own connections, each statement in its own short transaction, never
+# through db.session: acquiring or renewing a lock must not commit the caller's pending work
+_locks = SktmGenerationLock.__table__
+_documents = SktmDocument.__table__
+
+
+def _acquire_generation_lock(nik: int, content_hash: str, owner: str) -> bool:
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=SKTM_LOCK_TTL)
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(insert(_locks).values(nik=nik, content_hash=content_hash, owner=owner, acquired_at=now, expires_at=expires_at))
+        return True
+    except IntegrityError:
+        pass
+    # the holder crashed or hung: take its expired lock over (only one UPDATE can match)
+    with db.engine.begin() as conn:
+        taken = conn.execute(update(_locks).where(_locks.c.nik == nik, _locks.c.expires_at < now).values(
+            content_hash=content_hash, owner=owner, acquired_at=now, expires_at=expires_at)).rowcount
+    return taken == 1
+
+
+def _renew_generation_lock(engine, nik: int, owner: str, stop: threading.Event):
+    """Heartbeat: keep pushing the lock's expiry forward while its owner is still rendering/uploading."""
+    while not stop.wait(SKTM_LOCK_HEARTBEAT):
+        try:
+            with engine.begin() as conn:
+                renewed = conn.execute(update(_locks).where(_locks.c.nik == nik, _locks.c.owner == owner).values(
+                    expires_at=datetime.utcnow() + timedelta(seconds=SKTM_LOCK_TTL))).rowcount
+            if not renewed:
+                print(f"[DEBUG sktm] lock for nik={nik} was taken over, stop renewing")
+                return
+        except Exception as e:
+            print(f"[DEBUG sktm] renew lock failed for nik={nik}: {e} (retrying)")
+
+
+def _release_generation_lock(nik: int, owner: str):
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(delete(_locks).where(_locks.c.nik == nik, _locks.c.owner == owner))
+    except Exception as e:
+        print(f"[DEBUG sktm] release lock failed for nik={nik}: {e} (expires by itself)")
+
+
+def _find_committed_document(content_hash: str):
+    """find_sktm_document on a fresh connection: sees another worker's commit even while the caller's
+    session still holds an older read snapshot, without committing that session."""
+    with db.engine.connect() as conn:
+        row = conn.execute(select(_documents).where(_documents.c.content_hash == content_hash)).first()
+    if row is None:
+        return None
+    doc = SktmDocument(**row._mapping)
+    make_transient_to_detached(doc)
+    return db.session.merge(doc, load=False)
+
+
+def _generate_locked(nik: int, data: dict, content_hash: str) -> tuple:
+    """Cross-worker part: hold the NIK's lock row while rendering, or wait for the holder's result.
+
+    Returns (document, rendered).
+    """
+    owner = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:12]}"
+    deadline = time.monotonic() + SKTM_LOCK_WAIT
+    while not _acquire_generation_lock(nik, content_hash, owner):
+        doc = _find_committed_document(content_hash)
+        if doc is not None:
+            return doc, False
+        if time.monotonic() >= deadline:
+            raise SktmGenerationBusy(f"SKTM nik {nik} sedang dibuat oleh proses lain")
+        time.sleep(SKTM_LOCK_POLL)
+    stop = threading.Event()
+    heartbeat = threading.Thread(target=_renew_generation_lock, args=(db.engine, nik, owner, stop),
+                                 name=f"sktm-lock-{nik}", daemon=True)
+    heartbeat.start()
+    try:
+        doc = _find_committed_document(content_hash)
+        if doc is not None:
+            return doc, False
+        doc = create_sktm_document(nik, data, content_hash)
+        # Old files (beyond SUPABASE_SKTm_KEEP) are removed by the retention worker: `flask sktm prune`
+        enqueue_sktm_prune(nik)
+        return doc, True
+    finally:
+        stop.set()
+        heartbeat.join()
+        _release_generation_lock(nik, owner)
+
+
+def generate_sktm_document_once(nik: int, data: dict, content_hash: str) -> tuple:
+    """Single-flight create_sktm_document: concurrent callers for the same content share one render.
+
+    Callers in this process wait on the first caller's result; callers in other workers
+    serialize on the sktm_generation_lock row and pick up the stored document.
+    Returns (document, rendered): rendered is False when this call only picked up a
+    document stored by another caller.
+    """
+    key = (nik, content_hash)
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = Future()
+            _flights[key] = flight
+
+    if not leader:
+        try:
+            flight.result(timeout=SKTM_LOCK_WAIT)
+        except FutureTimeoutError:
+            raise SktmGenerationBusy(f"SKTM nik {nik} masih dibuat")
+        doc = _find_committed_document(content_hash)
+        if doc is None:
+            raise RuntimeError(f"SKTM nik {nik} tidak ditemukan setelah dibuat")
+        return doc, False
+
+    try:
+        doc, rendered = _generate_locked(nik, data, content_hash)
+        flight.set_result(doc.id_sktm_document)
+        return doc, rendered
+    except BaseException as e:
+        flight.set_exception(e)
+        raise
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+
+
+def get_sktm_keep() -> int:
+    return int(os.environ.get("SUPABASE_SKTm_KEEP", "3"))
+
+
+def enqueue_sktm_prune(nik: int):
+    """Record a "prune nik X" hint for the retention worker (cheap, no storage calls)."""
+    try:
+        db.session.merge(SktmPruneHint(nik=nik, requested_at=datetime.utcnow()))
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"[DEBUG sktm] enqueue prune hint failed for nik={nik}: {e}")
+
+
+def run_sktm_retention(keep: int | None = None, all_niks: bool = False, nik_batch: int = 200, remove_batch: int = 100) -> dict:
+    """Apply the keep-latest-N policy to hinted NIKs (or every NIK when all_niks=True).
+
+    Works through NIKs in batches: one query loads their documents, old objects are
+    removed with batched storage.remove([...]) calls, and their rows plus the hints
+    are deleted in one transaction per batch.
+    """
+    keep = get_sktm_keep() if keep is None else keep
+    stats = {"niks": 0, "files_removed": 0, "files_failed": 0}
+
+    if all_niks:
+        niks = [
+            row[0] for row in db.session.query(SktmDocument.nik)
+            .group_by(SktmDocument.nik)
+            .having(func.count(SktmDocument.id_sktm_document) > keep)
+            .order_by(SktmDocument.nik)
+            .all()
+        ]
+    else:
+        hints = dict(db.session.query(SktmPruneHint.nik, SktmPruneHint.requested_at).order_by(SktmPruneHint.requested_at).all())
+        niks = list(hints)
+
+    for i in range(0, len(niks), nik_batch):
+        batch_niks = niks[i:i + nik_batch]
+        if all_niks:
+            hints = dict(db.session.query(SktmPruneHint.nik, SktmPruneHint.requested_at).filter(SktmPruneHint.nik.in_(batch_niks)).all())
+        docs = (
+            SktmDocument.query.filter(SktmDocument.nik.in_(batch_niks))
+            .order_by(SktmDocument.nik, SktmDocument.created_at.desc(), SktmDocument.id_sktm_document.desc())
+            .all()
+        )
+        seen = {}
+        excess = {}
+        for doc in docs:
+            seen[doc.nik] = seen.get(doc.nik, 0) + 1
+            if seen[doc.nik] > keep:
+                excess.setdefault(doc.bucket, []).append(doc)
+
+        removed_ids = []
+        failed_niks = set()
+        for bucket, bucket_docs in excess.items():
+            removed = set(delete_files(bucket, [d.path for d in bucket_docs], batch_size=remove_batch))
+            for d in bucket_docs:
+                if d.path in removed:
+                    removed_ids.append(d.id_sktm_document)
+                else:
+                    failed_niks.add(d.nik)
+                    stats["files_failed"] += 1
+
+        try:
+            if removed_ids:
+                SktmDocument.query.filter(SktmDocument.id_sktm_document.in_(removed_ids)).delete(synchronize_session=False)
+            # keep the hint of NIKs with failed deletions so the next run retries them, and a hint
+            # re-requested after we read it (a newer document we have not looked at)
+            done = [(n, hints[n]) for n in batch_niks if n not in failed_niks and n in hints]
+            if done:
+                SktmPruneHint.query.filter(or_(*[
+                    and_(SktmPruneHint.nik == n, SktmPruneHint.requested_at <= requested_at) for n, requested_at in done
+                ])).delete(synchronize_session=False)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        stats["niks"] += len(batch_niks)
+        stats["files_removed"] += len(removed_ids)
+    return stats
@@ -0,0 +1,119 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import current_app
+from extension import db
+from models.applicationstatusModel import ApplicationStatus
+from utils.application_status import SKTM_SECTIONS, load_application_snapshot
+from utils.sktm_documents import build_sktm_data, sktm_content_hash, find_sktm_document, generate_sktm_document_once
+
+# Background SKTM generation once a NIK's last section is approved (per worker process)
+SKTM_PREGEN_ENABLED = os.environ.get("SKTM_PREGEN", "1").lower() in ("1", "true", "yes")
+SKTM_PREGEN_WORKERS = int(os.environ.get("SKTM_PREGEN_WORKERS", "2"))
+# how long a download waits for a pre-generation already running in this worker before rendering inline
+SKTM_PREGEN_WAIT = float(os.environ.get("SKTM_PREGEN_WAIT", "10"))
+
+_executor = None
+_executor_pid = None
+_lock = threading.Lock()
+_inflight = {}  # nik -> Future
+_metrics = {"scheduled": 0, "generated": 0, "joined": 0, "skipped": 0, "failed": 0}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Return this worker's pre-generation executor, re-created after a fork."""
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is not None and _executor_pid == pid:
+        return _executor
+    with _lock:
+        if _executor is None or _executor_pid != pid:
+            _executor = ThreadPoolExecutor(max_workers=SKTM_PREGEN_WORKERS, thread_name_prefix="sktm-pregen")
+            _executor_pid = pid
+            _inflight.clear()
+    return _executor
+
+
+def _count(outcome: str):
+    with _lock:
+        _metrics[outcome] += 1
+
+
+def _pregen(app, nik: int):
+    with app.app_context():
+        try:
+            snapshot = load_application_snapshot(nik)
+            if snapshot.failures():
+                _count("skipped")
+                return None
+            data = build_sktm_data(nik, snapshot.masyarakat, snapshot.ktp)
+            content_hash = sktm_content_hash(data)
+            if find_sktm_document(content_hash) is not None:
+                _count("skipped")
+                return None
+            doc, rendered = generate_sktm_document_once(nik, data, content_hash)
+            # joined: a download (or another worker) rendered it while we waited on its flight
+            _count("generated" if rendered else "joined")
+            return doc.path
+        except Exception as e:
+            db.session.rollback()
+            _count("failed")
+            print(f"[DEBUG sktm.pregen] nik={nik} failed: {e}")
+            return None
+
+
+def _forget(nik: int, future):
+    with _lock:
+        if _inflight.get(nik) is future:
+            del _inflight[nik]
+
+
+def schedule_sktm_pregen(niks) -> int:
+    """Call after an admin status commit: queue SKTM generation for NIKs whose sections are now all 'B'.
+
+    Never raises; the admin response must not depend on it.
+    """
+    if not SKTM_PREGEN_ENABLED or SKTM_PREGEN_WORKERS <= 0:
+        return 0
+    try:
+        niks = list(set(niks))
+        if not niks:
+            return 0
+        ready = [row[0] for row in db.session.query(ApplicationStatus.nik).filter(
+            ApplicationStatus.nik.in_(niks),
+            *[getattr(ApplicationStatus, f"{section}_status") == 'B' for section in SKTM_SECTIONS],
+        ).all()]
+        app = current_app._get_current_object()
+        executor = _get_executor()
+        scheduled = 0
+        for nik in ready:
+            with _lock:
+                if nik in _inflight:
+                    continue
+                future = executor.submit(_pregen, app, nik)
+                _inflight[nik] = future
+                _metrics["scheduled"] += 1
+            future.add_done_callback(lambda f, nik=nik: _forget(nik, f))
+            scheduled += 1
+        return scheduled
+    except Exception as e:
+        print(f"[DEBUG sktm.pregen] schedule failed for niks={niks}: {e}")
+        return 0
+
+
+def wait_for_sktm_pregen(nik: int, timeout: float | None = None) -> bool:
+    """Wait for this worker's in-flight pre-generation of `nik`, if any. True when one finished."""
+    with _lock:
+        future = _inflight.get(nik)
+    if future is None:
+        return False
+    try:
+        future.result(timeout=SKTM_PREGEN_WAIT if timeout is None else timeout)
+        return True
+    except FutureTimeoutError:
+        return False
+
+
+def get_pregen_metrics() -> dict:
+    with _lock:
+        return {**_metrics, "in_flight": len(_inflight), "workers": SKTM_PREGEN_WORKERS, "enabled": SKTM_PREGEN_ENABLED}
@@ -0,0 +1,220 @@
+import os
+import time
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError, wait as wait_futures
+from concurrent.futures.process import BrokenProcessPool
+
+
+# Process pool that renders SKTM PDFs outside the WSGI worker (per worker process).
+# SKTM_RENDER_WORKERS=0 renders inline, e.g. for local debugging (with ReportLab's default ASCII85 streams).
+SKTM_RENDER_WORKERS = int(os.environ.get("SKTM_RENDER_WORKERS", str(min(2, os.cpu_count() or 1))))
+SKTM_RENDER_MAX_PENDING = int(os.environ.get("SKTM_RENDER_MAX_PENDING", "32"))
+SKTM_RENDER_TIMEOUT = float(os.environ.get("SKTM_RENDER_TIMEOUT", "30"))
+# how long a render may wait for a free pool process before the request is turned away as busy
+SKTM_RENDER_QUEUE_WAIT = float(os.environ.get("SKTM_RENDER_QUEUE_WAIT", "30"))
+SKTM_RENDER_START_METHOD = os.environ.get("SKTM_RENDER_START_METHOD", "spawn")
+
+_LATENCY_SAMPLES = 256
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+# one slot per pool process: a render is only submitted when a process is free, so it starts
+# running right away and SKTM_RENDER_TIMEOUT measures the render, not the queue
+_slots = None
+_slots_pid = None
+_inflight = {}  # pool -> futures submitted to it and not finished yet
+_pending = 0
+_metrics = {"rendered": 0, "errors": 0, "timeouts": 0, "rejected": 0, "pool_restarts": 0, "max_pending": 0,
+            "render_ms": deque(maxlen=_LATENCY_SAMPLES), "wait_ms": deque(maxlen=_LATENCY_SAMPLES)}
+_metrics_lock = threading.Lock()
+
+
+class RenderQueueFull(RuntimeError):
+    """More than SKTM_RENDER_MAX_PENDING renders are already waiting in this worker, or no pool
+    process became free within SKTM_RENDER_QUEUE_WAIT seconds."""
+
+
+class RenderTimeout(RuntimeError):
+    """A render did not finish within SKTM_RENDER_TIMEOUT seconds."""
+
+
+def _warm_worker():
+    # pay for the ReportLab imports and font setup once per pool process, not on the first letter
+    from templates.sktm.reportlab_layout import configure_render_process, generate_sktm_pdf_bytes
+    configure_render_process()
+    generate_sktm_pdf_bytes({})
+
+
+def _render_in_worker(data: dict):
+    from templates.sktm.reportlab_layout import generate_sktm_pdf_bytes
+    t0 = time.perf_counter()
+    pdf = generate_sktm_pdf_bytes(data)
+    return pdf, (time.perf_counter() - t0) * 1000.0
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Return this worker's render pool, re-created after a fork."""
+    global _pool, _pool_pid, _slots, _slots_pid
+    pid = os.getpid()
+    if _pool is not None and _pool_pid == pid:
+        return _pool
+    with _pool_lock:
+        if _slots is None or _slots_pid != pid:
+            _slots = threading.BoundedSemaphore(SKTM_RENDER_WORKERS)
+            _slots_pid = pid
+            _inflight.clear()
+        if _pool is None or _pool_pid != pid:
+            _pool = ProcessPoolExecutor(
+                max_workers=SKTM_RENDER_WORKERS,
+                mp_context=multiprocessing.get_context(SKTM_RENDER_START_METHOD),
+                initializer=_warm_worker,
+            )
+            _pool_pid = pid
+    return _pool
+
+
+def _submit(pool: ProcessPoolExecutor, data: dict):
+    future = pool.submit(_render_in_worker, data)
+    with _pool_lock:
+        _inflight.setdefault(pool, set()).add(future)
+
+    def done(f):
+        with _pool_lock:
+            _inflight.get(pool, set()).discard(f)
+    future.add_done_callback(done)
+    return future
+
+
+def _stop_pool(pool: ProcessPoolExecutor, grace: float):
+    """Let the pool's other renders finish (up to `grace` seconds), then stop its processes."""
+    with _pool_lock:
+        others = list(_inflight.get(pool, ()))
+    wait_futures(others, timeout=grace)
+    # a hung render cannot be cancelled, so stop its processes
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        try:
+            process.terminate()
+        except Exception:
+            pass
+    pool.shutdown(wait=False)
+    with _pool_lock:
+        _inflight.pop(pool, None)
+
+
+def _retire_pool(pool: ProcessPoolExecutor, grace: float = 0.0):
+    """Send new renders to a fresh pool and stop this one in the background.
+
+    A stuck render (timeout) keeps its process busy; renders already running on the pool's
+    other processes get `grace` seconds to finish instead of failing with it.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not pool:
+            return  # already retired by another thread
+        _pool = None
+    with _metrics_lock:
+        _metrics["pool_restarts"] += 1
+    threading.Thread(target=_stop_pool, args=(pool, grace), name="sktm-render-retire", daemon=True).start()
+
+
+def start_render_pool():
+    """Start the pool and its warm-up now instead of on the first download (optional)."""
+    if SKTM_RENDER_WORKERS > 0:
+        _get_pool()
+
+
+def render_sktm_pdf(data: dict, timeout: float | None = None) -> bytes:
+    """Render SKTM PDF bytes in the process pool.
+
+    The calling thread only waits on the future, so other requests in this worker keep
+    running while ReportLab works. A render is submitted once a pool process is free, so
+    `timeout` counts from when it starts running. Raises RenderQueueFull when too many
+    renders are pending (or none gets a process within SKTM_RENDER_QUEUE_WAIT) and
+    RenderTimeout when one runs longer than `timeout` seconds.
+    """
+    global _pending
+    if SKTM_RENDER_WORKERS <= 0:
+        pdf, elapsed_ms = _render_in_worker(data)
+        _record(elapsed_ms, 0.0, "rendered")
+        return pdf
+
+    with _metrics_lock:
+        if _pending >= SKTM_RENDER_MAX_PENDING:
+            _metrics["rejected"] += 1
+            raise RenderQueueFull(f"antrian render penuh ({_pending} menunggu)")
+        _pending += 1
+        _metrics["max_pending"] = max(_metrics["max_pending"], _pending)
+
+    timeout = SKTM_RENDER_TIMEOUT if timeout is None else timeout
+    started = time.perf_counter()
+    try:
+        pool = _get_pool()
+        if not _slots.acquire(timeout=SKTM_RENDER_QUEUE_WAIT):
+            _record(0.0, 0.0, "rejected")
+            raise RenderQueueFull(f"tidak ada proses render yang bebas dalam {SKTM_RENDER_QUEUE_WAIT:.0f} detik")
+        slots = _slots
+        try:
+            pool = _get_pool()
+            future = _submit(pool, data)
+            pdf, render_ms = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # this render is stuck on a pool process: route new work elsewhere, spare the others
+            _retire_pool(pool, grace=timeout)
+            _record(0.0, 0.0, "timeouts")
+            raise RenderTimeout(f"render SKTM melebihi {timeout:.0f} detik")
+        except BrokenProcessPool:
+            _retire_pool(pool)
+            _record(0.0, 0.0, "errors")
+            raise
+        except Exception:
+            _record(0.0, 0.0, "errors")
+            raise
+        finally:
+            slots.release()
+    finally:
+        with _metrics_lock:
+            _pending -= 1
+
+    total_ms = (time.perf_counter() - started) * 1000.0
+    _record(render_ms, max(0.0, total_ms - render_ms), "rendered")
+    return pdf
+
+
+def _record(render_ms: float, wait_ms: float, outcome: str):
+    with _metrics_lock:
+        _metrics[outcome] += 1
+        if outcome == "rendered":
+            _metrics["render_ms"].append(render_ms)
+            _metrics["wait_ms"].append(wait_ms)
+
+
+def _summary(samples) -> dict:
+    samples = sorted(samples)
+    n = len(samples)
+    return {
+        "avg_ms": round(sum(samples) / n, 2) if n else 0.0,
+        "p50_ms": round(samples[n // 2], 2) if n else 0.0,
+        "p95_ms": round(samples[min(n - 1, int(n * 0.95))], 2) if n else 0.0,
+    }
+
+
+def get_render_metrics() -> dict:
+    """Queue depth and render/wait latency (ms) of this worker's render pool."""
+    with _metrics_lock:
+        pending = _pending
+        data = {key: _metrics[key] for key in ("rendered", "errors", "timeouts", "rejected", "pool_restarts", "max_pending")}
+        render_ms, wait_ms = list(_metrics["render_ms"]), list(_metrics["wait_ms"])
+    workers = max(SKTM_RENDER_WORKERS, 0)
+    data.update({
+        "workers": workers,
+        "max_queue": SKTM_RENDER_MAX_PENDING,
+        "pending": pending,
+        # renders beyond the number of pool processes are waiting for a free one
+        "queue_depth": max(0, pending - workers),
+        "render": _summary(render_ms),
+        "wait": _summary(wait_ms),
+    })
+    return data
@@ -1,11 +1,15 @@
 import os
-import requests
+import httpx
 from urllib.parse import quote
 from uuid import uuid4
 import time
+import threading
 from supabase import create_client
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
+from utils.revocation_cache import revocation_cache
+from utils import http_client
+from utils.signed_url_cache import signed_url_cache
 
 load_dotenv()
 
@@ -17,6 +21,10 @@ DEVICE_EXPIRES_DAYS = int(os.environ.get("DEVICE_EXPIRES_DAYS", "14"))
 TOKEN_BLOCKLIST_EXPIRES_DAYS = int(os.environ.get("TOKEN_BLOCKLIST_EXPIRES_DAYS", "30"))
 
 _client = None
+# check_token_revocation outcomes: a rising "fallback" means the RPC is missing or failing and each
+# check costs two table lookups again
+_revocation_rpc_lock = threading.Lock()
+_revocation_rpc_metrics = {"rpc": 0, "fallback": 0}
 if SUPABASE_URL and SUPABASE_KEY:
     _client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
@@ -60,8 +68,13 @@ def get_device_by_id(device_id: str):
 
 
 def is_device_revoked(device_id: str) -> bool:
+    if revocation_cache.is_known_valid("device", device_id):
+        return False
     record = get_device_by_id(device_id)
-    return bool(record and record.get("revoked"))
+    revoked = bool(record and record.get("revoked"))
+    if not revoked:
+        revocation_cache.mark_valid("device", device_id)
+    return revoked
 
 
 def add_jti_block(jti: str, token_type: str, identity: str | None = None, reason: str | None = None):
@@ -77,23 +90,98 @@ def add_jti_block(jti: str, token_type: str, identity: str | None = None, reason
         data["identity"] = identity
     if reason:
         data["reason"] = reason
+    revocation_cache.invalidate("jti", jti)
     res = client.table("token_blocklist").insert(data).execute()
     return res.data
 
 
 def is_jti_revoked(jti: str) -> bool:
+    if revocation_cache.is_known_valid("jti", jti):
+        return False
     client = _ensure_client()
     res = client.table("token_blocklist").select("id").eq("jti", jti).limit(1).execute()
-    return bool(res.data)
+    revoked = bool(res.data)
+    if not revoked:
+        revocation_cache.mark_valid("jti", jti)
+    return revoked
 
 
 def revoke_device(device_id: str):
     client = _ensure_client()
+    revocation_cache.invalidate("device", device_id)
     res = client.table("device").update({"revoked": True}).eq("device_id", device_id).execute()
     return res.data
 
 
-def upload_file(bucket: str, path: str, file_bytes: bytes, content_type: str | None = None):
+def _rpc_row(res) -> dict | None:
+    data = getattr(res, "data", res)
+    if isinstance(data, list):
+        return data[0] if data else None
+    return data if isinstance(data, dict) else None
+
+
+def check_token_revocation(jti: str | None, device_id: str | None) -> str | None:
+    """Check jti and device revocation in one round-trip.
+
+    Returns "token_revoked", "device_revoked" or None when the pair is still valid.
+    Uses the `check_token_revocation` Postgres function over PostgREST RPC
+    (see supabase/migrations); falls back to the two table lookups if the RPC fails.
+    """
+    need_jti = bool(jti) and not revocation_cache.is_known_valid("jti", jti)
+    need_device = bool(device_id) and not revocation_cache.is_known_valid("device", device_id)
+    if not need_jti and not need_device:
+        return None
+
+    client = _ensure_client()
+    try:
+        params = {"p_jti": jti if need_jti else None, "p_device_id": device_id if need_device else None}
+        row = _rpc_row(client.rpc("check_token_revocation", params).execute())
+        if row is None:
+            raise RuntimeError("empty rpc response")
+        jti_revoked = bool(row.get("jti_revoked"))
+        device_revoked = bool(row.get("device_revoked"))
+        _count_revocation_rpc("rpc")
+    except Exception as e:
+        _count_revocation_rpc("fallback")
+        print(f"[DEBUG supabase] check_token_revocation rpc failed, falling back to table lookups: {e}")
+        if need_jti and is_jti_revoked(jti):
+            return "token_revoked"
+        if need_device and is_device_revoked(device_id):
+            return "device_revoked"
+        return None
+
+    if need_jti and not jti_revoked:
+        revocation_cache.mark_valid("jti", jti)
+    if need_device and not device_revoked:
+        revocation_cache.mark_valid("device", device_id)
+    if jti_revoked:
+        return "token_revoked"
+    if device_revoked:
+        return "device_revoked"
+    return None
+
+
+def get_revocation_cache_stats() -> dict:
+    """Hit/miss counters of the in-process revocation cache (for tuning TTL/size)."""
+    return revocation_cache.stats()
+
+
+def _count_revocation_rpc(outcome: str):
+    with _revocation_rpc_lock:
+        _revocation_rpc_metrics[outcome] += 1
+
+
+def get_revocation_rpc_stats() -> dict:
+    """How many revocation checks were answered by the RPC vs. the table-lookup fallback."""
+    with _revocation_rpc_lock:
+        return dict(_revocation_rpc_metrics)
+
+
+def get_signed_url_cache_stats() -> dict:
+    return signed_url_cache.stats()
+
+
+def upload_file(bucket: str, path: str, file_bytes: bytes, content_type: str | None = None, upsert: bool = False):
     """Upload bytes to Supabase Storage and return public URL or signed URL.
 
     Args:
@@ -101,6 +189,8 @@ def upload_file(bucket: str, path: str, file_bytes: bytes, content_type: str | N
         path: destination path in bucket
         file_bytes: file content as bytes
         content_type: optional MIME type
+        upsert: overwrite an existing object at `path`; without it an existing object
+            makes the upload fall back to a unique name next to `path`
 
     Returns:
         public URL string or signed URL, or None on failure
@@ -109,7 +199,12 @@ def upload_file(bucket: str, path: str, file_bytes: bytes, content_type: str | N
     storage = client.storage.from_(bucket)
 
     # try upload with content-type option first, fallback if needed
-    file_options = {"content-type": content_type} if content_type else None
+    def _file_options(with_content_type):
+        # storage3 pops keys from the dict it is given, so build a fresh one per attempt
+        opts = {"content-type": content_type} if content_type and with_content_type else {}
+        if upsert:
+            opts["upsert"] = "true"
+        return opts or None
 
     def _do_upload(pth, opts):
         if opts:
@@ -118,15 +213,15 @@ def upload_file(bucket: str, path: str, file_bytes: bytes, content_type: str | N
 
     try:
         try:
-            res = _do_upload(path, file_options)
+            res = _do_upload(path, _file_options(True))
         except Exception as e:
             # if upload with options failed, retry without options
             try:
-                res = _do_upload(path, None)
+                res = _do_upload(path, _file_options(False))
             except Exception as e2:
                 # if duplicate or other error, try a unique filename
                 err_text = str(e2)
-                if 'already exists' in err_text or 'Duplicate' in err_text or '409' in err_text:
+                if not upsert and ('already exists' in err_text or 'Duplicate' in err_text or '409' in err_text):
                     # append uuid to filename and retry
                     base, dot, ext = path.rpartition('.')
                     suffix = f"_{int(time.time())}_{uuid4().hex}"
@@ -140,7 +235,7 @@ def upload_file(bucket: str, path: str, file_bytes: bytes, content_type: str | N
                         try:
                             url = SUPABASE_URL.rstrip('/') + '/storage/v1/bucket'
                             headers = {"Authorization": f"Bearer {SUPABASE_KEY}", "apikey": SUPABASE_KEY}
-                            r = requests.get(url, headers=headers, timeout=10)
+                            r = http_client.get(url, metric="storage.list_buckets", headers=headers)
                             buckets_info = r.json() if r.status_code == 200 else f"HTTP {r.status_code}"
                         except Exception:
                             buckets_info = "failed to list buckets"
@@ -154,7 +249,7 @@ def upload_file(bucket: str, path: str, file_bytes: bytes, content_type: str | N
                     try:
                         url = SUPABASE_URL.rstrip('/') + '/storage/v1/bucket'
                         headers = {"Authorization": f"Bearer {SUPABASE_KEY}", "apikey": SUPABASE_KEY}
-                        r = requests.get(url, headers=headers, timeout=10)
+                        r = http_client.get(url, metric="storage.list_buckets", headers=headers)
                         buckets_info = r.json() if r.status_code == 200 else f"HTTP {r.status_code}"
                     except Exception:
                         buckets_info = "failed to list buckets"
@@ -211,7 +306,7 @@ def upload_file(bucket: str, path: str, file_bytes: bytes, content_type: str | N
                 "Content-Type": "application/json",
             }
             payload = {"expiresIn": 60 * 60}
-            r = requests.post(sign_url, headers=headers, json=payload, timeout=10)
+            r = http_client.post(sign_url, metric="storage.sign", headers=headers, json=payload)
             try:
                 r.raise_for_status()
             except Exception as rexc:
@@ -249,12 +344,34 @@ def delete_file(bucket: str, path: str) -> bool:
     storage = client.storage.from_(bucket)
     try:
         res = storage.remove([path])    
+        signed_url_cache.invalidate(bucket, path)
         return True
     except Exception as e:
         print(f"[DEBUG supabase] delete_file failed for bucket={bucket} path={path}: {e}")
         return False
 
 
+def delete_files(bucket: str, paths: list, batch_size: int = 100) -> list:
+    """Delete many objects with batched storage.remove([...]) calls.
+
+    Returns the paths that were removed (all paths of every batch that succeeded).
+    """
+    client = _ensure_client()
+    storage = client.storage.from_(bucket)
+    removed = []
+    for i in range(0, len(paths), batch_size):
+        batch = paths[i:i + batch_size]
+        try:
+            storage.remove(batch)
+        except Exception as e:
+            print(f"[DEBUG supabase] delete_files batch failed for bucket={bucket} n={len(batch)}: {e}")
+            continue
+        for pth in batch:
+            signed_url_cache.invalidate(bucket, pth)
+        removed.extend(batch)
+    return removed
+
+
 def delete_file_by_url(bucket: str, url: str) -> bool:
     """Attempt to extract storage path from a public/signed URL and delete the file.
 
@@ -301,10 +418,14 @@ def delete_file_by_url(bucket: str, url: str) -> bool:
 def create_signed_url(bucket: str, path: str, expires: int = 3600, service_key: str | None = None) -> str | None:
     """Create a signed URL (REST) for an existing object with a custom expiry (seconds).
 
+    Served from the signed-URL cache while a previous URL is still valid enough.
     Returns the signed URL string or None on failure.
     """
     if not path or not bucket:
         return None
+    cached = signed_url_cache.get(bucket, path, expires)
+    if cached:
+        return cached
     service_key = service_key or os.environ.get('SUPABASE_SERVICE_ROLE_KEY') or SUPABASE_KEY
     if not SUPABASE_URL or not service_key:
         return None
@@ -314,15 +435,21 @@ def create_signed_url(bucket: str, path: str, expires: int = 3600, service_key:
         sign_url = f"{SUPABASE_URL}/storage/v1/object/sign/{bucket}/{encoded}"
         headers = {"Authorization": f"Bearer {service_key}", "apikey": service_key, "Content-Type": "application/json"}
         payload = {"expiresIn": int(expires)}
-        r = requests.post(sign_url, headers=headers, json=payload, timeout=10)
+        signed_at = time.time()
+        r = http_client.post(sign_url, metric="storage.sign", headers=headers, json=payload)
         r.raise_for_status()
         data = r.json()
+        url = None
         for key in ("signedURL", "signed_url", "signedUrl", "url"):
             if key in data and isinstance(data[key], str):
-                return data[key]
-        for v in data.values():
-            if isinstance(v, str) and v.startswith('http'):
-                return v
+                url = data[key]
+                break
+        if url is None:
+            url = next((v for v in data.values() if isinstance(v, str) and v.startswith('http')), None)
+        if url:
+            url = _absolute_storage_url(url)
+            signed_url_cache.set(bucket, path, expires, url, signed_at=signed_at)
+            return url
     except Exception as e:
         print(f"[DEBUG supabase] create_signed_url failed for bucket={bucket} path={path}: {e}")
     return None
@@ -358,7 +485,7 @@ def list_files(bucket: str, prefix: str = "") -> list:
             url = SUPABASE_URL.rstrip('/') + f"/storage/v1/object/list/{bucket}"
             headers = {"Authorization": f"Bearer {SUPABASE_KEY}", "apikey": SUPABASE_KEY, "Content-Type": "application/json"}
             payload = {"prefix": prefix}
-            r = requests.post(url, headers=headers, json=payload, timeout=10)
+            r = http_client.post(url, metric="storage.list", headers=headers, json=payload)
             r.raise_for_status()
             data = r.json()
             if isinstance(data, list):
@@ -399,6 +526,126 @@ def upload_file_from_storage(bucket: str, nik: int, file_storage, dest_folder: s
     return upload_file(bucket, path, file_bytes, content_type=getattr(file_storage, 'mimetype', None))
 
 
+def storage_object_ref(bucket: str, path: str) -> str:
+    """Value stored in DB photo columns for an object; re-signed on read by resolve_image_url."""
+    return f"/object/sign/{bucket}/{path}"
+
+
+def create_signed_upload_url(bucket: str, path: str, service_key: str | None = None) -> dict | None:
+    """Create a signed upload URL so a client can PUT the object directly to storage.
+
+    Returns {"url": absolute upload URL, "token": str|None} or None on failure.
+    """
+    service_key = service_key or os.environ.get('SUPABASE_SERVICE_ROLE_KEY') or SUPABASE_KEY
+    if not path or not bucket or not SUPABASE_URL or not service_key:
+        return None
+    try:
+        encoded = quote(path, safe='/')
+        url = f"{SUPABASE_URL}/storage/v1/object/upload/sign/{bucket}/{encoded}"
+        headers = {"Authorization": f"Bearer {service_key}", "apikey": service_key, "Content-Type": "application/json"}
+        r = http_client.post(url, metric="storage.sign_upload", headers=headers, json={})
+        r.raise_for_status()
+        data = r.json()
+        upload_url = data.get("url") or data.get("signedURL") or data.get("signedUrl")
+        if not isinstance(upload_url, str):
+            return None
+        token = data.get("token")
+        if not token and "token=" in upload_url:
+            token = upload_url.split("token=", 1)[1].split("&", 1)[0]
+        return {"url": _absolute_storage_url(upload_url), "token": token}
+    except Exception as e:
+        print(f"[DEBUG supabase] create_signed_upload_url failed for bucket={bucket} path={path}: {e}")
+    return None
+
+
+def get_object_info(bucket: str, path: str, service_key: str | None = None) -> dict | None:
+    """HEAD an object; returns {"size": int|None, "content_type": str|None} or None if it does not exist."""
+    service_key = service_key or os.environ.get('SUPABASE_SERVICE_ROLE_KEY') or SUPABASE_KEY
+    if not path or not bucket or not SUPABASE_URL or not service_key:
+        return None
+    try:
+        encoded = quote(path, safe='/')
+        url = f"{SUPABASE_URL}/storage/v1/object/{bucket}/{encoded}"
+        headers = {"Authorization": f"Bearer {service_key}", "apikey": service_key}
+        r = http_client.request("HEAD", url, metric="storage.head", headers=headers)
+        if r.status_code != 200:
+            return None
+        size = r.headers.get("content-length")
+        return {
+            "size": int(size) if size and size.isdigit() else None,
+            "content_type": (r.headers.get("content-type") or "").split(";", 1)[0].strip() or None,
+        }
+    except Exception as e:
+        print(f"[DEBUG supabase] get_object_info failed for bucket={bucket} path={path}: {e}")
+    return None
+
+
+def object_exists(bucket: str, path: str, service_key: str | None = None) -> bool | None:
+    """HEAD an object: True if present, False only when storage answers 404, None when unknown (error/unconfigured)."""
+    service_key = service_key or os.environ.get('SUPABASE_SERVICE_ROLE_KEY') or SUPABASE_KEY
+    if not path or not bucket or not SUPABASE_URL or not service_key:
+        return None
+    try:
+        encoded = quote(path, safe='/')
+        url = f"{SUPABASE_URL}/storage/v1/object/{bucket}/{encoded}"
+        headers = {"Authorization": f"Bearer {service_key}", "apikey": service_key}
+        r = http_client.request("HEAD", url, metric="storage.head", headers=headers)
+        if r.status_code == 200:
+            return True
+        if r.status_code == 404:
+            return False
+        print(f"[DEBUG supabase] object_exists got {r.status_code} for bucket={bucket} path={path}")
+    except Exception as e:
+        print(f"[DEBUG supabase] object_exists failed for bucket={bucket} path={path}: {e}")
+    return None
+
+
+SUPABASE_UPLOAD_CONCURRENCY = int(os.environ.get("SUPABASE_UPLOAD_CONCURRENCY", "6"))
+
+
+def upload_files_concurrently(bucket: str, nik: int, jobs: list) -> tuple:
+    """Upload several FileStorage objects at once through a bounded thread pool.
+
+    Args:
+        jobs: list of (field_name, file_storage, dest_folder); entries without a file are skipped
+
+    Returns:
+        (results, failures): {field_name: url} for successful uploads and the list of
+        field names whose upload raised or returned no URL (same shape as `upload_failures`).
+    """
+    jobs = [(fld, fs, folder) for fld, fs, folder in jobs if fs]
+    results, failures = {}, []
+    if not jobs:
+        return results, failures
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    def _upload(job):
+        fld, fs, folder = job
+        try:
+            return fld, upload_file_from_storage(bucket, nik, fs, folder, fld)
+        except Exception as e:
+            print(f"[DEBUG supabase] concurrent upload failed for field={fld}: {e}")
+            return fld, None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(SUPABASE_UPLOAD_CONCURRENCY, len(jobs)))) as pool:
+        for fld, url in pool.map(_upload, jobs):
+            if url:
+                results[fld] = url
+            else:
+                failures.append(fld)
+    return results, failures
+
+
+def delete_files_by_url(bucket: str, urls) -> int:
+    """Best-effort delete of several uploaded files (compensation after a failed write)."""
+    deleted = 0
+    for url in urls:
+        if url and delete_file_by_url(bucket, url):
+            deleted += 1
+    return deleted
+
+
 def make_absolute_signed_url(value: str) -> str:
     if not value or not isinstance(value, str):
         return value
@@ -423,6 +670,10 @@ def resolve_image_url(value: str, expires: int = 3600) -> str:
             return make_absolute_signed_url(value)
         bucket, object_path = path_part.split('/', 1)
 
+        cached = signed_url_cache.get(bucket, object_path, expires)
+        if cached:
+            return cached
+
         service_key = os.environ.get('SUPABASE_SERVICE_ROLE_KEY') or SUPABASE_KEY
         if not SUPABASE_URL or not service_key:
             return make_absolute_signed_url(value)
@@ -432,15 +683,15 @@ def resolve_image_url(value: str, expires: int = 3600) -> str:
         headers = {"Authorization": f"Bearer {service_key}", "Content-Type": "application/json"}
         payload = {"expiresIn": expires}
         try:
-            r = requests.post(sign_endpoint, headers=headers, json=payload, timeout=10)
+            signed_at = time.time()
+            r = http_client.post(sign_endpoint, metric="storage.sign", headers=headers, json=payload)
             if r.status_code == 200:
                 try:
                     data = r.json()
                     for key in ("signedURL", "signedUrl", "signed_url", "url"):
                         if key in data and isinstance(data[key], str):
-                            url = data[key]
-                            if url.startswith('/'):
-                                return f"{SUPABASE_URL}/storage/v1{url}"
+                            url = _absolute_storage_url(data[key])
+                            signed_url_cache.set(bucket, object_path, expires, url, signed_at=signed_at)
                             return url
                 except Exception:
                     text = r.text
@@ -449,7 +700,122 @@ def resolve_image_url(value: str, expires: int = 3600) -> str:
                     return text
             # non-200 -> fallback
             return make_absolute_signed_url(value)
-        except requests.RequestException:
+        except httpx.HTTPError:
             return make_absolute_signed_url(value)
 
     return make_absolute_signed_url(value)
+
+
+SUPABASE_SIGN_CONCURRENCY = int(os.environ.get("SUPABASE_SIGN_CONCURRENCY", "6"))
+
+
+def _absolute_storage_url(url: str) -> str:
+    if isinstance(url, str) and url.startswith('/') and SUPABASE_URL:
+        return f"{SUPABASE_URL}/storage/v1{url}"
+    return url
+
+
+def create_signed_urls(bucket: str, paths: list, expires: int = 3600, service_key: str | None = None) -> dict:
+    """Sign many object paths of one bucket in a single storage call.
+
+    Paths still valid in the signed-URL cache are not re-signed. Uses
+    POST /storage/v1/object/sign/<bucket> with {"paths": [...]}. If the batch
+    call fails, paths are signed concurrently one by one as a fallback.
+    Returns {path: absolute signed URL or None}.
+    """
+    paths = [p for p in dict.fromkeys(paths) if p]
+    if not paths or not bucket:
+        return {}
+    service_key = service_key or os.environ.get('SUPABASE_SERVICE_ROLE_KEY') or SUPABASE_KEY
+    if not SUPABASE_URL or not service_key:
+        return {p: None for p in paths}
+
+    result = {p: signed_url_cache.get(bucket, p, expires) for p in paths}
+    paths = [p for p, url in result.items() if not url]
+    if not paths:
+        return result
+    try:
+        sign_url = f"{SUPABASE_URL}/storage/v1/object/sign/{bucket}"
+        headers = {"Authorization": f"Bearer {service_key}", "apikey": service_key, "Content-Type": "application/json"}
+        payload = {"expiresIn": int(expires), "paths": paths}
+        signed_at = time.time()
+        r = http_client.post(sign_url, metric="storage.sign_batch", headers=headers, json=payload)
+        r.raise_for_status()
+        data = r.json()
+        if not isinstance(data, list):
+            raise ValueError(f"unexpected batch sign response: {data!r}")
+        for item in data:
+            if not isinstance(item, dict) or item.get("error"):
+                continue
+            signed = item.get("signedURL") or item.get("signedUrl") or item.get("signed_url")
+            if item.get("path") in result and isinstance(signed, str):
+                result[item["path"]] = _absolute_storage_url(signed)
+                signed_url_cache.set(bucket, item["path"], expires, result[item["path"]], signed_at=signed_at)
+        return result
+    except Exception as e:
+        print(f"[DEBUG supabase] batch sign failed for bucket={bucket} n={len(paths)}, signing concurrently: {e}")
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    def _sign_one(pth):
+        return pth, create_signed_url(bucket, pth, expires=expires, service_key=service_key)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(SUPABASE_SIGN_CONCURRENCY, len(paths)))) as pool:
+        for pth, url in pool.map(_sign_one, paths):
+            result[pth] = url
+    return result
+
+
+def _parse_sign_path(value):
+    """Split a stored '/object/sign/<bucket>/<path>?token=..' value into (bucket, path)."""
+    prefix = '/object/sign/'
+    if not isinstance(value, str) or not value.startswith(prefix):
+        return None
+    path_part = value[len(prefix):].split('?', 1)[0]
+    if '/' not in path_part:
+        return None
+    bucket, object_path = path_part.split('/', 1)
+    return bucket, object_path
+
+
+def resolve_image_urls(values: list, expires: int = 3600) -> list:
+    """Batch variant of resolve_image_url: one sign call per bucket for all relative signed paths."""
+    by_bucket = {}
+    for v in values:
+        parsed = _parse_sign_path(v)
+        if parsed:
+            by_bucket.setdefault(parsed[0], []).append(parsed[1])
+
+    signed = {}
+    for bucket, paths in by_bucket.items():
+        for pth, url in create_signed_urls(bucket, paths, expires=expires).items():
+            signed[(bucket, pth)] = url
+
+    resolved = []
+    for v in values:
+        parsed = _parse_sign_path(v)
+        if parsed:
+            resolved.append(signed.get(parsed) or make_absolute_signed_url(v))
+        elif isinstance(v, str) and (v.startswith('http://') or v.startswith('https://')):
+            resolved.append(v)
+        elif isinstance(v, str) and v:
+            resolved.append(make_absolute_signed_url(v))
+        else:
+            resolved.append(v)
+    return resolved
+
+
+def resolve_image_fields(*records: dict, expires: int = 3600):
+    """Resolve every `foto_*` value of the given dicts in place with a single batch sign."""
+    targets = []
+    for rec in records:
+        if not isinstance(rec, dict):
+            continue
+        for k, v in rec.items():
+            if k.startswith("foto_") and v:
+                targets.append((rec, k))
+    if not targets:
+        return
+    urls = resolve_image_urls([rec[k] for rec, k in targets], expires=expires)
+    for (rec, k), url in zip(targets, urls):
+        rec[k] = url
@@ -0,0 +1,90 @@
+import os
+from uuid import uuid4
+from flask import current_app
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
+from werkzeug.utils import secure_filename
+
+
+UPLOAD_TICKET_TTL = int(os.environ.get("UPLOAD_TICKET_TTL", "600"))
+# how long a finalize receipt can still be used in the section's create request (the form may take a while)
+UPLOAD_RECEIPT_TTL = int(os.environ.get("UPLOAD_RECEIPT_TTL", str(24 * 3600)))
+UPLOAD_MAX_BYTES = int(os.environ.get("UPLOAD_MAX_BYTES", str(5 * 1024 * 1024)))
+UPLOAD_ALLOWED_TYPES = tuple(
+    t.strip() for t in os.environ.get("UPLOAD_ALLOWED_TYPES", "image/jpeg,image/png,image/webp,application/pdf").split(",") if t.strip()
+)
+
+# section -> (storage folder under {nik}/, photo columns that accept a direct upload)
+UPLOAD_SECTIONS = {
+    "ktp": ("ktp", ("foto_ktp", "foto_surat_pengantar_rt_rw")),
+    "kk": ("kk", ("foto_kk",)),
+    "kondisi_rumah": ("kondisi_rumah", ("foto_depan_rumah", "foto_atap", "foto_lantai", "foto_kamar_mandi")),
+    "kondisi_ekonomi": ("kondisi_ekonomi", ("foto_slip_gaji", "foto_token_listrik")),
+}
+
+_SALT = "direct-upload-ticket"
+_RECEIPT_SALT = "direct-upload-receipt"
+
+
+class UploadTicketError(Exception):
+    pass
+
+
+def _serializer(salt: str = _SALT) -> URLSafeTimedSerializer:
+    return URLSafeTimedSerializer(current_app.config["SECRET_KEY"], salt=salt)
+
+
+def build_upload_path(nik: int, section: str, field: str, filename: str | None = None) -> str:
+    """Object path scoped to {nik}/{folder}/, same naming as upload_file_from_storage."""
+    folder, _ = UPLOAD_SECTIONS[section]
+    safe = secure_filename(filename or "") or field
+    base, ext = os.path.splitext(safe)
+    return f"{nik}/{folder}/{base}_{uuid4().hex}{ext}"
+
+
+def issue_ticket(nik: int, section: str, field: str, bucket: str, path: str, content_type: str) -> str:
+    return _serializer().dumps({
+        "nik": int(nik),
+        "section": section,
+        "field": field,
+        "bucket": bucket,
+        "path": path,
+        "content_type": content_type,
+    })
+
+
+def read_ticket(ticket: str) -> dict:
+    try:
+        return _serializer().loads(ticket, max_age=UPLOAD_TICKET_TTL)
+    except SignatureExpired:
+        raise UploadTicketError("ticket_expired")
+    except BadSignature:
+        raise UploadTicketError("ticket_invalid")
+
+
+def issue_receipt(nik: int, section: str, field: str, bucket: str, path: str) -> str:
+    """Proof that finalize checked the object's size and type; the create request sends it as the field value."""
+    return _serializer(_RECEIPT_SALT).dumps({
+        "nik": int(nik),
+        "section": section,
+        "field": field,
+        "bucket": bucket,
+        "path": path,
+    })
+
+
+def verified_upload_ref(value, nik: int, section: str, field: str, bucket: str) -> str | None:
+    """Stored object ref for a finalize receipt issued to this citizen for this section field, else None.
+
+    A bare /object/sign/... ref is never accepted: the object behind it may not have been verified.
+    """
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        receipt = _serializer(_RECEIPT_SALT).loads(value, max_age=UPLOAD_RECEIPT_TTL)
+    except BadSignature:  # includes SignatureExpired
+        return None
+    if not isinstance(receipt, dict):
+        return None
+    if (receipt.get("nik"), receipt.get("section"), receipt.get("field"), receipt.get("bucket")) != (int(nik), section, field, bucket):
+        return None
+    return f"/object/sign/{bucket}/{receipt['path']}"